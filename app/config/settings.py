@@ -1,5 +1,6 @@
 import os
 import logging
+import tempfile
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -109,4 +110,95 @@ POLICY_DATA_FILE = os.path.join(DATA_DIR, "policies.json")
 
 # 세션 설정
 SESSION_SECRET = os.getenv("SESSION_SECRET", "my_secret_key")
-SESSION_EXPIRE_DAYS = int(os.getenv("SESSION_EXPIRE_DAYS", "7")) 
\ No newline at end of file
+SESSION_EXPIRE_DAYS = int(os.getenv("SESSION_EXPIRE_DAYS", "7")) 
+# MongoDB Atlas 설정 (벡터 검색용)
+MONGO_URI = os.getenv("MONGO_URI", "")
+PUBLIC_DATA_DB = os.getenv("PUBLIC_DATA_DB", "public_data_db")
+
+# 워밍업 설정
+# 배포/재시작 직후 자주 들어오는 질문으로 임베딩, 검색 캐시와 커넥션 풀을 미리 채웁니다.
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True").lower() in ("true", "1", "t")
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "30"))
+# 쉼표로 구분된 워밍업 질문 목록 (비어 있으면 기본 목록 사용)
+WARMUP_QUERIES = [q.strip() for q in os.getenv("WARMUP_QUERIES", "").split(",") if q.strip()] or [
+    "장애인 취업 지원",
+    "장애인 연금 신청 방법",
+    "장애인 활동지원 서비스",
+    "장애인 고용장려금",
+    "장애인 구직자 현황",
+]
+
+# 구직자 통계 설정
+# 새로 적재된 구직자를 통계에 증분 반영하는 주기(초)와 전체 재집계 주기(초)
+JOBSEEKER_STATS_REFRESH_SECONDS = float(os.getenv("JOBSEEKER_STATS_REFRESH_SECONDS", "600"))
+JOBSEEKER_STATS_REBUILD_SECONDS = float(os.getenv("JOBSEEKER_STATS_REBUILD_SECONDS", str(6 * 60 * 60)))
+
+# LLM 응답 캐시 설정
+# 같은 입력에 대해 결정적인 호출(슈퍼바이저 분석, 질문 요약 등)의 응답을 메모리/디스크에 캐싱합니다.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+LLM_CACHE_MAX_ITEMS = int(os.getenv("LLM_CACHE_MAX_ITEMS", "2000"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.sqlite3"))
+
+# 요청 마감 시간 설정
+# /chat 요청 하나가 OpenAI/MongoDB/백엔드 호출에 쓸 수 있는 전체 시간(초)
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "25"))
+
+# OpenAI 속도 제한 설정
+# 프로세스 안의 모든 OpenAI 호출이 공유하는 분당 요청 수/토큰 수 한도 (계정 한도보다 약간 낮게 설정)
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "3000"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "1000000"))
+
+# 워커 간 공유 캐시 설정
+# 같은 호스트의 워커들이 메모리 매핑 파일로 임베딩/검색 결과 캐시를 공유합니다.
+# 기본값 기준 약 21MB (임베딩 2048 x 6KB + 검색 결과 512 x 16KB), /dev/shm 크기와 컨테이너 메모리 한도에 포함됩니다.
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+SHARED_CACHE_DIR = os.getenv("SHARED_CACHE_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+SHARED_EMBEDDING_SLOTS = int(os.getenv("SHARED_EMBEDDING_SLOTS", "2048"))
+SHARED_RETRIEVAL_SLOTS = int(os.getenv("SHARED_RETRIEVAL_SLOTS", "512"))
+SHARED_RETRIEVAL_SLOT_BYTES = int(os.getenv("SHARED_RETRIEVAL_SLOT_BYTES", "16384"))
+
+# 전문가 도구 호출 설정
+# 활성화하면 정책/취업 전문가가 LLM 도구 호출 루프로 여러 검색을 한 번에 요청합니다.
+EXPERT_TOOL_CALLING_ENABLED = os.getenv("EXPERT_TOOL_CALLING_ENABLED", "False").lower() in ("true", "1", "t")
+EXPERT_TOOL_MAX_ITERATIONS = int(os.getenv("EXPERT_TOOL_MAX_ITERATIONS", "3"))
+EXPERT_TOOL_TIMEOUT_SECONDS = float(os.getenv("EXPERT_TOOL_TIMEOUT_SECONDS", "10"))
+
+# 응답 종합 설정
+# 여러 응답의 단어 유사도(Jaccard)가 이 값 이상일 때만 LLM으로 통합하고, 그 외에는 템플릿으로 이어 붙입니다.
+CONSOLIDATION_LLM_SIMILARITY = float(os.getenv("CONSOLIDATION_LLM_SIMILARITY", "0.35"))
+
+# 카드 순위화 설정
+# 여러 검색의 후보 카드를 중복 제거 후 MMR로 다양한 상위 카드만 남깁니다.
+CARD_RANK_TOP_K = int(os.getenv("CARD_RANK_TOP_K", "4"))
+CARD_RANK_CANDIDATES = int(os.getenv("CARD_RANK_CANDIDATES", "5"))
+CARD_MMR_LAMBDA = float(os.getenv("CARD_MMR_LAMBDA", "0.7"))
+CARD_TITLE_SIMILARITY = float(os.getenv("CARD_TITLE_SIMILARITY", "0.8"))
+
+# 복지 서비스 상세 캐시 설정
+# servId별 상세 정보를 캐싱하고, 변경 스트림으로 welfare_service_detail 재동기화를 감지해 무효화합니다.
+WELFARE_DETAIL_CACHE_TTL = int(os.getenv("WELFARE_DETAIL_CACHE_TTL", "3600"))
+WELFARE_DETAIL_WATCH_ENABLED = os.getenv("WELFARE_DETAIL_WATCH_ENABLED", "True").lower() in ("true", "1", "t")
+
+# 응답 압축 설정
+# 이 크기(바이트) 이상인 응답만 gzip으로 압축합니다.
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+
+# 대화 세션 설정
+# 서버에 세션별 최근 대화(SESSION_HISTORY_WINDOW개)와 누적 요약, 마지막 라우팅 결과를 보관합니다. (SESSION_SECRET으로 세션 ID 서명)
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+SESSION_HISTORY_WINDOW = int(os.getenv("SESSION_HISTORY_WINDOW", "6"))
+SESSION_MAX_MESSAGE_CHARS = int(os.getenv("SESSION_MAX_MESSAGE_CHARS", "2000"))
+# 이 길이 이하의 짧은 후속 질문("더 알려줘" 등)은 슈퍼바이저 분석 없이 직전 라우팅을 재사용
+SESSION_FOLLOWUP_MAX_CHARS = int(os.getenv("SESSION_FOLLOWUP_MAX_CHARS", "12"))
+
+# 혜택 분석 비동기 작업 설정
+# /analyze/benefits?mode=async 요청을 처리하는 워커 수, 대기열 크기, 작업 기록 보관 기간
+BENEFIT_JOB_WORKERS = int(os.getenv("BENEFIT_JOB_WORKERS", "2"))
+BENEFIT_JOB_QUEUE_SIZE = int(os.getenv("BENEFIT_JOB_QUEUE_SIZE", "100"))
+BENEFIT_JOB_RETENTION_DAYS = int(os.getenv("BENEFIT_JOB_RETENTION_DAYS", "7"))
+# 실행 중(running) 상태로 이 시간(초) 넘게 갱신이 없는 작업은 중단된 것으로 보고 다시 실행
+BENEFIT_JOB_STALE_SECONDS = int(os.getenv("BENEFIT_JOB_STALE_SECONDS", "600"))
+# 완료 콜백을 보낼 수 있는 호스트 (쉼표 구분, 하위 도메인 포함). 비어 있으면 공인 IP로 연결되는 호스트만 허용
+BENEFIT_CALLBACK_ALLOWED_HOSTS = [
+    host.strip().lower() for host in os.getenv("BENEFIT_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+]
@@ -1,7 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from app.router import chatbot
+from app.service.warmup import run_warmup, warmup_state
+from app.service.analyzer.jobseeker_stats import refresh_periodically
+from app.service.welfare_detail import watch_welfare_details
+from app.service.analyzer.benefit_jobs import get_benefit_job_queue
+from app.service.utils.completion_cache import completion_cache_stats
+from app.service.utils.metrics import metrics
+from app.service.utils.rate_limiter import Priority
+from app.service.openai_client import get_rate_limiter
+from app.config.settings import WELFARE_DETAIL_WATCH_ENABLED, GZIP_MINIMUM_SIZE
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
 
 # 로깅 설정
@@ -13,12 +26,36 @@ logging.basicConfig(
 # 환경 변수 로드
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 전문가/에이전트 싱글톤 생성 후 캐시와 커넥션 풀을 백그라운드로 워밍업
+    # (서버는 바로 뜨고, 완료 전까지 /health/ready가 503을 반환하여 로드밸런서가 트래픽을 보내지 않음)
+    warmup_task = asyncio.create_task(run_warmup())
+    # 구직자 통계 증분 갱신
+    stats_task = asyncio.create_task(refresh_periodically())
+    # 복지 서비스 상세 재동기화 감지 (상세 캐시 무효화)
+    detail_watch_task = asyncio.create_task(watch_welfare_details()) if WELFARE_DETAIL_WATCH_ENABLED else None
+    # 혜택 분석 비동기 작업 워커
+    await get_benefit_job_queue().start()
+    yield
+    warmup_task.cancel()
+    await get_benefit_job_queue().stop()
+    stats_task.cancel()
+    if detail_watch_task:
+        detail_watch_task.cancel()
+
 app = FastAPI(
     title="장애인 복지 AI 챗봇 API",
     description="장애인 복지 정보 및 상담을 제공하는 AI 챗봇 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # 응답 직렬화에 orjson 사용
+    default_response_class=ORJSONResponse
 )
 
+# 카드가 많은 큰 응답만 압축
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -34,3 +71,24 @@ app.include_router(chatbot.router, prefix="", tags=["chatbot"])
 @app.get("/")
 def root():
     return {"message": "장애인 복지 AI 챗봇 API가 정상적으로 동작 중입니다."}
+
+@app.get("/health/ready")
+def readiness():
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {
+        "status": "ready",
+        "warmup_seconds": round(warmup_state.duration, 3),
+        "warmup_timed_out": warmup_state.timed_out
+    }
+
+@app.get("/metrics")
+def get_metrics():
+    return {
+        "counters": metrics.snapshot(),
+        "llm_cache": completion_cache_stats(),
+        "openai_estimated_wait_seconds": {
+            priority.name.lower(): round(get_rate_limiter().estimated_wait(priority), 3)
+            for priority in Priority
+        }
+    }
@@ -1,5 +1,9 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Type
+import logging
+from pydantic import BaseModel, Field, ValidationError
+from app.config.settings import DEBUG
+
+logger = logging.getLogger(__name__)
 
 class CardButton(BaseModel):
     """카드의 버튼 모델"""
@@ -73,4 +77,23 @@ class CompanyChatbotResponse(BaseModel):
     action_cards: Optional[List[CompanyExpertCard]] = Field(None, description="전문가 선택 카드 목록")
     company_id: Optional[str] = Field(None, description="관련 기업 ID")
     application_count: Optional[int] = Field(None, description="지원자 수")
-    last_updated: Optional[str] = Field(None, description="마지막 업데이트 일시") 
\ No newline at end of file
+    last_updated: Optional[str] = Field(None, description="마지막 업데이트 일시")
+
+def debug_validate(payload: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    DEBUG 모드에서만 응답을 타입 모델로 검증합니다. (운영에서는 검증 비용 없이 그대로 반환)
+    검증 실패는 응답을 막지 않고 경고 로그로 남깁니다.
+
+    Args:
+        payload: 응답 딕셔너리
+        model: 검증할 응답 모델
+
+    Returns:
+        전달받은 payload
+    """
+    if DEBUG:
+        try:
+            model.model_validate(payload)
+        except ValidationError as e:
+            logger.warning(f"{model.__name__} 응답 검증 실패: {e}")
+    return payload
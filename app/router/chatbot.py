@@ -1,11 +1,23 @@
-from fastapi import APIRouter, HTTPException, Request, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request, Depends, Body
+from fastapi.responses import Response, ORJSONResponse
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from app.service.experts import get_expert_response
 from app.service.agents.general_chatbot import GeneralChatbot
 from app.service.agents.supervisor import SupervisorAgent
+from app.service.agents.conversation_pipeline import build_conversation_pipeline, run_with_deadline
+from app.service.utils.deadline import deadline_scope
+from app.service.utils.metrics import metrics
+from app.service.utils.rate_limiter import Priority
+from app.service.openai_client import get_rate_limiter
+from app.config.settings import REQUEST_DEADLINE_SECONDS, SESSION_MAX_MESSAGE_CHARS, SESSION_FOLLOWUP_MAX_CHARS
+from app.service.session_store import get_session_store, schedule_compaction
+from app.service.registry import get_general_chatbot, get_supervisor_agent
 from app.service.analyzer.benefit_analysis import analyze_and_store
+from app.service.analyzer.benefit_jobs import InvalidCallbackURL, QueueFullError, get_benefit_job_queue
+from app.models.response_models import ChatbotResponse, debug_validate
 import logging
+import orjson
 
 router = APIRouter()
 
@@ -26,76 +38,88 @@ class ConversationRequest(BaseModel):
     messages: List[Dict[str, Any]]
     expert_type: Optional[str] = None
 
-# 의존성 주입을 위한 함수
-def get_general_chatbot():
-    return GeneralChatbot()
+class SessionMessageRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=SESSION_MAX_MESSAGE_CHARS)
+    expert_type: Optional[str] = None
+
+def reject_if_overloaded() -> None:
+    """OpenAI 대기열이 마감 시간 안에 처리될 수 없을 만큼 밀려 있으면 바로 거절합니다. (부하 차단)"""
+    estimated_wait = get_rate_limiter().estimated_wait(Priority.INTERACTIVE)
+    if estimated_wait > REQUEST_DEADLINE_SECONDS:
+        metrics.increment("rate_limiter.shed")
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(int(estimated_wait) + 1)}
+        )
 
-def get_supervisor_agent():
-    return SupervisorAgent()
+# /chat/start 전문가 선택 카드 (정적 응답이므로 시작 시 한 번만 직렬화)
+START_EXPERT_CARDS = [
+    {
+        "id": "policy",
+        "title": "정책 전문가",
+        "expert_type": "장애인 정책",
+        "description": "정부, 지자체의 장애인 관련 법률 및 제도 안내",
+        "icon": "📜"
+    },
+    {
+        "id": "employment",
+        "title": "취업 전문가",
+        "expert_type": "장애인 취업",
+        "description": "공공기관 및 민간기업 취업 정보 제공",
+        "icon": "💼"
+    },
+    # {
+    #     "id": "welfare",
+    #     "title": "복지 전문가",
+    #     "expert_type": "장애인 복지",
+    #     "description": "장애인 복지 서비스 및 혜택 안내",
+    #     "icon": "🏥"
+    # },
+    # {
+    #     "id": "startup",
+    #     "title": "창업 전문가",
+    #     "expert_type": "장애인 창업",
+    #     "description": "장애인 창업 지원 제도 및 프로그램 안내",
+    #     "icon": "🚀"
+    # },
+    # {
+    #     "id": "medical",
+    #     "title": "의료 전문가",
+    #     "expert_type": "장애인 의료",
+    #     "description": "장애 유형별 진료 및 의료 지원 정보",
+    #     "icon": "⚕️"
+    # },
+    # {
+    #     "id": "education",
+    #     "title": "교육 전문가",
+    #     "expert_type": "장애인 교육",
+    #     "description": "장애인 교육 프로그램 및 지원 제도 안내",
+    #     "icon": "📚"
+    # },
+    # {
+    #     "id": "counseling",
+    #     "title": "상담 전문가",
+    #     "expert_type": "전문 상담",
+    #     "description": "장애인 심리 상담 및 가족 상담 프로그램",
+    #     "icon": "💬"
+    # }
+]
+START_CHAT_BODY = orjson.dumps(debug_validate({
+    "answer": "안녕하세요! IDEA 챗봇입니다. 원하시는 서비스를 선택해주세요.",
+    "action_cards": START_EXPERT_CARDS
+}, ChatbotResponse))
 
 @router.post("/chat/start")
 async def start_chat():
-    expert_cards = [
-        {
-            "id": "policy",
-            "title": "정책 전문가",
-            "expert_type": "장애인 정책",
-            "description": "정부, 지자체의 장애인 관련 법률 및 제도 안내",
-            "icon": "📜"
-        },
-        {
-            "id": "employment",
-            "title": "취업 전문가",
-            "expert_type": "장애인 취업",
-            "description": "공공기관 및 민간기업 취업 정보 제공",
-            "icon": "💼"
-        },
-        # {
-        #     "id": "welfare",
-        #     "title": "복지 전문가",
-        #     "expert_type": "장애인 복지",
-        #     "description": "장애인 복지 서비스 및 혜택 안내",
-        #     "icon": "🏥"
-        # },
-        # {
-        #     "id": "startup",
-        #     "title": "창업 전문가",
-        #     "expert_type": "장애인 창업",
-        #     "description": "장애인 창업 지원 제도 및 프로그램 안내",
-        #     "icon": "🚀"
-        # },
-        # {
-        #     "id": "medical",
-        #     "title": "의료 전문가",
-        #     "expert_type": "장애인 의료",
-        #     "description": "장애 유형별 진료 및 의료 지원 정보",
-        #     "icon": "⚕️"
-        # },
-        # {
-        #     "id": "education",
-        #     "title": "교육 전문가",
-        #     "expert_type": "장애인 교육",
-        #     "description": "장애인 교육 프로그램 및 지원 제도 안내",
-        #     "icon": "📚"
-        # },
-        # {
-        #     "id": "counseling",
-        #     "title": "상담 전문가",
-        #     "expert_type": "전문 상담",
-        #     "description": "장애인 심리 상담 및 가족 상담 프로그램",
-        #     "icon": "💬"
-        # }
-    ]
-    return {
-        "answer": "안녕하세요! IDEA 챗봇입니다. 원하시는 서비스를 선택해주세요.",
-        "action_cards": expert_cards
-    }
+    return Response(content=START_CHAT_BODY, media_type="application/json")
 
 @router.post("/chat/expert")
 async def chat_expert_query(req: ExpertQueryRequest):
     try:
-        answer, cards = await get_expert_response(req.text, req.expert_type)
-        return {"answer": answer, "cards": cards}
+        with deadline_scope(REQUEST_DEADLINE_SECONDS):
+            answer, cards, _ = await get_expert_response(req.text, req.expert_type)
+        return debug_validate({"answer": answer, "cards": cards}, ChatbotResponse)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -105,56 +129,112 @@ async def process_conversation(
     general_chatbot: GeneralChatbot = Depends(get_general_chatbot),
     supervisor_agent: SupervisorAgent = Depends(get_supervisor_agent)
 ):
+    reject_if_overloaded()
+
     try:
-        # 현재 메시지 추출
-        latest_message = req.messages[-1]["content"] if req.messages else ""
+        pipeline = build_conversation_pipeline(
+            req.messages,
+            general_chatbot,
+            supervisor_agent,
+            expert_type=req.expert_type
+        )
+        # 전문가 유형이 지정된 경우 전문가 응답을 사용자 친화적으로 가공,
+        # 지정되지 않은 경우(일반 대화) 일반 챗봇 응답과 전문가 응답을 종합
+        # 마감 시간이 지나면 완료된 단계(검색 카드 등)로 부분 응답
+        response = await run_with_deadline(
+            pipeline,
+            "rewrite" if req.expert_type else "consolidation",
+            REQUEST_DEADLINE_SECONDS
+        )
+        return debug_validate(response, ChatbotResponse)
         
-        # 전문가 유형이 지정된 경우
-        if req.expert_type:
-            expert_response = await get_expert_response(
-                latest_message,
-                req.expert_type,
-                req.messages  # 대화 이력 전달
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/session")
+async def create_session():
+    # 서버 측 대화 세션 생성 (이후 턴에서는 세션 ID와 새 메시지만 전송)
+    store = get_session_store()
+    session = store.create()
+    return {"session_id": session.session_id, "expires_in": int(store.ttl)}
+
+@router.post("/chat/session/{session_id}/message")
+async def session_message(
+    session_id: str,
+    req: SessionMessageRequest,
+    general_chatbot: GeneralChatbot = Depends(get_general_chatbot),
+    supervisor_agent: SupervisorAgent = Depends(get_supervisor_agent)
+):
+    session = get_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="세션이 없거나 만료되었습니다.")
+    reject_if_overloaded()
+
+    try:
+        async with session.lock:
+            # 누적 요약 + 최근 대화 + 새 메시지 (대화가 길어져도 일정한 크기)
+            messages = session.context_messages(req.message)
+            routing = None
+            if not req.expert_type and session.last_routing and len(req.message.strip()) <= SESSION_FOLLOWUP_MAX_CHARS:
+                # 짧은 후속 질문은 직전 라우팅을 재사용
+                routing = session.last_routing
+                metrics.increment("session.routing_reused")
+            pipeline = build_conversation_pipeline(
+                messages,
+                general_chatbot,
+                supervisor_agent,
+                expert_type=req.expert_type,
+                preset_routing=routing
             )
-            
-            # 사용자 친화적 응답 생성
-            user_friendly_response = await general_chatbot.create_user_friendly_response(
-                {"answer": expert_response[0], "cards": expert_response[1]},
-                req.messages
+            response = await run_with_deadline(
+                pipeline,
+                "rewrite" if req.expert_type else "consolidation",
+                REQUEST_DEADLINE_SECONDS
             )
-            
-            return {
-                "answer": user_friendly_response,
-                "cards": expert_response[1]
-            }
-        
-        # 전문가 유형이 지정되지 않은 경우 (일반 대화)
-        # 일반 챗봇 처리
-        general_response = await general_chatbot.process_initial_query(latest_message)
-        
-        # 슈퍼바이저 분석
-        expert_type, keywords = await supervisor_agent.analyze_conversation(req.messages)
-        
-        # 적합한 전문가 응답 생성 (대화 이력 전달)
-        expert_response = await get_expert_response(
-            latest_message, 
-            expert_type.value,
-            keywords,  # keywords를 세 번째 매개변수로 이동
-            req.messages  # conversation_history를 네 번째 매개변수로 이동
-        )
-        
-        # 응답 종합
-        combined_response = await supervisor_agent.consolidate_responses([
-            {"answer": general_response["initial_response"], "cards": []},
-            {"answer": expert_response[0], "cards": expert_response[1]}
-        ])
-        
-        return combined_response
-        
+            session.last_routing = pipeline.completed().get("routing", session.last_routing)
+            session.append_turn(req.message, response.get("answer", ""))
+        # 오래된 대화는 응답 반환 뒤 누적 요약으로 압축
+        schedule_compaction(session, general_chatbot)
+        return debug_validate({**response, "session_id": session_id}, ChatbotResponse)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.delete("/chat/session/{session_id}")
+async def delete_session(session_id: str):
+    if not get_session_store().delete(session_id):
+        raise HTTPException(status_code=404, detail="세션이 없거나 만료되었습니다.")
+    return {"deleted": True}
+
 @router.post("/analyze/benefits")
-async def analyze_endpoint(user_info: dict, job_info: dict):
+async def analyze_endpoint(
+    user_info: dict,
+    job_info: dict,
+    callback_url: Optional[str] = Body(None),
+    mode: str = "sync"
+):
+    if mode == "async":
+        # 분석을 백그라운드 작업으로 등록하고 바로 202 반환 (결과는 상태 조회 또는 콜백으로 전달)
+        try:
+            job_id = await get_benefit_job_queue().submit(user_info, job_info, callback_url)
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=503,
+                detail="분석 요청이 많아 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(int(e.retry_after) + 1)}
+            )
+        except InvalidCallbackURL as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return ORJSONResponse(
+            status_code=202,
+            content={"job_id": job_id, "status": "queued", "status_url": f"/analyze/benefits/jobs/{job_id}"}
+        )
     result = await analyze_and_store(user_info, job_info)
-    return result or {"error": "분석 실패"}
\ No newline at end of file
+    return result or {"error": "분석 실패"}
+
+@router.get("/analyze/benefits/jobs/{job_id}")
+async def analyze_job_status(job_id: str):
+    status = await get_benefit_job_queue().get(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return status
\ No newline at end of file
@@ -0,0 +1,73 @@
+from pymongo import MongoClient, UpdateOne, ReplaceOne
+from pymongo.operations import SearchIndexModel
+from dotenv import load_dotenv
+import os, sys
+from app.service.utils.job_offer_fields import normalize_job_offer, today_kst
+
+# ✅ .env에서 Mongo URI 불러오기
+load_dotenv()
+MONGO_URI = os.getenv("MONGO_URI")
+
+client = MongoClient(MONGO_URI)
+db = client["public_data_db"]
+collection = db["disabled_job_offers"]
+archive_collection = db["disabled_job_offers_archive"]
+
+BATCH_SIZE = 500
+
+# 마감일/지역/고용형태 pre-filter를 포함한 벡터 인덱스 정의
+VECTOR_INDEX_NAME = "vector_index_disabled_offers"
+VECTOR_INDEX_DEFINITION = {
+    "fields": [
+        {"type": "vector", "path": "embedding", "numDimensions": 1536, "similarity": "cosine"},
+        {"type": "filter", "path": "termEndAt"},
+        {"type": "filter", "path": "region"},
+        {"type": "filter", "path": "empTypeCode"}
+    ]
+}
+
+# ✅ 1. 구조화 필드가 없는 공고에 날짜/지역/고용형태 필드 채우기
+def normalize_offers():
+    projection = {"termDate": 1, "offerregDt": 1, "regDt": 1, "compAddr": 1, "empType": 1}
+    ops = []
+    total = 0
+    for doc in collection.find({"termEndAt": {"$exists": False}}, projection):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": normalize_job_offer(doc)}))
+        if len(ops) >= BATCH_SIZE:
+            collection.bulk_write(ops, ordered=False)
+            total += len(ops)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+        total += len(ops)
+    print(f"✅ 구조화 필드 정규화 완료: {total}건")
+
+# ✅ 2. 마감된 공고를 보관 컬렉션으로 이동
+def archive_expired_offers():
+    expired_filter = {"termEndAt": {"$lt": today_kst()}}
+    moved = 0
+    while True:
+        docs = list(collection.find(expired_filter).limit(BATCH_SIZE))
+        if not docs:
+            break
+        # 보관 컬렉션에 먼저 저장한 뒤 원본에서 삭제 (중간에 실패해도 재실행 시 이어서 처리)
+        archive_collection.bulk_write([ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs], ordered=False)
+        collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+        moved += len(docs)
+    print(f"📦 마감된 공고 {moved}건을 {archive_collection.name}로 이동했습니다.")
+
+# ✅ 3. 벡터 인덱스에 filter 필드 반영
+def update_vector_index():
+    existing = [idx["name"] for idx in collection.list_search_indexes()]
+    if VECTOR_INDEX_NAME in existing:
+        collection.update_search_index(VECTOR_INDEX_NAME, VECTOR_INDEX_DEFINITION)
+    else:
+        collection.create_search_index(SearchIndexModel(definition=VECTOR_INDEX_DEFINITION, name=VECTOR_INDEX_NAME, type="vectorSearch"))
+    print(f"🔧 벡터 인덱스 {VECTOR_INDEX_NAME} 정의를 갱신했습니다.")
+
+if __name__ == "__main__":
+    normalize_offers()
+    archive_expired_offers()
+    if "--update-index" in sys.argv:
+        update_vector_index()
+    print(f"💡 남은 공고 수: {collection.estimated_document_count()}")
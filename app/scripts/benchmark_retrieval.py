@@ -0,0 +1,177 @@
+from pymongo import MongoClient
+from dotenv import load_dotenv
+import asyncio, json, os, sys, time
+from datetime import datetime
+import numpy as np
+from app.service.analyzer.jobseeker_stats import COLLECTION_NAME as JOBSEEKER_COLLECTION
+from app.service.embedding import get_embeddings
+from app.service.utils.job_offer_fields import job_offer_filter
+from app.service.utils.rate_limiter import Priority, run_with_priority
+from app.service.utils.welfare_topics import welfare_topic_filter
+
+# ✅ 벡터 검색 품질/지연 시간 벤치마크
+# 라벨링된 질문 세트를 저장된 임베딩에 대해 실행하여
+#   - NumPy brute-force(정확한 코사인 top-k)를 정답으로 삼아 $vectorSearch의 recall@k를 측정하고
+#   - numCandidates 값별 지연 시간(p50/p95)을 측정합니다.
+# 질문에 relevant(정답 id 목록)가 있으면 라벨 기준 recall@k도 함께 계산합니다.
+#
+# 사용법: python -m app.scripts.benchmark_retrieval [--k 5] [--repeat 3] [--target policy]
+
+load_dotenv()
+client = MongoClient(os.getenv("MONGO_URI"))
+db = client["public_data_db"]
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUERIES_PATH = os.path.join(BASE_DIR, "scripts", "benchmark_queries.json")
+REPORT_DIR = os.path.join(BASE_DIR, "data", "benchmarks")
+
+CANDIDATE_COUNTS = [50, 100, 200, 500, 1000]
+
+# 전문가별 검색 설정 (current: 현재 코드에서 사용하는 numCandidates)
+TARGETS = {
+    "policy": {"collection": "welfare_service_list", "index": "vector_index_welfare_list", "id_field": "servId", "filter": None, "current": 1000},
+    "employment": {"collection": "welfare_service_list", "index": "vector_index_welfare_list", "id_field": "servId", "filter": welfare_topic_filter("employment"), "current": 100},
+    "employment_policy": {"collection": "welfare_service_list", "index": "vector_index_welfare_list", "id_field": "servId", "filter": welfare_topic_filter("employer_support"), "current": 100},
+    "job_offers": {"collection": "disabled_job_offers", "index": "vector_index_disabled_offers", "id_field": "id", "filter": job_offer_filter(), "current": 500},
+    "job_seekers": {"collection": JOBSEEKER_COLLECTION, "index": "vector_index_disabled_seekers", "id_field": "연번", "filter": None, "current": 100},
+}
+
+def get_arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+# ✅ 1. 컬렉션의 저장된 임베딩을 정규화된 행렬로 로드 (검색 filter와 같은 조건 적용)
+def load_corpus(target):
+    collection = db[target["collection"]]
+    query = {"embedding": {"$ne": None}, **(target["filter"] or {})}
+    ids, vectors = [], []
+    for doc in collection.find(query, {target["id_field"]: 1, "embedding": 1}):
+        ids.append(str(doc.get(target["id_field"])))
+        vectors.append(doc["embedding"])
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if len(matrix):
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return ids, matrix
+
+# ✅ 2. NumPy brute-force 정확한 top-k (정답)
+def exact_top_k(matrix, ids, query_vector, k):
+    query = np.asarray(query_vector, dtype=np.float32)
+    scores = matrix @ (query / np.linalg.norm(query))
+    k = min(k, len(ids))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return [ids[i] for i in top[np.argsort(-scores[top])]]
+
+# ✅ 3. Atlas $vectorSearch top-k
+def vector_search_top_k(target, query_vector, k, num_candidates):
+    stage = {
+        "index": target["index"],
+        "path": "embedding",
+        "queryVector": query_vector,
+        "numCandidates": max(num_candidates, k),
+        "limit": k
+    }
+    if target["filter"]:
+        stage["filter"] = target["filter"]
+    pipeline = [{"$vectorSearch": stage}, {"$project": {"_id": 0, target["id_field"]: 1}}]
+    return [str(doc.get(target["id_field"])) for doc in db[target["collection"]].aggregate(pipeline)]
+
+def recall(found, expected):
+    return len(set(found) & set(expected)) / len(expected) if expected else None
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+def mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+def fmt(value):
+    return "-" if value is None else f"{value:.3f}"
+
+def run_target(name, target, queries, vectors, k, repeat):
+    ids, matrix = load_corpus(target)
+    print(f"📚 {name}: 문서 {len(ids)}개, 질문 {len(queries)}개")
+    if not ids:
+        return None
+    truths = [exact_top_k(matrix, ids, vector, k) for vector in vectors]
+
+    rows = []
+    # NumPy brute-force 자체의 지연 시간 (메모리에 올린 경우의 기준선)
+    latencies = []
+    for vector in vectors:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            exact_top_k(matrix, ids, vector, k)
+            latencies.append(time.perf_counter() - start)
+    rows.append({
+        "backend": "numpy", "num_candidates": len(ids), "recall": 1.0,
+        "label_recall": mean([recall(truth, q.get("relevant")) for truth, q in zip(truths, queries)]),
+        "p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95)
+    })
+
+    for num_candidates in sorted(set(CANDIDATE_COUNTS + [target["current"]])):
+        recalls, label_recalls, latencies = [], [], []
+        for query, vector, truth in zip(queries, vectors, truths):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                found = vector_search_top_k(target, vector, k, num_candidates)
+                latencies.append(time.perf_counter() - start)
+            recalls.append(recall(found, truth))
+            label_recalls.append(recall(found, query.get("relevant")))
+        rows.append({
+            "backend": "atlas", "num_candidates": num_candidates, "recall": mean(recalls),
+            "label_recall": mean(label_recalls),
+            "p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95),
+            "current": num_candidates == target["current"]
+        })
+        print(f"   numCandidates={num_candidates}: recall@{k}={fmt(mean(recalls))}, p50={percentile(latencies, 50):.1f}ms")
+    return {"documents": len(ids), "queries": len(queries), "current": target["current"], "rows": rows}
+
+def write_report(results, k):
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = os.path.join(REPORT_DIR, f"retrieval_{stamp}.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"k": k, "results": results}, f, ensure_ascii=False, indent=2)
+
+    lines = [f"# 벡터 검색 벤치마크 ({stamp})", "", f"recall@{k}은 NumPy brute-force top-{k} 대비 비율입니다. (*: 현재 설정)", ""]
+    for name, result in results.items():
+        lines += [
+            f"## {name} (문서 {result['documents']}개, 질문 {result['queries']}개)", "",
+            f"| backend | numCandidates | recall@{k} | label recall@{k} | p50 (ms) | p95 (ms) |",
+            "|---|---|---|---|---|---|"
+        ]
+        for row in result["rows"]:
+            marker = "*" if row.get("current") else ""
+            lines.append(
+                f"| {row['backend']} | {row['num_candidates']}{marker} | {fmt(row['recall'])} | {fmt(row['label_recall'])} "
+                f"| {row['p50_ms']:.1f} | {row['p95_ms']:.1f} |"
+            )
+        lines.append("")
+    md_path = os.path.join(REPORT_DIR, f"retrieval_{stamp}.md")
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    print(f"📝 리포트 저장: {md_path}")
+
+if __name__ == "__main__":
+    k = get_arg("--k", 5)
+    repeat = get_arg("--repeat", 3)
+    only = get_arg("--target", "")
+    with open(QUERIES_PATH, "r", encoding="utf-8") as f:
+        all_queries = json.load(f)
+
+    # 질문 임베딩은 실시간 대화보다 낮은 우선순위로 한 번에 요청
+    all_vectors = asyncio.run(run_with_priority(Priority.BACKFILL, get_embeddings([q["query"] for q in all_queries])))
+
+    results = {}
+    for name, target in TARGETS.items():
+        if only and name != only:
+            continue
+        pairs = [(q, v) for q, v in zip(all_queries, all_vectors) if q["target"] == name]
+        if not pairs:
+            continue
+        result = run_target(name, target, [q for q, _ in pairs], [v for _, v in pairs], k, repeat)
+        if result:
+            results[name] = result
+    write_report(results, k)
@@ -0,0 +1,37 @@
+import csv, glob, json, math, os
+from app.service.utils.keyword_extractor import IDF_PATH, build_idf
+
+# ✅ 키워드 추출기용 IDF 가중치 생성
+# 복지로 복지서비스 목록(CSV)과 KEAD 정책(policies.json)을 코퍼스로 사용합니다.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BOKJIRO_CSV_GLOB = os.path.join(BASE_DIR, "data", "bokjiro", "*.csv")
+POLICIES_JSON = os.path.join(BASE_DIR, "scripts", "policies.json")
+
+def load_documents():
+    documents = []
+    for path in glob.glob(BOKJIRO_CSV_GLOB):
+        # 공공데이터 CSV는 CP949 인코딩
+        with open(path, "r", encoding="cp949") as f:
+            for row in csv.DictReader(f):
+                documents.append(f"{row.get('서비스명', '')} {row.get('서비스요약', '')}")
+        print(f"📄 복지서비스 CSV 로드: {path}")
+    with open(POLICIES_JSON, "r", encoding="utf-8") as f:
+        for policy in json.load(f):
+            details = policy.get("details", {})
+            detail_text = " ".join(
+                " ".join(map(str, v)) if isinstance(v, list) else str(v) for v in details.values()
+            ) if isinstance(details, dict) else str(details)
+            documents.append(f"{policy.get('policy_name', '')} {policy.get('summary', '')} {detail_text}")
+    print(f"📄 정책 JSON 로드: {POLICIES_JSON}")
+    return documents
+
+if __name__ == "__main__":
+    documents = load_documents()
+    idf = build_idf(documents)
+    with open(IDF_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "documents": len(documents),
+            "default_idf": round(math.log(len(documents) + 1) + 1, 4),
+            "idf": idf
+        }, f, ensure_ascii=False, indent=0)
+    print(f"✅ IDF 생성 완료: 문서 {len(documents)}개, 단어 {len(idf)}개 -> {IDF_PATH}")
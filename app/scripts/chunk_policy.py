@@ -1,6 +1,9 @@
-from pymongo import MongoClient
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-import os, uuid, json
+from pymongo import MongoClient, ReplaceOne, DeleteMany
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from functools import lru_cache
+import tiktoken
+import os, hashlib, json
 from dotenv import load_dotenv
 
 # .env에서 MONGO_URI 불러오기
@@ -12,42 +15,145 @@ db = client["kead_db"]
 policy_collection = db["policy"]
 chunk_collection = db["policy_chunks"]
 
-# 텍스트 쪼개기 설정
-splitter = RecursiveCharacterTextSplitter(
-    chunk_size=500,
-    chunk_overlap=50,
-    separators=["\n\n", "\n", ".", " ", ""]
-)
+# 텍스트 쪼개기 설정 (임베딩 모델 text-embedding-ada-002의 토크나이저 기준 토큰 수)
+ENCODING_NAME = "cl100k_base"
+CHUNK_TOKENS = 400
+CHUNK_OVERLAP_TOKENS = 40
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+PARALLEL_MIN_DOCS = 200   # 이 이상이면 프로세스 풀로 나눠서 청킹
+PARALLEL_SLICE_DOCS = 256 # 프로세스 풀에 한 번에 넘기는 문서 수 (cursor를 한꺼번에 읽지 않도록)
+BATCH_SIZE = 500
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    return tiktoken.get_encoding(ENCODING_NAME)
+
+# 🔹 같은 문단/줄(FAQ 머리말, JSON 키 등)이 반복되므로 토큰 수를 캐싱
+@lru_cache(maxsize=50000)
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+def _split_pieces(text, separators):
+    # 토큰 상한보다 큰 조각은 다음 구분자로 더 잘게 나눔 (구분자는 앞 조각 끝에 유지)
+    if count_tokens(text) <= CHUNK_TOKENS:
+        return [text]
+    sep, rest = separators[0], separators[1:]
+    if sep == "":
+        return list(text)
+    if sep not in text:
+        return _split_pieces(text, rest)
+    parts = text.split(sep)
+    pieces = []
+    for i, part in enumerate(parts):
+        part = part + sep if i < len(parts) - 1 else part
+        if part:
+            pieces.extend(_split_pieces(part, rest))
+    return pieces
+
+def split_text(text):
+    # 조각을 토큰 상한까지 이어 붙이고, 새 chunk는 이전 chunk 끝의 일부 토큰을 겹쳐서 시작
+    chunks, current, current_tokens = [], [], 0
+    for piece in _split_pieces(text, SEPARATORS):
+        tokens = count_tokens(piece)
+        if current and current_tokens + tokens > CHUNK_TOKENS:
+            chunks.append("".join(current).strip())
+            while current and (current_tokens > CHUNK_OVERLAP_TOKENS or current_tokens + tokens > CHUNK_TOKENS):
+                current_tokens -= count_tokens(current.pop(0))
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(current).strip())
+    return [chunk for chunk in chunks if chunk]
+
+def policy_full_text(doc):
+    # ✅ summary와 details를 합쳐서 하나의 텍스트로 구성
+    summary = doc.get("summary", "")
+    details = json.dumps(doc.get("details", {}), ensure_ascii=False, indent=2)
+    return summary + "\n" + details
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def split_policy(doc):
+    # chunk _id는 문서 id + 순번으로 고정 (다시 실행해도 중복 저장되지 않음)
+    chunks = split_text(policy_full_text(doc))
+    return [
+        {
+            "_id": f"{doc.get('_id')}:{i}",
+            "doc_id": str(doc.get("_id")),
+            "chunk_index": i,
+            "page_content": chunk,
+            "content_hash": content_hash(chunk),
+            "token_count": count_tokens(chunk),
+            "metadata": {
+                "title": doc.get("policy_name", ""),
+                "policy_name": doc.get("policy_name", ""),
+                "beneficiary_type": doc.get("beneficiary_type", "")
+            },
+            "embedding": None,
+            "gpt_analysis": None
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+def save_chunks(chunk_docs):
+    # 내용이 같은 chunk는 그대로 두어 기존 임베딩을 유지하고, 새로 생기거나 바뀐 chunk만 교체
+    stored = {
+        c["_id"]: c.get("content_hash")
+        for c in chunk_collection.find({"_id": {"$in": [c["_id"] for c in chunk_docs]}}, {"content_hash": 1})
+    }
+    ops = [ReplaceOne({"_id": c["_id"]}, c, upsert=True) for c in chunk_docs if stored.get(c["_id"]) != c["content_hash"]]
+    saved = len(ops)
+    # 문서 내용이 줄어들어 남은 이전 chunk 삭제 (배치는 문서 단위로 끊기므로 문서의 chunk id가 모두 포함됨)
+    chunk_ids = {}
+    for c in chunk_docs:
+        chunk_ids.setdefault(c["doc_id"], []).append(c["_id"])
+    ops.extend(DeleteMany({"doc_id": doc_id, "_id": {"$nin": ids}}) for doc_id, ids in chunk_ids.items())
+    if ops:
+        chunk_collection.bulk_write(ops, ordered=False)
+    return saved
 
 def make_chunks_and_save():
-    docs = list(policy_collection.find())
-    chunk_docs = []
-
-    for doc in docs:
-        # ✅ summary와 details를 합쳐서 하나의 텍스트로 구성
-        summary = doc.get("summary", "")
-        details = json.dumps(doc.get("details", {}), ensure_ascii=False, indent=2)
-        full_text = summary + "\n" + details
-
-        chunks = splitter.split_text(full_text)
-
-        for i, chunk in enumerate(chunks):
-            chunk_docs.append({
-                "_id": str(uuid.uuid4()),
-                "doc_id": str(doc.get("_id")),
-                "chunk_index": i,
-                "page_content": chunk,
-                "metadata": {
-                    "policy_name": doc.get("policy_name", ""),
-                    "beneficiary_type": doc.get("beneficiary_type", "")
-                },
-                "embedding": None,
-                "gpt_analysis": None
-            })
-
-    if chunk_docs:
-        chunk_collection.insert_many(chunk_docs)
-        print(f"✅ {len(chunk_docs)}개의 chunk가 저장되었습니다.")
+    total_docs = policy_collection.count_documents({})
+    docs = policy_collection.find()
+    saved = total = 0
+    batch = []
+
+    def flush():
+        nonlocal saved, total
+        saved += save_chunks(batch)
+        total += len(batch)
+        batch.clear()
+
+    if total_docs >= PARALLEL_MIN_DOCS:
+        # 문서가 많으면 토큰화를 CPU 코어 수만큼 프로세스로 나눠 실행
+        # executor.map은 입력을 한꺼번에 제출하므로 cursor를 일정 크기로 잘라서 넘김
+        with ProcessPoolExecutor() as executor:
+            while True:
+                group = list(islice(docs, PARALLEL_SLICE_DOCS))
+                if not group:
+                    break
+                for chunk_docs in executor.map(split_policy, group, chunksize=16):
+                    batch.extend(chunk_docs)
+                    if len(batch) >= BATCH_SIZE:
+                        flush()
+    else:
+        for doc in docs:
+            batch.extend(split_policy(doc))
+            if len(batch) >= BATCH_SIZE:
+                flush()
+    if batch:
+        flush()
+
+    # policy에서 삭제된 문서(예: 이전 UUID _id로 업로드된 문서)의 chunk 정리
+    doc_ids = [str(doc_id) for doc_id in policy_collection.distinct("_id")]
+    removed = chunk_collection.delete_many({"doc_id": {"$nin": doc_ids}}).deleted_count
+    if removed:
+        print(f"🔧 원본 문서가 없는 chunk {removed}개를 삭제했습니다.")
+
+    if total:
+        print(f"✅ {total}개의 chunk 중 {saved}개가 저장되었습니다. (문서 {total_docs}개)")
     else:
         print("❗ chunk가 없습니다.")
 
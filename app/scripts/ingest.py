@@ -0,0 +1,214 @@
+from pymongo import MongoClient, UpdateOne
+from dotenv import load_dotenv
+import os, sys, time, datetime
+import asyncio
+from app.scripts.crawl_kead import URLS, fetch_policy
+from app.scripts.chunk_policy import split_policy
+from app.scripts.upload_to_mongo import iter_policy_file, to_policy_document
+from app.service.embedding import EMBEDDING_MODEL
+from app.service.openai_client import get_client
+from app.service.utils.rate_limiter import Priority, run_with_priority
+
+# ✅ 크롤링 → 업서트 → 청킹 → 임베딩을 bounded queue로 연결한 스트리밍 수집
+# 각 단계가 동시에 실행되며, 뒤 단계가 밀리면 큐가 차서 앞 단계가 자동으로 기다립니다.
+load_dotenv()
+client = MongoClient(os.getenv("MONGO_URI"))
+db = client["kead_db"]
+policy_collection = db["policy"]
+chunk_collection = db["policy_chunks"]
+run_collection = db["ingest_runs"]  # 실행별 단계 처리량 기록
+
+openai_client = get_client()
+
+QUEUE_SIZE = 8          # 단계 사이 큐 크기 (메모리 상한)
+CRAWL_WORKERS = 4       # 동시 크롤링 수 (대상 서버 부담 고려)
+EMBED_WORKERS = 2       # 동시 임베딩 요청 수
+EMBED_BATCH_SIZE = 64   # 임베딩 요청 한 번에 보내는 chunk 수
+
+_DONE = object()
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.busy = 0.0      # 항목 처리에 쓴 시간
+        self.blocked = 0.0   # 다음 단계 큐가 가득 차서 기다린 시간
+        self.started = None
+        self.finished = None
+
+    def summary(self):
+        elapsed = (self.finished or time.monotonic()) - (self.started or time.monotonic())
+        return {
+            "stage": self.name,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "avg_item_seconds": round(self.busy / self.processed, 3) if self.processed else 0.0,
+            "blocked_seconds": round(self.blocked, 2)
+        }
+
+# 🔹 크롤링 결과({title, body, category, url})를 policy 컬렉션 스키마로 변환
+def crawled_to_policy(page):
+    return {
+        "beneficiary_type": "",
+        "policy_name": page["title"],
+        "summary": next((line.strip() for line in page["body"].splitlines() if line.strip()), ""),
+        "details": {"분류": page.get("category", ""), "본문": page["body"]},
+        "source_url": [page["url"]],
+        "last_updated": datetime.date.today().isoformat()
+    }
+
+# 🔹 단계 실행기: inbox에서 꺼내 handler로 처리하고 결과를 outbox로 전달
+async def run_stage(stats, handler, inbox, outbox, workers=1):
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                await inbox.put(_DONE)  # 같은 단계의 다른 워커도 종료하도록 되돌려 놓음
+                return
+            started = time.monotonic()
+            try:
+                result = await handler(item)
+            except Exception as e:
+                stats.failed += 1
+                print(f"❌ [{stats.name}] 실패: {describe(item)} → {e}")
+                continue
+            stats.busy += time.monotonic() - started
+            if result is None:
+                stats.skipped += 1
+                continue
+            stats.processed += 1
+            if outbox is not None:
+                waited = time.monotonic()
+                await outbox.put(result)
+                stats.blocked += time.monotonic() - waited
+
+    stats.started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    stats.finished = time.monotonic()
+    if outbox is not None:
+        await outbox.put(_DONE)
+
+def describe(item):
+    if isinstance(item, dict):
+        policy = item.get("policy", item)
+        return policy.get("policy_name") or policy.get("title") or policy.get("url", "")
+    return str(item)
+
+# 1️⃣ 크롤링 (requests 기반 동기 함수이므로 스레드에서 실행)
+async def crawl(source):
+    if isinstance(source, dict):
+        return source  # 파일 입력은 이미 정책 스키마
+    page = await asyncio.to_thread(fetch_policy, source)
+    print(f"📄 크롤링 완료: {source} ({len(page['body'])}자)")
+    return crawled_to_policy(page)
+
+# 2️⃣ 업서트: 내용이 같고 임베딩까지 끝난 문서는 이후 단계를 건너뜀 (재실행 시 이어서 처리)
+async def upsert(item):
+    doc = to_policy_document(item)
+    stored = await asyncio.to_thread(policy_collection.find_one, {"_id": doc["_id"]}, {"embedded_hash": 1})
+    if stored and stored.get("embedded_hash") == doc["content_hash"]:
+        return None
+    await asyncio.to_thread(
+        policy_collection.update_one,
+        {"_id": doc["_id"]},
+        {"$set": doc, "$setOnInsert": {"created_at": datetime.datetime.utcnow()}},
+        upsert=True
+    )
+    return doc
+
+# 3️⃣ 청킹: 내용이 바뀌지 않은 chunk는 기존 임베딩을 재사용
+async def chunk(doc):
+    # 토큰화는 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    chunks = await asyncio.to_thread(split_policy, doc)
+    existing = await asyncio.to_thread(
+        lambda: {
+            c["_id"]: c for c in chunk_collection.find(
+                {"doc_id": doc["_id"], "embedding": {"$ne": None}},
+                {"content_hash": 1, "embedding": 1}
+            )
+        }
+    )
+    for c in chunks:
+        previous = existing.get(c["_id"])
+        if previous and previous.get("content_hash") == c["content_hash"]:
+            c["embedding"] = previous["embedding"]
+    return {"policy": doc, "chunks": chunks}
+
+# 4️⃣ 임베딩 + 저장: 문서의 모든 chunk가 저장된 뒤에만 완료 표시(embedded_hash)를 남김
+async def embed(item):
+    doc, chunks = item["policy"], item["chunks"]
+    pending = [c for c in chunks if c["embedding"] is None and c["page_content"].strip()]
+    for start in range(0, len(pending), EMBED_BATCH_SIZE):
+        batch = pending[start:start + EMBED_BATCH_SIZE]
+        response = await openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=[c["page_content"] for c in batch]
+        )
+        for c, data in zip(batch, sorted(response.data, key=lambda d: d.index)):
+            c["embedding"] = data.embedding
+
+    def save():
+        if chunks:
+            chunk_collection.bulk_write(
+                [UpdateOne({"_id": c["_id"]}, {"$set": c}, upsert=True) for c in chunks],
+                ordered=False
+            )
+        # 내용이 줄어들어 남은 이전 chunk 삭제
+        chunk_collection.delete_many({"doc_id": doc["_id"], "_id": {"$nin": [c["_id"] for c in chunks]}})
+        policy_collection.update_one({"_id": doc["_id"]}, {"$set": {"embedded_hash": doc["content_hash"]}})
+
+    await asyncio.to_thread(save)
+    print(f"✅ 임베딩 완료: {doc['policy_name'][:30]} (chunk {len(chunks)}개, 신규 임베딩 {len(pending)}개)")
+    return doc["_id"]
+
+def load_sources(file_path=None):
+    # 파일 입력은 한 건씩 읽어 큐로 흘려보냄 (JSON 배열/JSON Lines)
+    if file_path:
+        return iter_policy_file(file_path)
+    return iter(URLS)
+
+async def ingest(file_path=None):
+    sources = load_sources(file_path)
+    queues = [asyncio.Queue(maxsize=QUEUE_SIZE) for _ in range(4)]
+    stats = [StageStats(name) for name in ("crawl", "upsert", "chunk", "embed")]
+    run_started = datetime.datetime.utcnow()
+
+    async def feed():
+        for source in sources:
+            await queues[0].put(source)
+        await queues[0].put(_DONE)
+
+    await asyncio.gather(
+        feed(),
+        run_stage(stats[0], crawl, queues[0], queues[1], workers=CRAWL_WORKERS),
+        run_stage(stats[1], upsert, queues[1], queues[2]),
+        run_stage(stats[2], chunk, queues[2], queues[3]),
+        run_stage(stats[3], embed, queues[3], None, workers=EMBED_WORKERS)
+    )
+
+    summaries = [s.summary() for s in stats]
+    print("📦 단계별 처리량")
+    for s in summaries:
+        print(
+            f"   {s['stage']:<7} 처리 {s['processed']}건 / 건너뜀 {s['skipped']}건 / 실패 {s['failed']}건"
+            f" | {s['items_per_second']}건/초, 평균 {s['avg_item_seconds']}초, 큐 대기 {s['blocked_seconds']}초"
+        )
+    run_collection.insert_one({
+        "started_at": run_started,
+        "finished_at": datetime.datetime.utcnow(),
+        "source": file_path or "crawl",
+        "stages": summaries
+    })
+    if any(s["failed"] for s in summaries):
+        print("💡 실패한 문서는 완료 표시가 남지 않으므로 다시 실행하면 해당 문서만 이어서 처리합니다.")
+
+if __name__ == "__main__":
+    # --file <경로>: 크롤링 대신 정책 JSON 파일을 입력으로 사용
+    file_path = sys.argv[sys.argv.index("--file") + 1] if "--file" in sys.argv else None
+    # 실시간 대화 호출보다 낮은 우선순위로 실행
+    asyncio.run(run_with_priority(Priority.BACKFILL, ingest(file_path)))
@@ -0,0 +1,5 @@
+-- 혜택 분석 결과 재사용을 위한 입력 지문 컬럼
+-- (유저 정보 해시 + 공고 정보 해시 + 정책 코퍼스 버전의 SHA-256)
+-- 기존 행은 NULL이므로 첫 요청 때 한 번 다시 분석됩니다.
+ALTER TABLE analysis_results
+    ADD COLUMN input_fingerprint CHAR(64) NULL;
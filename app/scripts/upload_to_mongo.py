@@ -1,7 +1,8 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from dotenv import load_dotenv
-import os, uuid, datetime
+import os, sys, hashlib, datetime
 import json
+from app.scripts.chunk_policy import policy_full_text, content_hash
 
 # ✅ .env에서 Mongo URI 불러오기
 load_dotenv()
@@ -11,26 +12,101 @@ client = MongoClient(MONGO_URI)
 db = client["kead_db"]
 collection = db["policy"]  # 문서 단위로 저장할 컬렉션
 
-# ✅ JSON 파일에서 데이터 불러오기
-def load_policy_file(file_path="policies.json"):
+BATCH_SIZE = 500          # bulk_write 한 번에 보내는 문서 수
+READ_SIZE = 64 * 1024     # 파일을 읽는 단위 (파일 크기와 무관하게 메모리 사용량 일정)
+
+# 🔹 자연 키(정책명 + 출처 URL)로 고정 _id 생성 → 다시 업로드해도 중복 저장되지 않음
+def policy_id(policy_name, source_url):
+    urls = source_url if isinstance(source_url, list) else [source_url]
+    key = policy_name.strip() + "|" + "|".join(sorted(u.strip() for u in urls if u))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def to_policy_document(item):
+    doc = {
+        "beneficiary_type": item.get("beneficiary_type", ""),
+        "policy_name": item.get("policy_name", ""),
+        "summary": item.get("summary", ""),
+        "details": item.get("details", {}),
+        "source_url": item.get("source_url", []),
+        "last_updated": item.get("last_updated", "")
+    }
+    doc["_id"] = policy_id(doc["policy_name"], doc["source_url"])
+    # 내용이 바뀐 문서만 다시 청킹/임베딩하도록 내용 해시를 함께 저장 (ingest.py와 공유)
+    doc["content_hash"] = content_hash(policy_full_text(doc))
+    return doc
+
+# 🔹 JSON 배열을 전체 로드하지 않고 항목 단위로 읽기
+def _iter_json_array(f):
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    started = False
+    while True:
+        # 공백, 배열 시작/구분 기호 건너뛰기
+        while pos < len(buf) and (buf[pos].isspace() or buf[pos] == "," or (not started and buf[pos] == "[")):
+            started = started or buf[pos] == "["
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        if pos < len(buf):
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # 버퍼 끝에서 끝난 값은 잘렸을 수 있으므로 더 읽은 뒤 다시 해석
+                if end < len(buf) or eof:
+                    yield item
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        if eof:
+            if pos < len(buf):
+                raise ValueError("JSON 배열이 올바르게 끝나지 않았습니다.")
+            return
+        chunk = f.read(READ_SIZE)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+# ✅ JSON 배열(policies.json) 또는 JSON Lines 파일에서 정책을 하나씩 불러오기
+def iter_policy_file(file_path="policies.json"):
     with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_to_mongo():
-    data = load_policy_file()
-    for item in data:
-        doc = {
-            "_id": str(uuid.uuid4()),
-            "beneficiary_type": item.get("beneficiary_type", ""),
-            "policy_name": item.get("policy_name", ""),
-            "summary": item.get("summary", ""),
-            "details": item.get("details", {}),
-            "source_url": item.get("source_url", []),
-            "last_updated": item.get("last_updated", ""),
-            "created_at": datetime.datetime.utcnow()
-        }
-        collection.insert_one(doc)
-    print(f"✅ {len(data)}개 문서가 MongoDB에 저장되었습니다.")
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from _iter_json_array(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def save_to_mongo(file_path="policies.json", batch_size=BATCH_SIZE):
+    ops = []
+    total = upserted = modified = 0
+
+    def flush():
+        nonlocal total, upserted, modified
+        result = collection.bulk_write(ops, ordered=False)
+        total += len(ops)
+        upserted += result.upserted_count
+        modified += result.modified_count
+        print(f"📄 {total}개 처리 (신규 {upserted}, 변경 {modified})")
+        ops.clear()
+
+    for item in iter_policy_file(file_path):
+        doc = to_policy_document(item)
+        ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": doc, "$setOnInsert": {"created_at": datetime.datetime.utcnow()}},
+            upsert=True
+        ))
+        if len(ops) >= batch_size:
+            flush()
+    if ops:
+        flush()
+    print(f"✅ {total}개 문서가 MongoDB에 저장되었습니다. (신규 {upserted}, 변경 {modified}, 동일 {total - upserted - modified})")
 
 if __name__ == "__main__":
-    save_to_mongo()
+    # 파일 경로를 인자로 지정 가능 (기본값: policies.json, .jsonl 파일도 지원)
+    save_to_mongo(sys.argv[1] if len(sys.argv) > 1 else "policies.json")
@@ -0,0 +1,141 @@
+"""
+대화 처리 파이프라인
+/chat/conversation 요청 하나를 단계 DAG로 선언합니다.
+
+    initial_response ─────────────────────────┐
+    routing ──> retrieval ──┬──> rewrite      ├──> consolidation
+                            └─────────────────┘
+    summary (현재 소비하는 단계 없음)
+
+최종 소비 단계만 요청하면 필요한 단계만 실행되며, 초기 응답과 라우팅→검색은 동시에 진행됩니다.
+요청 마감 시간이 지나면 run_with_deadline이 남은 단계를 취소하고 완료된 단계로 부분 응답을 만듭니다.
+"""
+
+import asyncio
+import logging
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.service.agents.general_chatbot import GeneralChatbot
+from app.service.agents.supervisor import SupervisorAgent
+from app.service.experts import get_expert_response
+from app.service.utils.lazy_dag import LazyDAG
+from app.service.utils.deadline import deadline_scope
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def build_conversation_pipeline(
+    messages: List[Dict[str, Any]],
+    general_chatbot: GeneralChatbot,
+    supervisor_agent: SupervisorAgent,
+    expert_type: Optional[str] = None,
+    preset_routing: Optional[Tuple[Any, Optional[List[str]]]] = None
+) -> LazyDAG:
+    """
+    대화 요청에 대한 단계 DAG를 만듭니다.
+
+    Args:
+        messages: 대화 내용 리스트 (마지막 메시지가 현재 질문)
+        general_chatbot: 일반 챗봇
+        supervisor_agent: 슈퍼바이저 에이전트
+        expert_type: 사용자가 지정한 전문가 유형 (None이면 슈퍼바이저가 결정)
+        preset_routing: 이미 정해진 (전문가 유형, 키워드) (세션의 직전 라우팅 재사용 시, 슈퍼바이저 분석 생략)
+
+    Returns:
+        단계가 등록된 LazyDAG ("rewrite" 또는 "consolidation"을 요청해 사용)
+    """
+    latest_message = messages[-1]["content"] if messages else ""
+    dag = LazyDAG("conversation")
+
+    @dag.stage("initial_response")
+    async def initial_response():
+        return await general_chatbot.generate_initial_response(latest_message)
+
+    @dag.stage("summary")
+    async def summary():
+        return await general_chatbot.summarize_query(latest_message)
+
+    @dag.stage("routing")
+    async def routing():
+        # 전문가가 지정된 경우 슈퍼바이저 분석을 건너뜀 (키워드는 전문가 응답 단계에서 추출)
+        if expert_type:
+            return expert_type, None
+        if preset_routing:
+            return preset_routing
+        return await supervisor_agent.analyze_conversation(messages)
+
+    @dag.stage("retrieval", deps=["routing"])
+    async def retrieval(routing):
+        routed_type, keywords = routing
+        answer, cards, action = await get_expert_response(latest_message, routed_type, keywords, messages)
+        response = {"answer": answer, "cards": cards}
+        if action:
+            response["action"] = action
+        return response
+
+    @dag.stage("rewrite", deps=["retrieval"])
+    async def rewrite(retrieval):
+        answer = await general_chatbot.create_user_friendly_response(retrieval, messages)
+        return {"answer": answer, "cards": retrieval["cards"]}
+
+    @dag.stage("consolidation", deps=["initial_response", "retrieval"])
+    async def consolidation(initial_response, retrieval):
+        return await supervisor_agent.consolidate_responses([
+            {"answer": initial_response, "cards": []},
+            retrieval
+        ])
+
+    return dag
+
+
+def partial_response(dag: LazyDAG) -> Dict[str, Any]:
+    """
+    마감 시간 안에 끝난 단계만으로 응답을 만듭니다. (LLM 가공/종합 없이 검색 결과 우선)
+
+    Args:
+        dag: 대화 파이프라인
+
+    Returns:
+        부분 응답 ("partial": True 포함)
+    """
+    completed = dag.completed()
+    retrieval = completed.get("retrieval")
+    initial = completed.get("initial_response")
+
+    answers = [answer for answer in (initial, retrieval["answer"] if retrieval else None) if answer]
+    if not answers:
+        answers = ["죄송합니다. 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."]
+    answer = "\n\n".join(answers)
+    result = {
+        "answer": answer,
+        "text": answer,
+        "cards": retrieval["cards"] if retrieval else [],
+        "partial": True
+    }
+    if retrieval and retrieval.get("action"):
+        result["action"] = retrieval["action"]
+    return result
+
+
+async def run_with_deadline(dag: LazyDAG, target: str, seconds: float) -> Dict[str, Any]:
+    """
+    마감 시간 안에서 target 단계를 실행합니다. 시간이 지나면 남은 단계를 취소하고 부분 응답을 반환합니다.
+
+    Args:
+        dag: 대화 파이프라인
+        target: 요청할 최종 단계 이름
+        seconds: 마감까지 남은 시간(초)
+
+    Returns:
+        target 단계 결과 또는 부분 응답
+    """
+    with deadline_scope(seconds):
+        try:
+            return await asyncio.wait_for(dag.get(target), timeout=seconds)
+        except asyncio.TimeoutError:
+            dag.cancel()
+            metrics.increment(f"deadline.expired.{dag.name}")
+            logger.warning(f"[{dag.name}] 마감 시간 {seconds}초 초과, 완료된 단계: {list(dag.completed())}")
+            return partial_response(dag)
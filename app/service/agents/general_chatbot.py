@@ -1,6 +1,7 @@
 from typing import Dict, List, Any
+import asyncio
 import logging
-from app.service.openai_client import get_client
+from app.service.openai_client import get_client, create_chat_completion
 
 logger = logging.getLogger(__name__)
 
@@ -33,53 +34,91 @@ class GeneralChatbot:
         
         사용자가 정보를 쉽게 이해하고, 정서적으로도 지지받는다고 느낄 수 있도록 응답하세요.
         """
+        # 싱글톤으로 재사용되므로 요청마다 바뀌지 않는 메시지는 미리 만들어 둡니다.
+        self.system_message = {"role": "system", "content": self.system_prompt}
+        self.summary_system_message = {"role": "system", "content": "사용자의 질문을 간결하게 요약하고, 핵심 의도를 파악해주세요."}
+        self.conversation_summary_system_message = {
+            "role": "system",
+            "content": "이전 대화 요약과 새 대화 내용을 합쳐 하나의 요약으로 정리해주세요. 사용자의 상황(장애 유형, 지역, 관심 분야 등)과 이미 안내한 정보를 5문장 이내로 남겨주세요."
+        }
+        self.rewrite_system_message = {
+            "role": "system",
+            "content": f"{self.system_prompt}\n\n다음 전문가 응답을 사용자가 이해하기 쉽고 친절한 형태로 가공해주세요. 정보의 정확성은 유지하되, 더 대화체로 자연스럽게 만들어주세요."
+        }
     
-    async def process_initial_query(self, query: str) -> Dict[str, Any]:
+    async def generate_initial_response(self, query: str) -> str:
         """
-        사용자의 초기 질문을 처리합니다.
+        사용자 질문에 대한 일반 챗봇의 초기 응답을 생성합니다.
         
         Args:
             query: 사용자 질문
         
         Returns:
-            초기 응답과 대화 요약
+            초기 응답
         """
         try:
-            response = await self.client.chat.completions.create(
+            response = await create_chat_completion(
+                cache_name="initial_response",
                 model="gpt-4.1-mini",
                 messages=[
-                    {"role": "system", "content": self.system_prompt},
+                    self.system_message,
                     {"role": "user", "content": query}
                 ],
                 temperature=0.7
             )
+            return response.choices[0].message.content
             
-            initial_response = response.choices[0].message.content
-            
-            # 대화 요약 생성
-            summary_response = await self.client.chat.completions.create(
+        except Exception as e:
+            logger.error(f"초기 응답 생성 중 오류 발생: {e}")
+            return "죄송합니다. 현재 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+    
+    async def summarize_query(self, query: str) -> str:
+        """
+        사용자 질문을 요약하고 핵심 의도를 정리합니다.
+        
+        Args:
+            query: 사용자 질문
+        
+        Returns:
+            질문 요약 (실패 시 원래 질문)
+        """
+        try:
+            summary_response = await create_chat_completion(
+                cache_ttl=86400,
+                cache_name="query_summary",
                 model="gpt-4.1-mini",
                 messages=[
-                    {"role": "system", "content": "사용자의 질문을 간결하게 요약하고, 핵심 의도를 파악해주세요."},
+                    self.summary_system_message,
                     {"role": "user", "content": query}
                 ],
                 temperature=0.3,
                 max_tokens=100
             )
-            
-            conversation_summary = summary_response.choices[0].message.content
-            
-            return {
-                "initial_response": initial_response,
-                "conversation_summary": conversation_summary
-            }
+            return summary_response.choices[0].message.content
             
         except Exception as e:
-            logger.error(f"초기 질문 처리 중 오류 발생: {e}")
-            return {
-                "initial_response": "죄송합니다. 현재 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
-                "conversation_summary": query
-            }
+            logger.error(f"질문 요약 중 오류 발생: {e}")
+            return query
+    
+    async def process_initial_query(self, query: str) -> Dict[str, Any]:
+        """
+        사용자의 초기 질문을 처리합니다. 초기 응답과 요약을 동시에 생성합니다.
+        요약이 필요 없는 경로는 generate_initial_response를 직접 사용하세요.
+        
+        Args:
+            query: 사용자 질문
+        
+        Returns:
+            초기 응답과 대화 요약
+        """
+        initial_response, conversation_summary = await asyncio.gather(
+            self.generate_initial_response(query),
+            self.summarize_query(query)
+        )
+        return {
+            "initial_response": initial_response,
+            "conversation_summary": conversation_summary
+        }
     
     async def create_user_friendly_response(self, expert_response: Dict[str, Any], conversation: List[Dict[str, Any]]) -> str:
         """
@@ -98,10 +137,13 @@ class GeneralChatbot:
             
             conversation_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in conversation[-3:] if msg.get('content')])
             
-            response = await self.client.chat.completions.create(
+            # 같은 대화 맥락과 전문가 응답(카드 구성)이면 가공 결과를 재사용
+            response = await create_chat_completion(
+                cache_ttl=3600,
+                cache_name="user_friendly_response",
                 model="gpt-4.1-mini",
                 messages=[
-                    {"role": "system", "content": f"{self.system_prompt}\n\n다음 전문가 응답을 사용자가 이해하기 쉽고 친절한 형태로 가공해주세요. 정보의 정확성은 유지하되, 더 대화체로 자연스럽게 만들어주세요."},
+                    self.rewrite_system_message,
                     {"role": "user", "content": f"이전 대화:\n{conversation_text}\n\n전문가 응답:\n{expert_answer}"}
                 ],
                 temperature=0.7
@@ -111,4 +153,33 @@ class GeneralChatbot:
             
         except Exception as e:
             logger.error(f"응답 가공 중 오류 발생: {e}")
-            return expert_response.get("answer", "죄송합니다. 응답을 처리하는 중 오류가 발생했습니다.") 
\ No newline at end of file
+            return expert_response.get("answer", "죄송합니다. 응답을 처리하는 중 오류가 발생했습니다.")
+
+    async def summarize_conversation(self, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        """
+        이전 대화 요약에 새 대화 내용을 합쳐 누적 요약을 만듭니다. (세션 대화 기록 압축용)
+        
+        Args:
+            previous_summary: 이전 누적 요약 (없으면 빈 문자열)
+            messages: 요약에 합칠 대화 메시지
+        
+        Returns:
+            새 누적 요약 (실패 시 이전 요약)
+        """
+        try:
+            conversation_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in messages if msg.get('content')])
+            response = await create_chat_completion(
+                cache_name="conversation_summary",
+                model="gpt-4.1-mini",
+                messages=[
+                    self.conversation_summary_system_message,
+                    {"role": "user", "content": f"이전 대화 요약:\n{previous_summary or '(없음)'}\n\n새 대화 내용:\n{conversation_text}"}
+                ],
+                temperature=0.3,
+                max_tokens=300
+            )
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            logger.error(f"대화 요약 중 오류 발생: {e}")
+            return previous_summary
@@ -1,11 +1,43 @@
 from typing import Dict, List, Tuple, Any
 import logging
 from app.models.expert_type import ExpertType
-from app.service.openai_client import get_client
+from app.service.openai_client import get_client, create_chat_completion
+from app.service.utils.keyword_extractor import tokenize
+from app.service.utils.metrics import metrics
+from app.config.settings import CONSOLIDATION_LLM_SIMILARITY
 import json
 
 logger = logging.getLogger(__name__)
 
+def text_similarity(a: str, b: str) -> float:
+    """
+    두 응답 텍스트의 단어 집합 Jaccard 유사도를 계산합니다. (조사 제거 후 비교)
+
+    Args:
+        a: 첫 번째 텍스트
+        b: 두 번째 텍스트
+
+    Returns:
+        0~1 사이의 유사도
+    """
+    tokens_a, tokens_b = set(tokenize(a)), set(tokenize(b))
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+def dedupe_cards(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """id가 같은 카드는 처음 나온 것만 남깁니다. (id 없는 카드는 그대로 유지)"""
+    seen = set()
+    unique_cards = []
+    for card in cards:
+        card_id = card.get("id") if isinstance(card, dict) else None
+        if card_id:
+            if card_id in seen:
+                continue
+            seen.add(card_id)
+        unique_cards.append(card)
+    return unique_cards
+
 class SupervisorAgent:
     """
     슈퍼바이저 AI 에이전트 클래스
@@ -26,7 +58,18 @@ class SupervisorAgent:
         
         입력된 사용자 대화 내용을 분석하여 가장 적합한 전문가 AI를 선택하고, 
         관련된 키워드를 추출하여 해당 전문가 AI에게 전달할 수 있도록 준비하세요.
+        
+        반드시 다음 JSON 형식으로만 응답하세요:
+        {"expert_type": "정책 | 취업 | 고용 정책 | 구직자 현황", "keywords": ["키워드1", "키워드2"]}
         """
+        # 싱글톤으로 재사용되므로 요청마다 바뀌지 않는 메시지는 미리 만들어 둡니다.
+        self.system_message = {"role": "system", "content": self.system_prompt}
+        self.consolidate_system_message = {
+            "role": "system",
+            "content": "여러 전문가의 응답을 자연스럽게 통합하여 하나의 응답으로 만들어주세요. 다음 지침을 따르세요:\n\n1. 항상 따뜻하고 공감적인 톤으로 응답하세요.\n2. 답변 시작 부분에 짧은 공감/위로/격려 멘트를 포함하세요.\n3. 중복된 내용은 제거하고, 모든 중요한 정보를 포함하되 간결하게 정리해주세요.\n4. 정보를 단계별로 또는 카테고리별로 구조화하여 이해하기 쉽게 만들어주세요.\n5. 실용적이고 구체적인 정보와 따뜻한 정서적 지지를 함께 제공하세요."
+        }
+        # ExpertType 값으로 enum을 바로 찾기 위한 매핑
+        self.expert_types_by_value = {et.value: et for et in ExpertType}
     
     async def analyze_conversation(self, conversation: List[Dict[str, Any]]) -> Tuple[ExpertType, List[str]]:
         """
@@ -42,10 +85,13 @@ class SupervisorAgent:
             # 대화 내용 요약
             conversation_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in conversation if msg.get('content')])
             
-            response = await self.client.chat.completions.create(
+            # 같은 대화는 같은 라우팅 결과를 내므로 응답을 캐싱
+            response = await create_chat_completion(
+                cache_ttl=3600,
+                cache_name="supervisor_analysis",
                 model="gpt-4.1-mini",
                 messages=[
-                    {"role": "system", "content": self.system_prompt},
+                    self.system_message,
                     {"role": "user", "content": f"다음 대화 내용을 분석하여 가장 적합한 전문가 유형과 관련 키워드를 추출해주세요:\n\n{conversation_text}"}
                 ],
                 temperature=0.3
@@ -61,20 +107,21 @@ class SupervisorAgent:
             expert_type_str = parsed_result.get("expert_type", "취업")
             keywords = parsed_result.get("keywords", [])
             
-            # 문자열을 ExpertType으로 변환
-            expert_type = None
-            for et in ExpertType:
-                if et.value == expert_type_str:
-                    expert_type = et
-                    break
+            # 문자열을 ExpertType으로 변환 (알 수 없는 값이면 기본 전문가 사용)
+            expert_type = self.expert_types_by_value.get(expert_type_str, ExpertType.EMPLOYMENT)
+            if not isinstance(keywords, list):
+                keywords = []
+            
+            return expert_type, keywords
             
         except Exception as e:
             logger.error(f"슈퍼바이저 분석 중 오류 발생: {e}")
-            return ExpertType.COUNSELING, []
+            return ExpertType.EMPLOYMENT, []
     
     async def consolidate_responses(self, expert_responses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         여러 전문가 AI의 응답을 종합합니다.
+        응답 내용이 서로 겹칠 때만 LLM으로 통합하고, 그 외에는 응답을 순서대로 이어 붙입니다. (카드는 id 기준 중복 제거)
         
         Args:
             expert_responses: 전문가 AI 응답 리스트
@@ -123,20 +170,39 @@ class SupervisorAgent:
             for resp in expert_responses:
                 if resp.get("cards"):
                     all_cards.extend(resp.get("cards"))
-            
-            # 응답 텍스트 종합
-            consolidated_text = "\n\n".join(all_answers)
-            
-            response = await self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": "여러 전문가의 응답을 자연스럽게 통합하여 하나의 응답으로 만들어주세요. 다음 지침을 따르세요:\n\n1. 항상 따뜻하고 공감적인 톤으로 응답하세요.\n2. 답변 시작 부분에 짧은 공감/위로/격려 멘트를 포함하세요.\n3. 중복된 내용은 제거하고, 모든 중요한 정보를 포함하되 간결하게 정리해주세요.\n4. 정보를 단계별로 또는 카테고리별로 구조화하여 이해하기 쉽게 만들어주세요.\n5. 실용적이고 구체적인 정보와 따뜻한 정서적 지지를 함께 제공하세요."},
-                    {"role": "user", "content": f"다음 전문가 응답들을 통합해주세요:\n\n{consolidated_text}"}
-                ],
-                temperature=0.5
+            all_cards = dedupe_cards(all_cards)
+            
+            # 빈 응답과 완전히 같은 응답은 한 번만 사용
+            sections = []
+            for answer in all_answers:
+                answer = (answer or "").strip()
+                if answer and answer not in sections:
+                    sections.append(answer)
+            
+            # 응답끼리 내용이 겹치지(충돌하지) 않으면 LLM 호출 없이 템플릿으로 이어 붙임
+            max_similarity = max(
+                (text_similarity(a, b) for i, a in enumerate(sections) for b in sections[i + 1:]),
+                default=0.0
             )
-            
-            consolidated_answer = response.choices[0].message.content
+            if max_similarity < CONSOLIDATION_LLM_SIMILARITY:
+                metrics.increment("consolidation.template")
+                consolidated_answer = "\n\n".join(sections)
+            else:
+                metrics.increment("consolidation.llm")
+                logger.info(f"응답 유사도 {max_similarity:.2f}, LLM으로 통합")
+                consolidated_text = "\n\n".join(sections)
+                
+                response = await create_chat_completion(
+                    cache_name="consolidation",
+                    model="gpt-4.1-mini",
+                    messages=[
+                        self.consolidate_system_message,
+                        {"role": "user", "content": f"다음 전문가 응답들을 통합해주세요:\n\n{consolidated_text}"}
+                    ],
+                    temperature=0.5
+                )
+                
+                consolidated_answer = response.choices[0].message.content
             
             result = {
                 "answer": consolidated_answer,
@@ -1,9 +1,14 @@
 import os
 import json
+import asyncio
+import hashlib
 import pymysql
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from app.service.openai_client import get_client
+from app.service.utils.cache import SimpleCache
+from app.service.utils.metrics import metrics
+from app.service.utils.rate_limiter import Priority, priority_scope
 
 # 환경변수 로드
 load_dotenv()
@@ -21,6 +26,10 @@ MYSQL_USER = os.getenv("MYSQL_USER")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 MYSQL_DB = os.getenv("MYSQL_DB") 
 
+# 분석에 사용하는 정책 코퍼스 (정책 텍스트, 버전) 캐시
+POLICY_BENEFICIARY_TYPES = ["individual", "company"]
+policy_corpus_cache = SimpleCache(ttl=300, max_size=1)
+
 # MySQL 연결 함수
 def get_mysql_connection():
     return pymysql.connect(
@@ -33,12 +42,21 @@ def get_mysql_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
-# GPT 분석 및 저장 함수
-async def analyze_and_store(user_info: dict, job_info: dict):
-    client = get_client()
+def _hash(value) -> str:
+    # 키 순서와 무관하게 같은 입력은 같은 해시
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def load_policy_corpus():
+    """
+    분석 프롬프트에 넣을 정책 텍스트와 코퍼스 버전(정책 텍스트 해시)을 반환합니다.
+    프롬프트에 들어가는 정책이 바뀔 때만 버전이 바뀝니다.
+    """
+    cached = policy_corpus_cache.get("corpus")
+    if cached is not None:
+        return cached
 
     # 🔎 MongoDB에서 정책 데이터 가져오기 (요약 + 세부내용을 묶어서)
-    policies = list(policy_collection.find({"beneficiary_type": {"$in": ["individual", "company"]}}))
+    policies = list(policy_collection.find({"beneficiary_type": {"$in": POLICY_BENEFICIARY_TYPES}}).sort("_id", 1))
     policy_texts = []
 
     for p in policies:
@@ -53,6 +71,69 @@ async def analyze_and_store(user_info: dict, job_info: dict):
         policy_texts.append(f"{p.get('policy_name', '')}:\n{summary}\n{detail_str}")
 
     policy_text_combined = "\n\n".join(policy_texts)
+    corpus = (policy_text_combined, _hash(policy_text_combined)[:16])
+    policy_corpus_cache.set("corpus", corpus)
+    return corpus
+
+def input_fingerprint(user_info: dict, job_info: dict, corpus_version: str) -> str:
+    """유저 정보 해시 + 공고 정보 해시 + 정책 코퍼스 버전으로 분석 입력 지문을 만듭니다."""
+    return hashlib.sha256(f"{_hash(user_info)}:{_hash(job_info)}:{corpus_version}".encode("utf-8")).hexdigest()
+
+def fetch_stored_result(user_id, job_id, fingerprint: str):
+    # 저장된 분석 결과의 입력 지문이 같으면 재사용 (유저/공고/정책이 바뀌면 지문이 달라짐)
+    conn = get_mysql_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT my_benefits, company_benefits FROM analysis_results "
+                "WHERE user_id = %s AND job_id = %s AND input_fingerprint = %s",
+                (user_id, job_id, fingerprint)
+            )
+            row = cursor.fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {
+        "my_benefits": [line for line in (row["my_benefits"] or "").split("\n") if line],
+        "company_benefits": [line for line in (row["company_benefits"] or "").split("\n") if line]
+    }
+
+def store_result(user_id, job_id, fingerprint: str, my_benefits, company_benefits):
+    conn = get_mysql_connection()
+    try:
+        with conn.cursor() as cursor:
+            sql = """
+            INSERT INTO analysis_results (user_id, job_id, my_benefits, company_benefits, input_fingerprint)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                my_benefits = VALUES(my_benefits),
+                company_benefits = VALUES(company_benefits),
+                input_fingerprint = VALUES(input_fingerprint)
+            """
+            cursor.execute(sql, (
+                user_id,
+                job_id,
+                "\n".join(my_benefits),
+                "\n".join(company_benefits),
+                fingerprint
+            ))
+            conn.commit()
+    finally:
+        conn.close()
+
+# GPT 분석 및 저장 함수
+async def analyze_and_store(user_info: dict, job_info: dict):
+    client = get_client()
+
+    # 동기 DB 드라이버(pymongo/pymysql)는 이벤트 루프를 막지 않도록 스레드에서 실행
+    policy_text_combined, corpus_version = await asyncio.to_thread(load_policy_corpus)
+    fingerprint = input_fingerprint(user_info, job_info, corpus_version)
+    stored = await asyncio.to_thread(fetch_stored_result, user_info["id"], job_info["jobId"], fingerprint)
+    if stored is not None:
+        metrics.increment("benefit_analysis.memo_hit")
+        return stored
+    metrics.increment("benefit_analysis.memo_miss")
 
     prompt = f"""
     유저 정보:
@@ -76,14 +157,15 @@ async def analyze_and_store(user_info: dict, job_info: dict):
     - 혜택2
     """
 
-    # GPT 호출
-    response = await client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": "너는 장애인 정책 분석가야."},
-            {"role": "user", "content": prompt}
-        ]
-    )
+    # GPT 호출 (실시간 대화보다 낮은 우선순위)
+    with priority_scope(Priority.ANALYSIS):
+        response = await client.chat.completions.create(
+            model="gpt-4.1-mini",
+            messages=[
+                {"role": "system", "content": "너는 장애인 정책 분석가야."},
+                {"role": "user", "content": prompt}
+            ]
+        )
     content = response.choices[0].message.content
 
     # 결과 파싱
@@ -103,24 +185,8 @@ async def analyze_and_store(user_info: dict, job_info: dict):
             elif current == "company":
                 company_benefits.append(line.lstrip("- ").strip())
 
-    # MySQL 저장
-    conn = get_mysql_connection()
-    with conn.cursor() as cursor:
-        sql = """
-        INSERT INTO analysis_results (user_id, job_id, my_benefits, company_benefits)
-        VALUES (%s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            my_benefits = VALUES(my_benefits),
-            company_benefits = VALUES(company_benefits)
-        """
-        cursor.execute(sql, (
-            user_info["id"],
-            job_info["jobId"],
-            "\n".join(my_benefits),
-            "\n".join(company_benefits)
-        ))
-        conn.commit()
-    conn.close()
+    # MySQL 저장 (입력 지문과 함께)
+    await asyncio.to_thread(store_result, user_info["id"], job_info["jobId"], fingerprint, my_benefits, company_benefits)
 
     return {
         "my_benefits": my_benefits,
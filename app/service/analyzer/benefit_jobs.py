@@ -0,0 +1,306 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import ipaddress
+import logging
+import socket
+import uuid
+from urllib.parse import urlsplit
+import aiohttp
+from pymongo import ReturnDocument
+from app.config.settings import (
+    BENEFIT_JOB_WORKERS, BENEFIT_JOB_QUEUE_SIZE, BENEFIT_JOB_RETENTION_DAYS, BENEFIT_JOB_STALE_SECONDS,
+    BENEFIT_CALLBACK_ALLOWED_HOSTS
+)
+from app.service.analyzer.benefit_analysis import analyze_and_store
+from app.service.motor_client import get_public_data_db
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 혜택 분석 비동기 작업
+#
+# /analyze/benefits?mode=async 요청은 작업을 MongoDB에 기록하고 크기 제한이 있는 큐에 넣은 뒤 바로 202를 반환합니다.
+# 워커(BENEFIT_JOB_WORKERS개)가 큐에서 꺼내 분석하고, 결과는 상태 조회 API나 완료 콜백으로 전달합니다.
+# 큐가 가득 차면 QueueFullError로 거절하여(503) 호출 측이 나중에 다시 시도하게 합니다.
+# 여러 앱 프로세스가 같은 컬렉션을 쓰므로 워커는 작업을 find_one_and_update로 선점(claim)한 뒤 실행하고,
+# 선점 토큰이 그대로일 때만 결과를 기록하고 콜백을 보냅니다. (같은 작업이 두 번 분석/통지되지 않도록)
+# 콜백 URL은 등록 시와 전송 직전에 검사하여 내부망/루프백/메타데이터 주소로는 보내지 않습니다. (SSRF 방지)
+
+COLLECTION_NAME = "benefit_analysis_jobs"
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+CALLBACK_RETRIES = 3
+
+
+class QueueFullError(Exception):
+    """작업 큐가 가득 찬 경우"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"작업 큐가 가득 찼습니다. ({retry_after:.0f}초 후 재시도)")
+        self.retry_after = retry_after
+
+
+class InvalidCallbackURL(ValueError):
+    """허용되지 않는 콜백 URL"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def validate_callback_url(url: str) -> None:
+    """
+    콜백 URL이 외부 공개 호스트를 가리키는지 검사합니다.
+
+    Args:
+        url: 콜백 URL
+
+    Raises:
+        InvalidCallbackURL: 스킴/호스트가 허용되지 않거나 사설/루프백/링크 로컬 주소로 연결되는 경우
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in ("http", "https") or not host:
+        raise InvalidCallbackURL("콜백 URL은 http(s) 절대 주소여야 합니다.")
+    if BENEFIT_CALLBACK_ALLOWED_HOSTS and not any(
+        host == allowed or host.endswith("." + allowed) for allowed in BENEFIT_CALLBACK_ALLOWED_HOSTS
+    ):
+        raise InvalidCallbackURL("허용되지 않은 콜백 호스트입니다.")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (OSError, ValueError):
+        raise InvalidCallbackURL("콜백 호스트를 확인할 수 없습니다.")
+    if not infos or not all(_is_public_address(info[4][0]) for info in infos):
+        raise InvalidCallbackURL("내부망 주소로는 콜백을 보낼 수 없습니다.")
+
+
+class BenefitJobQueue:
+    """
+    혜택 분석 작업 큐와 워커 풀
+    """
+
+    def __init__(self, workers: int = BENEFIT_JOB_WORKERS, max_queue: int = BENEFIT_JOB_QUEUE_SIZE):
+        """
+        Args:
+            workers: 동시에 실행할 분석 수
+            max_queue: 대기열 최대 크기
+        """
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._tasks: List[asyncio.Task] = []
+        # 전송 중인 콜백 (워커가 콜백 재시도를 기다리지 않도록 별도 태스크로 실행)
+        self._callbacks: set = set()
+        # 작업 하나의 평균 처리 시간(초), Retry-After 추정용
+        self.average_seconds = 10.0
+
+    @property
+    def collection(self):
+        return get_public_data_db()[COLLECTION_NAME]
+
+    def retry_after(self) -> float:
+        """대기열이 비워질 때까지 걸릴 것으로 예상되는 시간(초)"""
+        return max(1.0, self.queue.qsize() * self.average_seconds / max(self.workers, 1))
+
+    async def start(self) -> None:
+        """워커를 시작하고, 이전 프로세스에서 끝나지 않은 작업을 다시 큐에 넣습니다."""
+        if self._tasks:
+            return
+        try:
+            await self.collection.create_index("updatedAt", expireAfterSeconds=BENEFIT_JOB_RETENTION_DAYS * 86400)
+            # 실행 중 작업은 갱신이 오래 멈춘 경우(프로세스 중단)만 재개 (다른 프로세스가 실행 중일 수 있음)
+            cursor = self.collection.find(self._claimable(), {"_id": 1}).sort("createdAt", 1)
+            for doc in await cursor.to_list(length=self.queue.maxsize):
+                if self.queue.full():
+                    break
+                self.queue.put_nowait(doc["_id"])
+            if self.queue.qsize():
+                logger.info(f"[혜택 분석 작업] 미완료 작업 {self.queue.qsize()}개 재개")
+        except Exception as e:
+            logger.error(f"[혜택 분석 작업] 미완료 작업 복구 실패: {e}")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        """워커를 중지합니다. (진행 중이던 작업은 다음 시작 시 재개)"""
+        for task in self._tasks + list(self._callbacks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._callbacks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, user_info: Dict[str, Any], job_info: Dict[str, Any], callback_url: Optional[str] = None) -> str:
+        """
+        분석 작업을 등록합니다.
+
+        Args:
+            user_info: 유저 정보
+            job_info: 공고 정보
+            callback_url: 완료 시 결과를 POST할 URL (선택)
+
+        Returns:
+            작업 ID
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+            InvalidCallbackURL: 콜백 URL이 허용되지 않는 경우
+        """
+        if callback_url:
+            await validate_callback_url(callback_url)
+        if self.queue.full():
+            metrics.increment("benefit_jobs.rejected")
+            raise QueueFullError(self.retry_after())
+        job_id = uuid.uuid4().hex
+        now = _now()
+        await self.collection.insert_one({
+            "_id": job_id,
+            "status": QUEUED,
+            "userInfo": user_info,
+            "jobInfo": job_info,
+            "callbackUrl": callback_url,
+            "createdAt": now,
+            "updatedAt": now
+        })
+        try:
+            self.queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            # 기록하는 사이 큐가 찬 경우
+            await self.collection.delete_one({"_id": job_id})
+            metrics.increment("benefit_jobs.rejected")
+            raise QueueFullError(self.retry_after())
+        metrics.increment("benefit_jobs.submitted")
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태를 조회합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 상태 (job_id, status, result/error, 시각) 또는 None
+        """
+        doc = await self.collection.find_one({"_id": job_id}, {"userInfo": 0, "jobInfo": 0, "callbackUrl": 0})
+        if doc is None:
+            return None
+        return self._public(doc)
+
+    def _public(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        status = {"job_id": doc["_id"], "status": doc["status"]}
+        if doc.get("result") is not None:
+            status["result"] = doc["result"]
+        if doc.get("error"):
+            status["error"] = doc["error"]
+        for key, name in (("createdAt", "created_at"), ("updatedAt", "updated_at")):
+            if doc.get(key):
+                status[name] = doc[key].isoformat()
+        if doc["status"] == QUEUED:
+            status["queue_size"] = self.queue.qsize()
+        return status
+
+    @staticmethod
+    def _claimable() -> Dict[str, Any]:
+        """선점할 수 있는 작업 조건 (대기 중이거나, 실행 중이지만 갱신이 오래 멈춘 작업)"""
+        stale_before = _now() - timedelta(seconds=BENEFIT_JOB_STALE_SECONDS)
+        return {"$or": [{"status": QUEUED}, {"status": RUNNING, "updatedAt": {"$lt": stale_before}}]}
+
+    async def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업을 원자적으로 선점합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            선점한 작업 문서 (claimToken 포함), 이미 다른 워커가 선점했거나 끝난 작업이면 None
+        """
+        return await self.collection.find_one_and_update(
+            {"_id": job_id, **self._claimable()},
+            {"$set": {"status": RUNNING, "claimToken": uuid.uuid4().hex, "updatedAt": _now()}, "$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _finish(self, job_id: str, claim_token: str, fields: Dict[str, Any]) -> bool:
+        """선점 토큰이 그대로인 경우에만 결과를 기록합니다. (기록했으면 True)"""
+        result = await self.collection.update_one(
+            {"_id": job_id, "claimToken": claim_token},
+            {"$set": {**fields, "updatedAt": _now()}}
+        )
+        return result.matched_count == 1
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[혜택 분석 작업] 워커 {index} 작업 {job_id} 처리 중 오류: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        doc = await self._claim(job_id)
+        if doc is None:
+            metrics.increment("benefit_jobs.claim_skipped")
+            return
+        started = asyncio.get_running_loop().time()
+        try:
+            result = await analyze_and_store(doc["userInfo"], doc["jobInfo"])
+            if not result:
+                raise RuntimeError("분석 실패")
+            update = {"status": SUCCEEDED, "result": result}
+            metrics.increment("benefit_jobs.succeeded")
+        except Exception as e:
+            logger.error(f"[혜택 분석 작업] {job_id} 분석 실패: {e}")
+            update = {"status": FAILED, "error": str(e)}
+            metrics.increment("benefit_jobs.failed")
+        elapsed = asyncio.get_running_loop().time() - started
+        self.average_seconds = 0.8 * self.average_seconds + 0.2 * elapsed
+        if not await self._finish(job_id, doc["claimToken"], update):
+            # 실행이 오래 걸려 다른 워커가 다시 선점한 경우 그 워커가 결과를 기록/통지
+            logger.warning(f"[혜택 분석 작업] {job_id} 선점이 다른 워커로 넘어가 결과를 기록하지 않습니다.")
+            return
+        if doc.get("callbackUrl"):
+            task = asyncio.create_task(self._notify(doc["callbackUrl"], {"job_id": job_id, **update}))
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+
+    async def _notify(self, url: str, payload: Dict[str, Any]) -> None:
+        """완료 콜백을 보냅니다. (실패 시 짧게 재시도, 결과는 상태 조회로도 확인 가능)"""
+        timeout = aiohttp.ClientTimeout(total=10)
+        for attempt in range(1, CALLBACK_RETRIES + 1):
+            try:
+                # 등록 이후 DNS가 내부 주소로 바뀌었을 수 있으므로 전송 직전에 다시 검사
+                await validate_callback_url(url)
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    async with session.post(url, json=payload, allow_redirects=False) as response:
+                        if response.status < 400:
+                            return
+                        logger.warning(f"[혜택 분석 작업] 콜백 응답 {response.status} ({attempt}/{CALLBACK_RETRIES})")
+            except InvalidCallbackURL as e:
+                logger.warning(f"[혜택 분석 작업] 콜백 URL 거부: {e}")
+                break
+            except Exception as e:
+                logger.warning(f"[혜택 분석 작업] 콜백 실패 ({attempt}/{CALLBACK_RETRIES}): {e}")
+            if attempt < CALLBACK_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+        metrics.increment("benefit_jobs.callback_failed")
+
+
+# 글로벌 작업 큐
+benefit_job_queue = BenefitJobQueue()
+
+
+def get_benefit_job_queue() -> BenefitJobQueue:
+    """글로벌 혜택 분석 작업 큐를 반환합니다."""
+    return benefit_job_queue
@@ -0,0 +1,303 @@
+"""
+장애인 구직자 통계 엔진
+disabled_jobseekers 컬렉션을 장애유형, 중증여부, 희망지역, 희망직종, 연령대, 희망임금 구간별로
+미리 집계해 메모리에 보관하고, 조회는 dict 조회 한 번(O(1))으로 처리합니다.
+새로 적재된 구직자는 _id 기준으로 증분 반영하며, 수정/삭제 반영을 위해 주기적으로 전체 재집계합니다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.config.settings import JOBSEEKER_STATS_REBUILD_SECONDS, JOBSEEKER_STATS_REFRESH_SECONDS
+from app.service.motor_client import get_public_data_db
+from app.service.utils.job_offer_fields import extract_region, normalize_region
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "disabled_jobseekers"
+
+# 집계 차원 -> 카드에 표시할 이름
+DIMENSIONS: Dict[str, str] = {
+    "disability": "장애유형",
+    "severity": "중증여부",
+    "region": "희망지역",
+    "job": "희망직종",
+    "age_band": "연령대",
+    "wage_bucket": "희망임금",
+}
+
+# 집계에 필요한 원본 필드 (embedding 제외)
+_PROJECTION = {"연령": 1, "장애유형": 1, "중증여부": 1, "희망임금": 1, "희망지역": 1, "희망직종": 1}
+
+# 통계 질문으로 판단하는 표현
+STATS_INTENT_PATTERN = re.compile(r'현황|통계|몇\s*명|분포|비율|인원|규모|얼마나')
+
+_NUMBER_PATTERN = re.compile(r'\d[\d,]*')
+# 시급을 월급으로 환산할 때 사용하는 월 소정근로시간 (주 40시간 기준)
+_MONTHLY_HOURS = 209
+
+
+def age_band(value: Any) -> Optional[str]:
+    """연령 값을 연령대("20대", "60대 이상")로 변환합니다."""
+    match = _NUMBER_PATTERN.search(str(value or ""))
+    if not match:
+        return None
+    age = int(match.group().replace(",", ""))
+    if age < 20:
+        return "10대"
+    if age >= 60:
+        return "60대 이상"
+    return f"{age // 10 * 10}대"
+
+
+def wage_bucket(value: Any) -> Optional[str]:
+    """
+    희망임금 문자열을 월급 기준 구간으로 변환합니다.
+    시급은 월 209시간 기준으로 환산하고, 1만 미만의 숫자는 만원 단위로 봅니다.
+    """
+    text = str(value or "")
+    match = _NUMBER_PATTERN.search(text)
+    if not match:
+        return "협의/미기재" if text.strip() else None
+    amount = int(match.group().replace(",", ""))
+    if "시급" in text or "시간" in text:
+        amount *= _MONTHLY_HOURS
+    elif amount < 10000:
+        amount *= 10000
+    monthly = amount // 10000
+    if monthly < 150:
+        return "150만원 미만"
+    if monthly < 200:
+        return "150~200만원"
+    if monthly < 250:
+        return "200~250만원"
+    if monthly < 300:
+        return "250~300만원"
+    return "300만원 이상"
+
+
+def _clean(value: Any) -> Optional[str]:
+    text = str(value).strip() if value is not None else ""
+    return text or None
+
+
+def dimension_values(doc: Dict[str, Any]) -> Dict[str, str]:
+    """구직자 문서에서 집계 차원별 값을 계산합니다."""
+    values = {
+        "disability": _clean(doc.get("장애유형")),
+        "severity": _clean(doc.get("중증여부")),
+        "region": normalize_region(doc.get("희망지역")) or _clean(doc.get("희망지역")),
+        "job": _clean(doc.get("희망직종")),
+        "age_band": age_band(doc.get("연령")),
+        "wage_bucket": wage_bucket(doc.get("희망임금")),
+    }
+    return {dim: value for dim, value in values.items() if value}
+
+
+class JobSeekerStats:
+    """
+    구직자 집계 결과를 메모리에 보관하는 통계 엔진
+    - counts[dim][value]: 단일 조건 인원 수
+    - pair_counts[(dim_a, dim_b)][value_a][value_b]: 두 조건 교차 인원 수
+    """
+
+    def __init__(self):
+        self._reset()
+        self._lock = asyncio.Lock()
+
+    def _reset(self) -> None:
+        self.total = 0
+        self.counts: Dict[str, Counter] = defaultdict(Counter)
+        self.pair_counts: Dict[Tuple[str, str], Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        self.last_id = None
+        self.built_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.built_at is not None
+
+    def add(self, doc: Dict[str, Any]) -> None:
+        """구직자 한 명을 집계에 반영합니다."""
+        values = dimension_values(doc)
+        self.total += 1
+        for dim, value in values.items():
+            self.counts[dim][value] += 1
+        for dim_a, value_a in values.items():
+            for dim_b, value_b in values.items():
+                if dim_a != dim_b:
+                    self.pair_counts[(dim_a, dim_b)][value_a][value_b] += 1
+        if doc.get("_id") is not None:
+            self.last_id = doc["_id"] if self.last_id is None else max(self.last_id, doc["_id"])
+
+    async def _scan(self, query: Dict[str, Any]) -> int:
+        collection = get_public_data_db()[COLLECTION_NAME]
+        scanned = 0
+        async for doc in collection.find(query, _PROJECTION).sort("_id", 1):
+            self.add(doc)
+            scanned += 1
+        return scanned
+
+    async def rebuild(self) -> None:
+        """컬렉션 전체를 다시 집계합니다."""
+        async with self._lock:
+            await self._rebuild_locked()
+
+    async def _rebuild_locked(self) -> None:
+        # 집계 중에도 조회가 부분 집계를 보지 않도록 새 인스턴스에 집계한 뒤 완료 시점에 교체
+        # (재집계 실패 시 기존 집계 유지)
+        start = time.perf_counter()
+        fresh = JobSeekerStats()
+        await fresh._scan({})
+        self.total, self.counts, self.pair_counts, self.last_id = fresh.total, fresh.counts, fresh.pair_counts, fresh.last_id
+        self.built_at = self.refreshed_at = time.time()
+        logger.info(f"[구직자 통계] 전체 집계 완료: {self.total}명, {time.perf_counter() - start:.2f}초")
+
+    async def refresh(self) -> int:
+        """
+        마지막 집계 이후 새로 적재된 구직자만 증분 반영합니다.
+        전체 재집계 주기가 지났으면 전체를 다시 집계합니다.
+
+        Returns:
+            새로 반영된 구직자 수
+        """
+        if not self.loaded or time.time() - self.built_at > JOBSEEKER_STATS_REBUILD_SECONDS:
+            before = self.total
+            await self.rebuild()
+            return self.total - before
+        async with self._lock:
+            query = {"_id": {"$gt": self.last_id}} if self.last_id is not None else {}
+            added = await self._scan(query)
+            self.refreshed_at = time.time()
+        if added:
+            logger.info(f"[구직자 통계] 증분 반영: {added}명 (누적 {self.total}명)")
+        return added
+
+    async def ensure_loaded(self) -> None:
+        if self.loaded:
+            return
+        async with self._lock:
+            # 동시에 들어온 첫 요청들이 각각 전체 집계하지 않도록 잠금 후 다시 확인
+            if not self.loaded:
+                await self._rebuild_locked()
+
+    def count(self, filters: Optional[Dict[str, str]] = None) -> int:
+        """
+        조건(최대 2개)에 맞는 구직자 수를 반환합니다.
+
+        Args:
+            filters: 차원 -> 값
+        """
+        items = list((filters or {}).items())[:2]
+        if not items:
+            return self.total
+        if len(items) == 1:
+            dim, value = items[0]
+            return self.counts[dim].get(value, 0)
+        (dim_a, value_a), (dim_b, value_b) = items
+        return self.pair_counts[(dim_a, dim_b)][value_a].get(value_b, 0)
+
+    def distribution(self, dim: str, filters: Optional[Dict[str, str]] = None, top: int = 5) -> List[Tuple[str, int]]:
+        """
+        차원별 분포 상위 항목을 반환합니다. 조건은 1개까지 적용됩니다.
+
+        Args:
+            dim: 분포를 볼 차원
+            filters: 차원 -> 값 (첫 번째 조건만 사용)
+            top: 반환할 항목 수
+        """
+        items = [(d, v) for d, v in (filters or {}).items() if d != dim]
+        if not items:
+            return self.counts[dim].most_common(top)
+        filter_dim, filter_value = items[0]
+        return self.pair_counts[(filter_dim, dim)][filter_value].most_common(top)
+
+    def match_filters(self, query: str) -> Dict[str, str]:
+        """
+        질문에 언급된 집계 값(예: "시각장애", "서울", "중증")을 조건으로 추출합니다.
+        교차 집계가 두 차원까지이므로 조건은 최대 2개입니다.
+        """
+        filters: Dict[str, str] = {}
+        for dim in ("disability", "severity", "region", "job", "age_band"):
+            candidates = [value for value in self.counts[dim] if len(value) >= 2 and value in query]
+            if dim == "region" and not candidates:
+                # "서울특별시", "경기도" 같은 표기도 정규화된 지역명으로 매칭
+                region = extract_region(query)
+                candidates = [region] if region in self.counts[dim] else []
+            if candidates:
+                # 가장 구체적인(긴) 값을 선택
+                filters[dim] = max(candidates, key=len)
+            if len(filters) == 2:
+                break
+        return filters
+
+
+# 글로벌 통계 엔진 인스턴스
+jobseeker_stats = JobSeekerStats()
+
+
+def build_stat_cards(stats: JobSeekerStats, query: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    질문에 맞는 구직자 통계 카드를 만듭니다.
+
+    Args:
+        stats: 통계 엔진
+        query: 사용자 질문
+
+    Returns:
+        (응답 텍스트, 통계 카드 목록)
+    """
+    filters = stats.match_filters(query)
+    condition_text = ", ".join(filters.values()) if filters else "전체"
+    matched = stats.count(filters)
+
+    cards = [{
+        "id": "jobseeker-stats-total",
+        "title": f"장애인 구직자 현황 ({condition_text})",
+        "subtitle": "구직자 수",
+        "summary": f"조건에 맞는 구직자 {matched:,}명 (전체 {stats.total:,}명)",
+        "type": "job_seeker_stats",
+        "details": f"조건: {condition_text}\n구직자 수: {matched:,}명\n전체 구직자: {stats.total:,}명"
+    }]
+
+    for dim in [d for d in ("disability", "region", "job", "age_band", "wage_bucket", "severity") if d not in filters][:3]:
+        rows = stats.distribution(dim, filters)
+        if not rows:
+            continue
+        # 분포는 첫 번째 조건 기준으로 집계되므로 비율도 같은 기준으로 계산
+        base_filter = dict([(d, v) for d, v in filters.items() if d != dim][:1])
+        base = stats.count(base_filter)
+        details = "\n".join(
+            f"• {value}: {count:,}명 ({count / base * 100:.1f}%)" if base else f"• {value}: {count:,}명"
+            for value, count in rows
+        )
+        cards.append({
+            "id": f"jobseeker-stats-{dim}",
+            "title": f"{DIMENSIONS[dim]}별 구직자 분포",
+            "subtitle": ", ".join(base_filter.values()) or "전체",
+            "summary": ", ".join(f"{value} {count:,}명" for value, count in rows[:3]),
+            "type": "job_seeker_stats",
+            "details": details
+        })
+
+    text = f"장애인 구직자 현황 정보를 안내해 드리겠습니다.\n\n조건({condition_text})에 맞는 구직자는 {matched:,}명입니다."
+    return text, cards
+
+
+async def refresh_periodically(interval: float = JOBSEEKER_STATS_REFRESH_SECONDS) -> None:
+    """
+    구직자 통계를 주기적으로 증분 갱신합니다. 애플리케이션 lifespan에서 백그라운드 태스크로 실행합니다.
+
+    Args:
+        interval: 갱신 주기(초)
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await jobseeker_stats.refresh()
+        except Exception as e:
+            logger.error(f"[구직자 통계] 갱신 중 오류 발생: {e}")
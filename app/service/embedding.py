@@ -1,26 +1,55 @@
-from openai import AsyncOpenAI
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
 import asyncio
+from typing import List
+from app.service.openai_client import get_client
+from app.service.utils.rate_limiter import Priority, run_with_priority
+from app.service.utils.cache import embedding_cache
+from app.service.utils.deadline import timeout_for
 
 load_dotenv()
 client = MongoClient(os.getenv("MONGO_URI"))
 db = client["kead_db"]
 collection = db["policy_chunks"]
 
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 채팅과 같은 OpenAI 클라이언트를 사용하여 커넥션 풀을 공유
+openai_client = get_client()
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
 
 async def get_embedding(text: str):
-    response = await openai_client.embeddings.create(
-        model="text-embedding-ada-002",
-        input=text
-    )
-    return response.data[0].embedding
+    return (await get_embeddings([text]))[0]
+
+async def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    여러 텍스트의 임베딩을 가져옵니다. 캐시에 없는 텍스트만 한 번의 요청(multi-input)으로 임베딩합니다.
+
+    Args:
+        texts: 임베딩할 텍스트 목록
 
-print("💡 아직 임베딩되지 않은 문서 수:", collection.count_documents({"embedding": None}))
+    Returns:
+        입력 순서와 같은 순서의 임베딩 목록
+    """
+    embeddings = [embedding_cache.get(f"{EMBEDDING_MODEL}:{text}") for text in texts]
+    # 같은 텍스트가 여러 번 들어와도 한 번만 요청
+    missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+    if missing:
+        response = await openai_client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=missing,
+            timeout=timeout_for(30.0, "openai.embedding")
+        )
+        fetched = {}
+        for text, item in zip(missing, sorted(response.data, key=lambda item: item.index)):
+            fetched[text] = item.embedding
+            embedding_cache.set(f"{EMBEDDING_MODEL}:{text}", item.embedding)
+        embeddings = [embedding if embedding is not None else fetched[text] for text, embedding in zip(texts, embeddings)]
+    return embeddings
 
 async def fill_embeddings():
+    # 앱 import 시 DB 조회가 일어나지 않도록 스크립트 실행 시에만 출력
+    print("💡 아직 임베딩되지 않은 문서 수:", collection.count_documents({"embedding": None}))
     chunks = collection.find({"embedding": None})
     for chunk in chunks:
         print("🔍 처리 중:", chunk["metadata"]["title"])
@@ -40,4 +69,5 @@ async def fill_embeddings():
             print(f"❌ 에러: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(fill_embeddings())
\ No newline at end of file
+    # 실시간 대화 호출보다 낮은 우선순위로 실행
+    asyncio.run(run_with_priority(Priority.BACKFILL, fill_embeddings()))
\ No newline at end of file
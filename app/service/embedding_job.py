@@ -1,8 +1,10 @@
-from openai import AsyncOpenAI
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
 import asyncio
+from app.service.openai_client import get_client
+from app.service.utils.rate_limiter import Priority, run_with_priority
+from app.service.utils.job_offer_fields import normalize_job_offer
 
 load_dotenv()
 client = MongoClient(os.getenv("MONGO_URI"))
@@ -11,7 +13,8 @@ db = client["public_data_db"]
 # collection = db["policy_chunks"]
 collection = db["disabled_job_offers"]
 
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 앱과 같은 OpenAI 클라이언트를 사용하여 속도 제한기를 공유
+openai_client = get_client()
 
 async def get_embedding(text: str):
     response = await openai_client.embeddings.create(
@@ -35,11 +38,13 @@ async def fill_embeddings():
                 input=text
             )
             embedding = response.data[0].embedding
-            collection.update_one({"_id": chunk["_id"]}, {"$set": {"embedding": embedding}})
+            # 임베딩과 함께 날짜/지역/고용형태 구조화 필드를 저장 (벡터 검색 pre-filter용)
+            collection.update_one({"_id": chunk["_id"]}, {"$set": {"embedding": embedding, **normalize_job_offer(chunk)}})
             print(f"✅ 임베딩 완료: {chunk.get('busplaName', '')[:30]}...")
         except Exception as e:
             import traceback
             print(f"❌ 에러: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(fill_embeddings())
\ No newline at end of file
+    # 실시간 대화 호출보다 낮은 우선순위로 실행
+    asyncio.run(run_with_priority(Priority.BACKFILL, fill_embeddings()))
\ No newline at end of file
@@ -1,8 +1,9 @@
-from openai import AsyncOpenAI
 from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
 import asyncio
+from app.service.openai_client import get_client
+from app.service.utils.rate_limiter import Priority, run_with_priority
 
 load_dotenv()
 client = MongoClient(os.getenv("MONGO_URI"))
@@ -11,7 +12,8 @@ db = client["public_data_db"]
 # collection = db["policy_chunks"]
 collection = db["disabled_jobseekers"]
 
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 앱과 같은 OpenAI 클라이언트를 사용하여 속도 제한기를 공유
+openai_client = get_client()
 
 async def get_embedding(text: str):
     response = await openai_client.embeddings.create(
@@ -59,4 +61,5 @@ async def process_document(chunk, text):
 
 
 if __name__ == "__main__":
-    asyncio.run(fill_embeddings_batch())
\ No newline at end of file
+    # 실시간 대화 호출보다 낮은 우선순위로 실행
+    asyncio.run(run_with_priority(Priority.BACKFILL, fill_embeddings_batch()))
\ No newline at end of file
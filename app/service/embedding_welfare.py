@@ -1,8 +1,11 @@
-from openai import AsyncOpenAI
-from pymongo import MongoClient
-import os
+from pymongo import MongoClient, UpdateOne
+from pymongo.operations import SearchIndexModel
+import os, sys
 from dotenv import load_dotenv
 import asyncio
+from app.service.openai_client import get_client
+from app.service.utils.rate_limiter import Priority, run_with_priority
+from app.service.utils.welfare_topics import FILTER_FIELDS, classify_welfare_service
 
 load_dotenv()
 client = MongoClient(os.getenv("MONGO_URI"))
@@ -11,7 +14,18 @@ db = client["public_data_db"]
 # collection = db["policy_chunks"]
 collection = db["welfare_service_list"]
 
-openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 앱과 같은 OpenAI 클라이언트를 사용하여 속도 제한기를 공유
+openai_client = get_client()
+
+BATCH_SIZE = 500
+
+# 주제/분류 pre-filter를 포함한 벡터 인덱스 정의
+VECTOR_INDEX_NAME = "vector_index_welfare_list"
+VECTOR_INDEX_DEFINITION = {
+    "fields": [
+        {"type": "vector", "path": "embedding", "numDimensions": 1536, "similarity": "cosine"}
+    ] + [{"type": "filter", "path": field} for field in FILTER_FIELDS]
+}
 
 async def get_embedding(text: str):
     response = await openai_client.embeddings.create(
@@ -35,11 +49,42 @@ async def fill_embeddings():
                 input=text
             )
             embedding = response.data[0].embedding
-            collection.update_one({"_id": chunk["_id"]}, {"$set": {"embedding": embedding}})
+            # 임베딩과 함께 주제 플래그/분류 배열도 저장
+            collection.update_one({"_id": chunk["_id"]}, {"$set": {"embedding": embedding, **classify_welfare_service(chunk)}})
             print(f"✅ 임베딩 완료: {chunk.get('servNm', '')[:30]}...")
         except Exception as e:
             import traceback
             print(f"❌ 에러: {e}")
 
+# ✅ 주제 플래그가 없는 문서(또는 --reclassify 시 전체)에 topics/themes/lifeStages 채우기
+def classify_services(reclassify: bool = False):
+    query = {} if reclassify else {"topics": {"$exists": False}}
+    projection = {"servNm": 1, "intrsThemaArray": 1, "lifeArray": 1}
+    ops = []
+    total = 0
+    for doc in collection.find(query, projection):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": classify_welfare_service(doc)}))
+        if len(ops) >= BATCH_SIZE:
+            collection.bulk_write(ops, ordered=False)
+            total += len(ops)
+            ops = []
+    if ops:
+        collection.bulk_write(ops, ordered=False)
+        total += len(ops)
+    print(f"✅ 주제 분류 완료: {total}건")
+
+# ✅ 벡터 인덱스에 filter 필드 반영
+def update_vector_index():
+    existing = [idx["name"] for idx in collection.list_search_indexes()]
+    if VECTOR_INDEX_NAME in existing:
+        collection.update_search_index(VECTOR_INDEX_NAME, VECTOR_INDEX_DEFINITION)
+    else:
+        collection.create_search_index(SearchIndexModel(definition=VECTOR_INDEX_DEFINITION, name=VECTOR_INDEX_NAME, type="vectorSearch"))
+    print(f"🔧 벡터 인덱스 {VECTOR_INDEX_NAME} 정의를 갱신했습니다.")
+
 if __name__ == "__main__":
-    asyncio.run(fill_embeddings())
\ No newline at end of file
+    # 실시간 대화 호출보다 낮은 우선순위로 실행
+    asyncio.run(run_with_priority(Priority.BACKFILL, fill_embeddings()))
+    classify_services(reclassify="--reclassify" in sys.argv)
+    if "--update-index" in sys.argv:
+        update_vector_index()
@@ -1,37 +1,22 @@
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Callable, Awaitable, Union
 import logging
 from app.models.expert_type import ExpertType
-from app.service.experts.policy_expert import policy_response, PolicyExpert
-from app.service.experts.employment_expert import employment_response, EmploymentExpert
-from app.service.experts.employment_policy_expert import employment_policy_response, EmploymentPolicyExpert
-from app.service.experts.job_seekers_expert import job_seekers_response, JobSeekersExpert
+from app.service.experts.policy_expert import policy_response
+from app.service.experts.employment_expert import employment_response
+from app.service.experts.employment_policy_expert import employment_policy_response
+from app.service.experts.job_seekers_expert import job_seekers_response
+from app.service.registry import registry
+from app.service.utils.keyword_extractor import extract_keywords
 
 logger = logging.getLogger(__name__)
 
-# 전문가 유형별 응답 함수 매핑
-expert_responses = {
-    "정책": policy_response,
-    "장애인 정책": policy_response,
-    "취업": employment_response,
-    "장애인 취업": employment_response,
-    
+# 전문가 유형별 응답 함수 매핑 (ExpertType 기반 라우팅)
+expert_handlers: Dict[ExpertType, Callable[..., Awaitable[tuple]]] = {
+    ExpertType.POLICY: policy_response,
+    ExpertType.EMPLOYMENT: employment_response,
     # 기업회원용 전문가 응답 매핑
-    "정책": employment_policy_response,
-    "고용 정책": employment_policy_response,
-    "현황": job_seekers_response,
-    "구직자 현황": job_seekers_response
-    
-}
-
-# 전문가 유형별 클래스 매핑
-expert_classes = {
-    "정책": PolicyExpert,
-    "장애인 정책": PolicyExpert,
-    "취업": EmploymentExpert,
-    "장애인 취업": EmploymentExpert,
-    # 기업회원용 전문가 클래스 매핑
-    "고용 정책": EmploymentPolicyExpert,
-    "구직자 현황": JobSeekersExpert,
+    ExpertType.EMPLOYMENT_POLICY: employment_policy_response,
+    ExpertType.JOB_SEEKERS: job_seekers_response,
 }
 
 # 전문가 유형 이름 매핑 (ExpertType enum과 한글 이름 매핑)
@@ -54,16 +39,17 @@ expert_names_to_type.update({
     # 기업회원용 전문가 타입 매핑
     "고용 정책": ExpertType.EMPLOYMENT_POLICY,
     "구직자 현황": ExpertType.JOB_SEEKERS,
+    "현황": ExpertType.JOB_SEEKERS,
  
 })
 
-async def get_expert_response(query: str, expert_type: str, keywords: List[str] = None, conversation_history=None) -> Tuple[str, List[Dict[str, Any]]]:
+async def get_expert_response(query: str, expert_type: Union[str, ExpertType], keywords: List[str] = None, conversation_history=None) -> Tuple[str, List[Dict[str, Any]]]:
     """
     전문가 유형에 따라 적절한 전문가 응답 함수를 호출하여 응답을 생성합니다.
     
     Args:
         query: 사용자 쿼리
-        expert_type: 전문가 유형 ("정책", "취업","고용 정책", "구직자 현황" 중 하나)
+        expert_type: 전문가 유형 (ExpertType 또는 "정책", "취업","고용 정책", "구직자 현황" 등의 이름)
         keywords: 슈퍼바이저가 추출한 키워드 목록
         conversation_history: 이전 대화 내용
         
@@ -71,29 +57,24 @@ async def get_expert_response(query: str, expert_type: str, keywords: List[str]
         응답 텍스트와 관련 정보 카드 목록
     """
     try:
-        expert_class = expert_classes.get(expert_type)
-        expert_class_name = expert_class.__name__ if expert_class else "Unknown"
-        logger.info(f"전문가 유형 '{expert_type}' ({expert_class_name})에 대한 응답 생성 시작 - 쿼리: '{query[:100]}...' if len(query) > 100 else query")
+        resolved_type = get_expert_by_name(expert_type)
+        response_func = expert_handlers.get(resolved_type) if resolved_type else None
+        
+        if response_func is None:
+            logger.error(f"존재하지 않는 전문가 유형: {expert_type}")
+            return "죄송합니다. 해당 분야의 전문가를 찾을 수 없습니다.", [], None
+        
+        expert_class_name = type(registry.get_expert(resolved_type)).__name__
+        logger.info(f"전문가 유형 '{resolved_type.value}' ({expert_class_name})에 대한 응답 생성 시작 - 쿼리: '{query[:100]}'")
         
         # 키워드가 없는 경우 빈 리스트로 초기화
         if keywords is None:
-            # 간단한 키워드 추출 (쿼리에서 주요 단어 추출)
-            words = query.replace("?", "").replace(".", "").replace(",", "").split()
-            keywords = [w for w in words if len(w) > 1 and w not in ["저는", "나는", "제가", "그런데", "그리고", "하지만", "어떻게", "어떤", "무엇", "왜"]]
-            keywords = keywords[:5]  # 상위 5개 키워드만 사용
+            # 쿼리에서 주요 단어 추출 (조사 제거 + IDF 가중치, 상위 5개)
+            keywords = extract_keywords(query, max_keywords=5)
             logger.debug(f"쿼리에서 자동 추출한 키워드: {keywords}")
         
-        # API 호출 관련 코드 제거
-        
-        # 전문가 응답 함수 선택
-        response_func = expert_responses.get(expert_type)
-        
-        if response_func is None:
-            logger.error(f"존재하지 않는 전문가 유형: {expert_type}")
-            return "죄송합니다. 해당 분야의 전문가를 찾을 수 없습니다.", []
-        
         # 전문가 응답 함수 호출
-        logger.debug(f"'{expert_type}' ({expert_class_name}) 전문가 응답 함수 호출: 키워드={keywords}")
+        logger.debug(f"'{resolved_type.value}' ({expert_class_name}) 전문가 응답 함수 호출: 키워드={keywords}")
         result = await response_func(query, keywords, conversation_history)
         if isinstance(result, tuple) and len(result) == 3:
             answer, cards, action = result
@@ -114,18 +95,6 @@ def get_available_experts() -> List[Dict[str, Any]]:
     Returns:
         전문가 정보 목록
     """
-    from app.service.experts.policy_expert import PolicyExpert
-    from app.service.experts.employment_expert import EmploymentExpert
-    from app.service.experts.employment_policy_expert import EmploymentPolicyExpert
-    from app.service.experts.job_seekers_expert import JobSeekersExpert
-    
-    experts = [
-        PolicyExpert(),
-        EmploymentExpert(),
-        EmploymentPolicyExpert(),
-        JobSeekersExpert()
-    ]
-    
     return [
         {
             "id": expert.expert_type.value,
@@ -133,17 +102,19 @@ def get_available_experts() -> List[Dict[str, Any]]:
             "description": expert._get_description(),
             "icon": expert._get_icon()
         }
-        for expert in experts
+        for expert in registry.experts()
     ]
 
-def get_expert_by_name(name: str) -> Optional[ExpertType]:
+def get_expert_by_name(name: Union[str, ExpertType]) -> Optional[ExpertType]:
     """
     전문가 이름으로 ExpertType을 찾습니다.
     
     Args:
-        name: 전문가 이름 (한글)
+        name: 전문가 이름 (한글) 또는 ExpertType
         
     Returns:
         ExpertType 또는 None (존재하지 않는 경우)
     """
+    if isinstance(name, ExpertType):
+        return name
     return expert_names_to_type.get(name) 
\ No newline at end of file
@@ -1,13 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 from app.models.expert_type import ExpertType
+from app.config.settings import EXPERT_TOOL_MAX_ITERATIONS, EXPERT_TOOL_TIMEOUT_SECONDS
+from app.service.openai_client import create_chat_completion
+from app.service.utils.cache import tool_result_cache
+from app.service.utils.deadline import timeout_for
+from app.service.utils.metrics import metrics
+import asyncio
+import json
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+# 도구 결과를 모델에 다시 전달할 때 카드별로 남길 필드와 최대 길이
+_TOOL_RESULT_FIELDS = ("id", "title", "subtitle", "summary", "details")
+_TOOL_RESULT_FIELD_LIMIT = 300
+
 class BaseExpert(ABC):
     def __init__(self, expert_type: ExpertType):
         self.expert_type = expert_type
+        # 전문가 인스턴스는 레지스트리에서 한 번만 생성되므로 프롬프트/도구/메시지 prefix를 미리 계산해 둡니다.
         self.system_prompt = self._get_system_prompt()
         self.tools = self._get_tools()
+        self.message_prefix: List[Dict[str, str]] = [{"role": "system", "content": self.system_prompt}]
 
     @abstractmethod
     def _get_system_prompt(self) -> str:
@@ -19,6 +35,10 @@ class BaseExpert(ABC):
         """전문가별 도구 목록을 반환합니다."""
         pass
 
+    def _get_tool_handlers(self) -> Dict[str, Callable[..., Awaitable[Any]]]:
+        """도구 이름 -> 실행 함수 매핑을 반환합니다. 도구를 실행하는 전문가만 재정의합니다."""
+        return {}
+
     def validate_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """
         응답을 검증하고 필요한 경우 수정합니다.
@@ -54,6 +74,157 @@ class BaseExpert(ABC):
         response["text"] = text
         return response
 
+    def _prepare_messages(self, query: str, conversation_history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
+        """대화 이력을 처리하여 메시지 배열을 생성합니다."""
+        messages = list(self.message_prefix)
+
+        # 대화 이력이 있는 경우 최근 5개만 추가
+        if conversation_history:
+            for msg in conversation_history[-5:]:
+                if msg.get("role") and msg.get("content"):
+                    messages.append({"role": msg["role"], "content": msg["content"]})
+
+        # 현재 쿼리 추가
+        messages.append({"role": "user", "content": query})
+
+        return messages
+
+    async def _execute_tool_call(self, tool_call: Any, request_cache: Dict[str, asyncio.Task]) -> Any:
+        """
+        도구 호출 하나를 실행합니다.
+        같은 요청 안의 동일한 호출은 한 번만 실행하고, 요청 간에는 tool_result_cache로 결과를 재사용합니다.
+        
+        Args:
+            tool_call: 모델 응답의 tool_call (id, function.name, function.arguments)
+            request_cache: 요청 단위 실행 결과 (캐시 키 -> 태스크)
+            
+        Returns:
+            도구 결과 (실패 시 {"error": ...})
+        """
+        name = tool_call.function.name
+        handler = self._get_tool_handlers().get(name)
+        if handler is None:
+            return {"error": f"알 수 없는 도구: {name}"}
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+        except json.JSONDecodeError:
+            return {"error": "도구 인자를 해석할 수 없습니다."}
+
+        cache_key = f"{self.expert_type.value}:{name}:{json.dumps(arguments, sort_keys=True, ensure_ascii=False)}"
+        if cache_key not in request_cache:
+            cached_result = tool_result_cache.get(cache_key)
+            if cached_result is not None:
+                metrics.increment(f"tool.cache_hit.{name}")
+                return cached_result
+            request_cache[cache_key] = asyncio.ensure_future(self._run_tool(name, handler, arguments, cache_key))
+        return await request_cache[cache_key]
+
+    async def _run_tool(self, name: str, handler: Callable[..., Awaitable[Any]], arguments: Dict[str, Any], cache_key: str) -> Any:
+        metrics.increment(f"tool.calls.{name}")
+        try:
+            result = await asyncio.wait_for(
+                handler(**arguments),
+                timeout=timeout_for(EXPERT_TOOL_TIMEOUT_SECONDS, f"tool.{name}")
+            )
+        except asyncio.TimeoutError:
+            metrics.increment(f"tool.timeout.{name}")
+            logger.warning(f"[도구] {name} 실행 시간 초과")
+            return {"error": "도구 실행 시간이 초과되었습니다."}
+        except Exception as e:
+            logger.error(f"[도구] {name} 실행 중 오류 발생: {e}")
+            return {"error": str(e)}
+        # 실패/빈 결과는 캐시하지 않음 (일시적인 백엔드 오류가 TTL 동안 재사용되지 않도록)
+        if result and not (isinstance(result, dict) and "error" in result):
+            tool_result_cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _tool_result_content(result: Any) -> str:
+        """도구 결과를 모델에 전달할 문자열로 만듭니다. (카드는 핵심 필드만 남김)"""
+        if isinstance(result, list):
+            result = [
+                {key: str(item.get(key, ""))[:_TOOL_RESULT_FIELD_LIMIT] for key in _TOOL_RESULT_FIELDS if item.get(key)}
+                if isinstance(item, dict) else item
+                for item in result
+            ]
+        return json.dumps(result, ensure_ascii=False, default=str)
+
+    async def run_tool_loop(self, messages: List[Dict[str, Any]], max_iterations: int = EXPERT_TOOL_MAX_ITERATIONS) -> Tuple[str, List[Any]]:
+        """
+        OpenAI 도구 호출 루프를 실행합니다.
+        한 assistant 메시지의 도구 호출들은 동시에 실행하고, 반복 횟수를 넘으면 도구 없이 최종 응답을 요청합니다.
+        
+        Args:
+            messages: 모델에 보낼 메시지 목록 (도구 호출/결과 메시지가 추가됨)
+            max_iterations: 도구 호출 반복 최대 횟수
+            
+        Returns:
+            (최종 응답 텍스트, 도구 결과 목록)
+        """
+        request_cache: Dict[str, asyncio.Task] = {}
+        tool_results: List[Any] = []
+        for _ in range(max_iterations):
+            response = await create_chat_completion(
+                cache_name="expert_tool_loop",
+                model=self.model,
+                messages=messages,
+                tools=self.tools
+            )
+            message = response.choices[0].message
+            if not message.tool_calls:
+                return message.content or "", tool_results
+
+            messages.append({
+                "role": "assistant",
+                "content": message.content,
+                "tool_calls": [
+                    {"id": tc.id, "type": "function", "function": {"name": tc.function.name, "arguments": tc.function.arguments}}
+                    for tc in message.tool_calls
+                ]
+            })
+            results = await asyncio.gather(*[self._execute_tool_call(tc, request_cache) for tc in message.tool_calls])
+            for tool_call, result in zip(message.tool_calls, results):
+                messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": self._tool_result_content(result)})
+                tool_results.append(result)
+
+        logger.warning(f"[도구] {self.expert_type.value} 도구 호출 반복 한도({max_iterations}) 도달, 최종 응답 요청")
+        response = await create_chat_completion(
+            cache_name="expert_tool_loop",
+            model=self.model,
+            messages=messages
+        )
+        return response.choices[0].message.content or "", tool_results
+
+    async def process_query_with_tools(self, query: str, conversation_history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        모델이 도구로 필요한 검색을 요청하게 하고, 검색 결과 카드와 최종 응답을 반환합니다.
+        
+        Args:
+            query: 사용자 쿼리
+            conversation_history: 대화 이력
+            
+        Returns:
+            응답 딕셔너리 (text, cards), 실패 시 카드가 없는 응답
+        """
+        try:
+            text, tool_results = await self.run_tool_loop(self._prepare_messages(query, conversation_history))
+        except Exception as e:
+            logger.error(f"[도구] {self.expert_type.value} 도구 호출 루프 중 오류 발생: {e}")
+            return {"text": "", "cards": []}
+        cards, seen_ids = [], set()
+        for result in tool_results:
+            if not isinstance(result, list):
+                continue
+            for card in result:
+                if not isinstance(card, dict):
+                    continue
+                # 여러 도구 호출에서 같은 카드가 나오면 한 번만 포함
+                card_id = card.get("id") or id(card)
+                if card_id not in seen_ids:
+                    seen_ids.add(card_id)
+                    cards.append(card)
+        return self.validate_response({"text": text, "cards": cards})
+
     @abstractmethod
     async def process_query(self, query: str, keywords: Optional[List[str]] = None, conversation_history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
@@ -66,6 +237,18 @@ class BaseExpert(ABC):
         """
         pass
 
+    async def warm_up(self, queries: List[str]) -> None:
+        """
+        워밍업 질문으로 검색 경로를 실행하여 임베딩/검색 캐시를 채웁니다.
+        EXPERT_TOOL_CALLING_ENABLED가 켜져 있으면 process_query가 도구 호출 루프(LLM)를 실행하므로
+        워밍업 질문마다 유료 LLM 호출이 발생합니다. (꺼져 있으면 검색 경로만 실행)
+        
+        Args:
+            queries: 워밍업 질문 목록
+        """
+        for query in queries:
+            await self.process_query(query)
+
     def get_expert_info(self) -> Dict[str, Any]:
         """전문가 정보를 반환합니다."""
         return {
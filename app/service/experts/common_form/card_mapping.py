@@ -0,0 +1,242 @@
+# 컬렉션별 카드 매핑 정의
+#
+# 전문가들이 $vectorSearch 결과를 정보 카드로 바꾸던 코드를 선언적 필드 매핑으로 통합합니다.
+# 각 매핑은 카드에 필요한 필드만 조회하는 $project 단계를 만들어 주므로
+# 1536차원 embedding 필드가 결과 문서에 포함되지 않습니다.
+# (카드 순위화에 필요할 때만 include_embedding으로 embedding을 함께 조회)
+#
+# 필드 매핑 값 규칙:
+#   - "servNm"                : 문서 필드 값을 그대로 사용
+#   - "{busplaName} | {addr}" : 문서 필드를 채운 포맷 문자열
+
+from string import Formatter
+from typing import Dict, List, Any, Optional
+
+
+class _MissingAsEmpty(dict):
+    """포맷 문자열에서 누락된 필드를 빈 문자열로 채우기 위한 dict"""
+
+    def __missing__(self, key):
+        return ""
+
+
+def _referenced_fields(spec: str) -> List[str]:
+    """필드 매핑 값이 참조하는 문서 필드 목록을 반환합니다."""
+    if "{" not in spec:
+        return [spec]
+    return [name for _, name, _, _ in Formatter().parse(spec) if name]
+
+
+def _resolve(doc: Dict[str, Any], spec: str) -> Any:
+    """필드 매핑 값을 문서에 적용합니다."""
+    if "{" not in spec:
+        return doc.get(spec, "")
+    return spec.format_map(_MissingAsEmpty(doc))
+
+
+class CardMapping:
+    """
+    컬렉션 문서를 정보 카드로 변환하는 선언적 매핑
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, str],
+        card_type: Optional[str] = None,
+        source: Optional[Dict[str, str]] = None,
+        link_field: Optional[str] = None,
+        link_label: str = "자세히 보기",
+        tel_field: Optional[str] = None,
+        tel_label: str = "문의하기",
+    ):
+        """
+        Args:
+            fields: 카드 필드명 -> 문서 필드명(또는 포맷 문자열)
+            card_type: 카드 type 값 (None이면 type 필드를 넣지 않음)
+            source: source 하위 필드명 -> 문서 필드명(또는 포맷 문자열)
+            link_field: "link" 버튼 값으로 사용할 문서 필드
+            link_label: "link" 버튼 레이블
+            tel_field: 값이 있을 때 "tel" 버튼을 추가할 문서 필드
+            tel_label: "tel" 버튼 레이블
+        """
+        self.fields = fields
+        self.card_type = card_type
+        self.source = source
+        self.link_field = link_field
+        self.link_label = link_label
+        self.tel_field = tel_field
+        self.tel_label = tel_label
+        self.projection = self._build_projection()
+
+    def _build_projection(self) -> Dict[str, Any]:
+        """카드 생성에 필요한 필드와 벡터 검색 점수만 포함하는 $project 스펙을 만듭니다."""
+        specs = list(self.fields.values()) + list((self.source or {}).values())
+        specs += [f for f in (self.link_field, self.tel_field) if f]
+        projection: Dict[str, Any] = {"_id": 0}
+        for spec in specs:
+            for field in _referenced_fields(spec):
+                projection[field] = 1
+        projection["score"] = {"$meta": "vectorSearchScore"}
+        return projection
+
+    def to_card(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        문서를 정보 카드로 변환합니다.
+
+        Args:
+            doc: 컬렉션 문서 ($project가 적용된 결과)
+
+        Returns:
+            정보 카드 딕셔너리
+        """
+        card = {key: _resolve(doc, spec) for key, spec in self.fields.items()}
+        if self.card_type is not None:
+            card["type"] = self.card_type
+        if self.source is not None:
+            card["source"] = {key: _resolve(doc, spec) for key, spec in self.source.items()}
+        if self.link_field:
+            card["buttons"] = [{"type": "link", "label": self.link_label, "value": doc.get(self.link_field, "")}]
+            if self.tel_field and doc.get(self.tel_field):
+                card["buttons"].append({"type": "tel", "label": self.tel_label, "value": doc.get(self.tel_field)})
+        if "score" in doc:
+            card["score"] = doc["score"]
+        if "embedding" in doc:
+            # 순위화용 (card_ranker.store_card_embeddings가 카드에서 분리)
+            card["embedding"] = doc["embedding"]
+        return card
+
+    def to_cards(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """문서 목록을 정보 카드 목록으로 변환합니다."""
+        return [self.to_card(doc) for doc in docs]
+
+
+def vector_search_pipeline(
+    mapping: CardMapping,
+    index: str,
+    query_vector: List[float],
+    num_candidates: int,
+    limit: int,
+    match: Optional[Dict[str, Any]] = None,
+    filter: Optional[Dict[str, Any]] = None,
+    include_embedding: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    카드 매핑의 projection이 적용된 $vectorSearch 파이프라인을 만듭니다.
+
+    Args:
+        mapping: 결과 문서에 적용할 카드 매핑
+        index: 벡터 검색 인덱스 이름
+        query_vector: 쿼리 임베딩
+        num_candidates: 후보 수
+        limit: 반환할 문서 수
+        match: 벡터 검색 뒤에 적용할 $match 조건 (선택)
+        filter: 인덱스의 filter 필드에 대한 $vectorSearch pre-filter 조건 (선택)
+        include_embedding: 결과 문서의 embedding 필드도 조회할지 여부 (카드 순위화용)
+
+    Returns:
+        aggregate 파이프라인
+    """
+    pipeline: List[Dict[str, Any]] = [
+        {
+            "$vectorSearch": {
+                "index": index,
+                "path": "embedding",
+                "queryVector": query_vector,
+                "numCandidates": num_candidates,
+                "limit": limit
+            }
+        }
+    ]
+    if filter:
+        pipeline[0]["$vectorSearch"]["filter"] = filter
+    if match:
+        pipeline.append({"$match": match})
+    projection = {**mapping.projection, "embedding": 1} if include_embedding else mapping.projection
+    pipeline.append({"$project": projection})
+    return pipeline
+
+
+# 복지 서비스 목록 (정책 전문가용: 관심주제를 요약으로 사용)
+WELFARE_POLICY_CARD = CardMapping(
+    fields={
+        "id": "servId",
+        "title": "servNm",
+        "summary": "intrsThemaArray",
+        "details": "servDgst",
+    },
+    card_type="policy",
+    source={
+        "subtitle": "srvPvsnNm",
+        "url": "servDtlLink",
+        "name": "jurOrgNm",
+        "phone": "rprsCtadr",
+    },
+    link_field="servDtlLink",
+    tel_field="rprsCtadr",
+)
+
+# 복지 서비스 목록 (취업/고용 정책 전문가용: 서비스 요약을 요약으로 사용)
+WELFARE_SERVICE_CARD = CardMapping(
+    fields={
+        "id": "servId",
+        "title": "servNm",
+        "subtitle": "jurMnofNm",
+        "summary": "servDgst",
+        "details": "servDgst",
+    },
+    card_type="policy",
+    source={
+        "url": "servDtlLink",
+        "name": "jurOrgNm",
+        "phone": "rprsCtadr",
+    },
+    link_field="servDtlLink",
+    tel_field="rprsCtadr",
+)
+
+# 장애인 구인 정보
+JOB_OFFER_CARD = CardMapping(
+    fields={
+        "id": "id",
+        "title": "jobNm",
+        "summary": "{busplaName} | {compAddr}",
+        "empType": "empType",
+        "compAddr": "compAddr",
+        "termDate": "termDate",
+        "cntctNo": "cntctNo",
+        "enterType": "enterType",
+        "offerregDt": "offerregDt",
+        "regDt": "regDt",
+        "regagnName": "regagnName",
+        "reqCareer": "reqCareer",
+        "reqEduc": "reqEduc",
+        "salary": "salary",
+        "salaryType": "salaryType",
+        "envBothHands": "envBothHands",
+        "envEyesight": "envEyesight",
+        "envHandwork": "envHandwork",
+        "envLiftPower": "envLiftPower",
+        "envLstnTalk": "envLstnTalk",
+        "envStndWalk": "envStndWalk",
+    },
+    card_type="job_offer",
+    source={
+        "url": "url",
+        "name": "company",
+        "phone": "contact",
+    },
+    link_field="url",
+    link_label="공고 보기",
+    tel_field="contact",
+)
+
+# 장애인 구직자 정보
+JOB_SEEKER_CARD = CardMapping(
+    fields={
+        "id": "연번",
+        "title": "{희망직종} ({장애유형})",
+        "summary": "{희망지역} / {중증여부}",
+        "details": "연령: {연령}, 희망임금: {희망임금}",
+    },
+    card_type="job_seeker",
+)
@@ -1,13 +1,23 @@
-from typing import Dict, List, Any
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
+import asyncio
 import logging
-import os
 from app.models.expert_type import ExpertType
 from app.service.experts.base_expert import BaseExpert
+from app.service.registry import get_expert
 from app.service.openai_client import get_client
 from app.service.experts.common_form.example_cards import EMPLOYMENT_CARD_TEMPLATE
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.service.embedding import get_embedding
+from app.service.experts.common_form.card_mapping import JOB_OFFER_CARD, WELFARE_SERVICE_CARD, vector_search_pipeline
+from app.service.motor_client import get_public_data_db
+from app.service.utils.cache import retrieval_cache
+from app.service.utils.deadline import max_time_ms
+from app.service.utils.welfare_topics import welfare_topic_filter
+from app.service.embedding import get_embedding, get_embeddings
+from app.service.utils.card_ranker import rank_cards, store_card_embeddings
+from app.config.settings import (
+    EXPERT_TOOL_CALLING_ENABLED, CARD_RANK_TOP_K, CARD_RANK_CANDIDATES, CARD_MMR_LAMBDA, CARD_TITLE_SIMILARITY
+)
 from app.service.utils.data_processor import DataProcessor
+from app.service.utils.job_offer_fields import extract_region, extract_emp_type, job_offer_filter, today_kst
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +31,6 @@ class EmploymentExpert(BaseExpert):
         super().__init__(ExpertType.EMPLOYMENT)
         self.client = get_client()
         self.model = "gpt-4.1-mini"
-        self.mongo_uri = os.getenv("MONGO_URI")
     
     def _get_system_prompt(self) -> str:
         return """
@@ -103,141 +112,155 @@ class EmploymentExpert(BaseExpert):
             }
         ]
     
-    async def search_job_offers_by_semantic(self, user_query: str, limit: int = 3) -> List[Dict[str, Any]]:
+    def _get_tool_handlers(self) -> Dict[str, Callable[..., Awaitable[Any]]]:
+        return {"search_employment_database": self.search_employment_database}
+
+    async def search_employment_database(
+        self, keywords: List[str], job_type: Optional[str] = None, region: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        search_employment_database 도구 실행 함수
+        키워드(와 직업 유형)로 취업 정책과 구인 정보를 동시에 검색합니다.
+        
+        Args:
+            keywords: 검색 키워드 목록
+            job_type: 직업 유형 또는 산업 분야
+            region: 지역 정보
+            
+        Returns:
+            취업 정책 카드 + 구인 카드 목록
+        """
+        search_query = " ".join([kw for kw in (keywords or []) if isinstance(kw, str)] + ([job_type] if job_type else []))
+        if not search_query:
+            return []
+        policy_cards, job_cards = await self.search_policies_and_job_offers(
+            search_query, limit=3, region=extract_region(region) if region else None
+        )
+        return self.rank_cards(policy_cards + job_cards)
+
+    async def search_policies_and_job_offers(
+        self, user_query: str, limit: int, include_job_offers: bool = True, region: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        취업 정책과 구인 정보를 동시에 검색합니다.
+        두 검색의 쿼리 임베딩(전체 질문, 키워드 질문)은 한 번의 임베딩 요청으로 가져옵니다.
+        
+        Args:
+            user_query: 사용자 질문
+            limit: 검색별 반환할 카드 수
+            include_job_offers: 구인 정보도 검색할지 여부
+            region: 정규화된 지역명 (None이면 질문에서 추출)
+            
+        Returns:
+            (정책 카드 목록, 구인 카드 목록)
+        """
+        texts = [user_query]
+        if include_job_offers:
+            texts.append(self._job_offer_search_text(user_query))
+        # 빈 텍스트는 임베딩 API가 거부하므로 배치에서 제외
+        # 배치 요청이 실패하면 각 검색이 자체적으로 임베딩하고, 실패한 검색만 빈 목록을 반환
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        batch = [i for i, text in enumerate(texts) if text.strip()]
+        if batch:
+            try:
+                for i, embedding in zip(batch, await get_embeddings([texts[i] for i in batch])):
+                    embeddings[i] = embedding
+            except Exception as e:
+                logger.error(f"검색 질문 임베딩 배치 요청 중 오류 발생: {str(e)}")
+        searches = [self.search_employment_by_semantic(user_query, limit=limit, query_embedding=embeddings[0])]
+        if include_job_offers:
+            searches.append(self.search_job_offers_by_semantic(
+                user_query, limit=limit, region=region, query_embedding=embeddings[1]
+            ))
+        results = await asyncio.gather(*searches)
+        return results[0], (results[1] if include_job_offers else [])
+
+    def _job_offer_search_text(self, user_query: str) -> str:
+        """구인 검색은 질문 전체 대신 키워드로 임베딩합니다. (키워드가 없으면 질문 전체)"""
+        return " ".join(DataProcessor.extract_keywords(user_query, max_keywords=5)) or user_query
+
+    def rank_cards(self, cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """정책/구인 후보 카드를 중복 제거하고 MMR로 상위 카드를 고릅니다."""
+        return rank_cards(cards, CARD_RANK_TOP_K, lambda_=CARD_MMR_LAMBDA, title_threshold=CARD_TITLE_SIMILARITY)
+
+    async def search_job_offers_by_semantic(
+        self, user_query: str, limit: int = 3,
+        region: Optional[str] = None, emp_type: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        disabled_job_offers에서 구인 정보를 임베딩 기반으로 검색
+        disabled_job_offers에서 마감되지 않은 구인 정보를 임베딩 기반으로 검색
+        
+        Args:
+            user_query: 사용자 질문
+            limit: 반환할 카드 수
+            region: 정규화된 지역명 (None이면 질문에서 추출)
+            emp_type: 고용형태 코드 (None이면 질문에서 추출)
+            query_embedding: 미리 계산한 키워드 질문 임베딩 (None이면 여기서 임베딩)
         """
         try:
-            keywords = DataProcessor.extract_keywords(user_query, max_keywords=5)
-            keyword_query = " ".join(keywords)
-            user_embedding = await get_embedding(keyword_query)
-            logger.info(f"job_offers 벡터 검색 임베딩: {user_embedding[:5]}...")  # 일부만 출력
-            client = AsyncIOMotorClient(self.mongo_uri)
-            db = client["public_data_db"]
-            collection = db["disabled_job_offers"]
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "vector_index_disabled_offers",
-                        "path": "embedding",
-                        "queryVector": user_embedding,
-                        "numCandidates": 500,
-                        "limit": limit
-                    }
-                }
-            ]
-            cursor = collection.aggregate(pipeline)
-            results = []
-            async for doc in cursor:
-                logger.info(f"job_offers 검색 결과: {doc}")
-                card = {
-                    "id": doc.get("id", ""),
-                    "type": "job_offer",
-                    "title": doc.get("jobNm", ""),
-                    "summary": f"{doc.get('busplaName', '')} | {doc.get('compAddr', '')}",
-                    "empType": doc.get("empType", ""),
-                    "compAddr": doc.get("compAddr", ""),
-                    "termDate": doc.get("termDate", ""),
-                    "cntctNo": doc.get("cntctNo", ""),
-                    "enterType": doc.get("enterType", ""),
-                    "offerregDt": doc.get("offerregDt", ""),
-                    "regDt": doc.get("regDt", ""),
-                    "regagnName": doc.get("regagnName", ""),
-                    "reqCareer": doc.get("reqCareer", ""),
-                    "reqEduc": doc.get("reqEduc", ""),
-                    "salary": doc.get("salary", ""),
-                    "salaryType": doc.get("salaryType", ""),
-                    "envBothHands": doc.get("envBothHands", ""),
-                    "envEyesight": doc.get("envEyesight", ""),
-                    "envHandwork": doc.get("envHandwork", ""),
-                    "envLiftPower": doc.get("envLiftPower", ""),
-                    "envLstnTalk": doc.get("envLstnTalk", ""),
-                    "envStndWalk": doc.get("envStndWalk", ""),
-                    "source": {
-                        "url": doc.get("url", ""),
-                        "name": doc.get("company", ""),
-                        "phone": doc.get("contact", "")
-                    },
-                    "buttons": [
-                        {
-                            "type": "link",
-                            "label": "공고 보기",
-                            "value": doc.get("url", "")
-                        }
-                    ]
-                }
-                if doc.get("contact"):
-                    card["buttons"].append({
-                        "type": "tel",
-                        "label": "문의하기",
-                        "value": doc.get("contact")
-                    })
-                results.append(card)
+            region = region or extract_region(user_query)
+            emp_type = emp_type or extract_emp_type(user_query)
+            search_filter = job_offer_filter(region=region, emp_type=emp_type)
+            # 마감 기준일이 바뀌면 결과도 바뀌므로 날짜를 캐시 키에 포함
+            cache_key = f"job_offers_semantic:{limit}:{today_kst().date()}:{region}:{emp_type}:{user_query}"
+            cached_cards = retrieval_cache.get(cache_key)
+            if cached_cards is not None:
+                return cached_cards
+
+            user_embedding = query_embedding or await get_embedding(self._job_offer_search_text(user_query))
+            collection = get_public_data_db()["disabled_job_offers"]
+            pipeline = vector_search_pipeline(
+                JOB_OFFER_CARD,
+                index="vector_index_disabled_offers",
+                query_vector=user_embedding,
+                num_candidates=500,
+                limit=limit,
+                filter=search_filter,
+                include_embedding=True
+            )
+            cursor = collection.aggregate(pipeline, maxTimeMS=max_time_ms(10.0, "mongo.job_offers"))
+            results = store_card_embeddings(JOB_OFFER_CARD.to_cards(await cursor.to_list(length=limit)))
+            logger.debug(f"job_offers 검색 결과 id: {[card['id'] for card in results]}")
             logger.info(f"job_offers 검색 결과 개수: {len(results)}")
+            retrieval_cache.set(cache_key, results)
             return results
         except Exception as e:
             logger.error(f"임베딩 기반 구인 정보 검색 중 오류 발생: {str(e)}")
             return []
 
 
-    async def search_employment_by_semantic(self, user_query: str, limit: int = 3) -> List[Dict[str, Any]]:
+    async def search_employment_by_semantic(
+        self, user_query: str, limit: int = 3, query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
         """
         welfare_service_list에서 취업 관련 정책/지원 정보를 임베딩 기반으로 검색
+        
+        Args:
+            user_query: 사용자 질문
+            limit: 반환할 카드 수
+            query_embedding: 미리 계산한 질문 임베딩 (None이면 여기서 임베딩)
         """
         try:
-            user_embedding = await get_embedding(user_query)
-            client = AsyncIOMotorClient(self.mongo_uri)
-            db = client["public_data_db"]
-            collection = db["welfare_service_list"]
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "vector_index_welfare_list",
-                        "path": "embedding",
-                        "queryVector": user_embedding,
-                        "numCandidates": 100,
-                        "limit": limit
-                    }
-                },
-                {
-                    "$match": {
-                        "$or": [
-                            {"servNm": {"$regex": "취업|고용|직업|일자리", "$options": "i"}},
-                            {"intrsThemaArray": {"$regex": "취업|고용|직업|일자리", "$options": "i"}}
-                        ]
-                    }
-                }
-            ]
-            cursor = collection.aggregate(pipeline)
-            results = []
-            async for doc in cursor:
-                card = {
-                    "id": doc.get("servId", ""),
-                    "title": doc.get("servNm", ""),
-                    "subtitle": doc.get("jurMnofNm", ""),
-                    "summary": doc.get("servDgst", ""),
-                    "type": "policy",
-                    "details": doc.get("servDgst", ""),
-                    "source": {
-                        "url": doc.get("servDtlLink", ""),
-                        "name": doc.get("jurOrgNm", ""),
-                        "phone": doc.get("rprsCtadr", "")
-                    },
-                    "buttons": [
-                        {
-                            "type": "link",
-                            "label": "자세히 보기",
-                            "value": doc.get("servDtlLink", "")
-                        }
-                    ]
-                }
-                if doc.get("rprsCtadr"):
-                    card["buttons"].append({
-                        "type": "tel",
-                        "label": "문의하기",
-                        "value": doc.get("rprsCtadr")
-                    })
-                results.append(card)
+            cache_key = f"employment_semantic:{limit}:{user_query}"
+            cached_cards = retrieval_cache.get(cache_key)
+            if cached_cards is not None:
+                return cached_cards
+
+            user_embedding = query_embedding or await get_embedding(user_query)
+            collection = get_public_data_db()["welfare_service_list"]
+            pipeline = vector_search_pipeline(
+                WELFARE_SERVICE_CARD,
+                index="vector_index_welfare_list",
+                query_vector=user_embedding,
+                num_candidates=100,
+                limit=limit,
+                filter=welfare_topic_filter("employment"),
+                include_embedding=True
+            )
+            cursor = collection.aggregate(pipeline, maxTimeMS=max_time_ms(10.0, "mongo.employment"))
+            results = store_card_embeddings(WELFARE_SERVICE_CARD.to_cards(await cursor.to_list(length=limit)))
+            retrieval_cache.set(cache_key, results)
             return results
         except Exception as e:
             logger.error(f"임베딩 기반 취업 정책 검색 중 오류 발생: {str(e)}")
@@ -248,17 +271,21 @@ class EmploymentExpert(BaseExpert):
         user_role: str = "user", job_offer_priority: bool = False
     ) -> Dict[str, Any]:
         logger.info(f"[취업전문가] 쿼리: {query} | user_role: {user_role} | job_offer_priority: {job_offer_priority}")
-        job_cards, policy_cards = [], []
+        if EXPERT_TOOL_CALLING_ENABLED and user_role == "user":
+            # 모델이 필요한 검색(정책/구인, 지역별 등)을 도구 호출로 한 번에 요청
+            response = await self.process_query_with_tools(query, conversation_history)
+            if response.get("cards"):
+                return response
+            logger.info("[도구] 도구 호출 결과 카드 없음, 기본 검색으로 진행")
+        # 검색마다 후보를 넉넉히 받은 뒤 순위화 단계에서 중복을 제거하고 다양한 상위 카드만 남김
+        policy_cards, job_cards = await self.search_policies_and_job_offers(
+            query, limit=CARD_RANK_CANDIDATES, include_job_offers=user_role == "user"
+        )
+        all_cards = self.rank_cards(policy_cards + job_cards)
         if job_offer_priority and user_role == "user":
-            job_cards = await self.search_job_offers_by_semantic(query, limit=3)
-            policy_cards = await self.search_employment_by_semantic(query, limit=3)
-            all_cards = job_cards + policy_cards
-        else:
-            policy_cards = await self.search_employment_by_semantic(query, limit=3)
-            if user_role == "user":
-                job_cards = await self.search_job_offers_by_semantic(query, limit=3)
-            all_cards = policy_cards + job_cards
-        logger.info(f"[취업전문가] 정책카드 {len(policy_cards)}개, 구인카드 {len(job_cards)}개 반환")
+            # 구인 정보 우선: 선택된 카드 중 구인 카드를 앞으로 (순서는 유지)
+            all_cards.sort(key=lambda card: card.get("type") != "job_offer")
+        logger.info(f"[취업전문가] 정책카드 {len(policy_cards)}개, 구인카드 {len(job_cards)}개 중 {len(all_cards)}개 반환")
         if not all_cards:
             return {
                 "text": "죄송합니다. 관련 취업 정책이나 구인 정보를 찾지 못했습니다.",
@@ -275,16 +302,6 @@ class EmploymentExpert(BaseExpert):
             "cards": all_cards
         }
 
-    def _prepare_messages(self, query: str, conversation_history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
-        messages = [{"role": "system", "content": self._get_system_prompt()}]
-        if conversation_history:
-            recent_history = conversation_history[-5:] if len(conversation_history) > 5 else conversation_history
-            for msg in recent_history:
-                if msg.get("role") and msg.get("content"):
-                    messages.append({"role": msg["role"], "content": msg["content"]})
-        messages.append({"role": "user", "content": query})
-        return messages
-    
     def _format_card(self, data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "id": data.get("id", EMPLOYMENT_CARD_TEMPLATE["id"]),
@@ -307,7 +324,7 @@ async def employment_response(
     query: str, keywords: List[str] = None, conversation_history=None,
     user_role: str = "user", job_offer_priority: bool = False
 ) -> tuple:
-    expert = EmploymentExpert()
+    expert = get_expert(ExpertType.EMPLOYMENT)
     response = await expert.process_query(
         query, keywords, conversation_history,
         user_role=user_role, job_offer_priority=job_offer_priority
@@ -1,11 +1,15 @@
 from typing import Dict, List, Any
 import logging
-import os
 from app.models.expert_type import ExpertType
 from app.service.experts.base_expert import BaseExpert
+from app.service.registry import get_expert
 from app.service.openai_client import get_client
 from app.service.experts.common_form.example_cards import POLICY_CARD_TEMPLATE
-from motor.motor_asyncio import AsyncIOMotorClient
+from app.service.experts.common_form.card_mapping import WELFARE_SERVICE_CARD, vector_search_pipeline
+from app.service.motor_client import get_public_data_db
+from app.service.utils.cache import retrieval_cache
+from app.service.utils.deadline import max_time_ms
+from app.service.utils.welfare_topics import welfare_topic_filter
 from app.service.embedding import get_embedding
 from app.service.utils.data_processor import DataProcessor
 
@@ -20,69 +24,38 @@ class EmploymentPolicyExpert(BaseExpert):
         super().__init__(ExpertType.EMPLOYMENT_POLICY)
         self.client = get_client()
         self.model = "gpt-4.1-mini"
-        self.mongo_uri = os.getenv("MONGO_URI")
 
     def _get_system_prompt(self) -> str:
         return """
         너는 기업회원 전용 장애인 고용 정책 전문가 AI입니다.\n기업이 장애인 고용 시 받을 수 있는 지원 정책, 제도, 보조금, 컨설팅 등에 대해 정확하고 실용적인 정보를 제공합니다.\n\n모든 정보 카드는 반드시 아래와 같은 JSON 형식으로 만들어 주세요.\n{\n  "id": "string",\n  "title": "string",\n  "subtitle": "string",\n  "summary": "string",\n  "type": "string",\n  "details": "string",\n  "source": {\n    "url": "string",\n    "name": "string",\n    "phone": "string"\n  },\n  "buttons": [\n    {"type": "link", "label": "string", "value": "string"},\n    {"type": "tel", "label": "string", "value": "string"}\n  ]\n}\n\n제공할 정보 범위:\n- 장애인 고용 의무제도\n- 기업 대상 장애인 고용장려금, 지원금\n- 장애인 고용 컨설팅, 채용 절차\n- 장애인 표준사업장 설립 지원\n- 장애인 고용 관련 법률 및 제도\n- 장애인 고용관리 우수기업 사례\n\n응답 스타일:\n1. 기업 실무자가 이해하기 쉽도록 실용적이고 명확하게 안내하세요.\n2. 지원금, 신청 방법, 자격 요건 등 실질적 정보를 구체적으로 안내하세요.\n3. 관련 기관, 문의처, 참고 링크를 반드시 포함하세요.\n4. 응답 시작에 짧은 안내 멘트를 추가하세요. (예: "기업의 장애인 고용을 위한 정책 정보를 안내해 드리겠습니다.")\n\n정보 카드:\n1. 모든 응답에는 반드시 관련 고용 정책 정보 카드를 포함하세요.\n2. 카드에는 정책명, 요약, 신청 방법, 문의처 등 핵심 정보를 담으세요.\n        """
 
+    async def search_employment_policy_by_semantic(self, user_query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        welfare_service_list에서 기업 대상 고용 정책을 임베딩 기반으로 검색
+        """
+        cache_key = f"employment_policy_semantic:{limit}:{user_query}"
+        cached_cards = retrieval_cache.get(cache_key)
+        if cached_cards is not None:
+            return cached_cards
+
+        user_embedding = await get_embedding(user_query)
+        collection = get_public_data_db()["welfare_service_list"]
+        pipeline = vector_search_pipeline(
+            WELFARE_SERVICE_CARD,
+            index="vector_index_welfare_list",
+            query_vector=user_embedding,
+            num_candidates=100,
+            limit=limit,
+            filter=welfare_topic_filter("employer_support")
+        )
+        cursor = collection.aggregate(pipeline, maxTimeMS=max_time_ms(10.0, "mongo.employment_policy"))
+        results = WELFARE_SERVICE_CARD.to_cards(await cursor.to_list(length=limit))
+        retrieval_cache.set(cache_key, results)
+        return results
+
     async def process_query(self, query: str, keywords: List[str] = None, conversation_history=None) -> Dict[str, Any]:
-        # 실제 구현에서는 정책 DB/외부 API 연동 또는 OpenAI 활용
-        # 여기서는 예시로 임베딩 기반 검색 구조만 스케치
         try:
-            user_embedding = await get_embedding(query)
-            client = AsyncIOMotorClient(self.mongo_uri)
-            db = client["public_data_db"]
-            collection = db["welfare_service_list"]
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "vector_index_welfare_list",
-                        "path": "embedding",
-                        "queryVector": user_embedding,
-                        "numCandidates": 100,
-                        "limit": 3
-                    }
-                },
-                {
-                    "$match": {
-                        "$or": [
-                            {"servNm": {"$regex": "고용|장려금|지원금|기업|장애인 고용", "$options": "i"}},
-                            {"intrsThemaArray": {"$regex": "고용|장려금|지원금|기업|장애인 고용", "$options": "i"}}
-                        ]
-                    }
-                }
-            ]
-            cursor = collection.aggregate(pipeline)
-            results = []
-            async for doc in cursor:
-                card = {
-                    "id": doc.get("servId", ""),
-                    "title": doc.get("servNm", ""),
-                    "subtitle": doc.get("jurMnofNm", ""),
-                    "summary": doc.get("servDgst", ""),
-                    "type": "policy",
-                    "details": doc.get("servDgst", ""),
-                    "source": {
-                        "url": doc.get("servDtlLink", ""),
-                        "name": doc.get("jurOrgNm", ""),
-                        "phone": doc.get("rprsCtadr", "")
-                    },
-                    "buttons": [
-                        {
-                            "type": "link",
-                            "label": "자세히 보기",
-                            "value": doc.get("servDtlLink", "")
-                        }
-                    ]
-                }
-                if doc.get("rprsCtadr"):
-                    card["buttons"].append({
-                        "type": "tel",
-                        "label": "문의하기",
-                        "value": doc.get("rprsCtadr")
-                    })
-                results.append(card)
+            results = await self.search_employment_policy_by_semantic(query, limit=3)
             if not results:
                 return {
                     "text": "죄송합니다. 관련 고용 정책 정보를 찾지 못했습니다.",
@@ -115,6 +88,6 @@ class EmploymentPolicyExpert(BaseExpert):
         return []
 
 async def employment_policy_response(query: str, keywords: List[str] = None, conversation_history=None) -> tuple:
-    expert = EmploymentPolicyExpert()
+    expert = get_expert(ExpertType.EMPLOYMENT_POLICY)
     response = await expert.process_query(query, keywords, conversation_history)
     return response.get("text", ""), response.get("cards", []) 
\ No newline at end of file
@@ -1,15 +1,20 @@
-from typing import Dict, List, Any
+from typing import Awaitable, Callable, Dict, List, Any, Union
 import logging
 import aiohttp
 import os
 import asyncio
 from app.models.expert_type import ExpertType
 from app.service.experts.base_expert import BaseExpert
+from app.service.registry import get_expert
 from app.service.openai_client import get_client
 from app.service.experts.common_form.example_cards import POLICY_CARD_TEMPLATE
+from app.service.experts.common_form.card_mapping import WELFARE_POLICY_CARD, vector_search_pipeline
 from app.service.utils.data_processor import DataProcessor
-from motor.motor_asyncio import AsyncIOMotorClient
+from app.service.motor_client import get_public_data_db
+from app.service.utils.cache import retrieval_cache
+from app.service.utils.deadline import DeadlineExceeded, max_time_ms, timeout_for
 from app.service.embedding import get_embedding
+from app.config.settings import EXPERT_TOOL_CALLING_ENABLED
 
 
 
@@ -107,16 +112,20 @@ class PolicyExpert(BaseExpert):
             }
         ]
     
-    async def search_policy_database(self, keywords: List[str], policy_type: str = None) -> List[Dict[str, Any]]:
+    def _get_tool_handlers(self) -> Dict[str, Callable[..., Awaitable[Any]]]:
+        return {"search_policy_database": self.search_policy_database}
+    
+    async def search_policy_database(self, keywords: List[str], policy_type: str = None) -> Union[List[Dict[str, Any]], Dict[str, str]]:
         """
         키워드와 정책 유형을 기반으로 실제 DB에서 정책 정보를 검색합니다.
+        search_policy_database 도구 실행 함수로도 사용되므로 예시 카드 대신 빈 목록/오류를 반환합니다.
         
         Args:
             keywords: 검색 키워드 목록
             policy_type: 정책 유형
             
         Returns:
-            검색된 정책 카드 목록
+            검색된 정책 카드 목록 (키워드/결과가 없으면 빈 목록, 백엔드 호출 실패 시 {"error": ...})
         """
         try:
             # 키워드가 None인 경우 빈 리스트로 초기화
@@ -132,7 +141,7 @@ class PolicyExpert(BaseExpert):
             
             if not valid_keywords:
                 logger.warning("유효한 키워드가 없습니다.")
-                return [POLICY_CARD_TEMPLATE]
+                return []
             
             # 기존 키워드 복사
             search_keywords = valid_keywords.copy()
@@ -153,14 +162,16 @@ class PolicyExpert(BaseExpert):
                         
                         logger.info(f"백엔드 API 호출 시도 {retry_count + 1}/{max_retries}: {url}")
                         
-                        async with session.get(url, timeout=10) as response:
+                        # 요청 마감 시간이 있으면 남은 시간만큼만 기다림
+                        timeout = aiohttp.ClientTimeout(total=timeout_for(10.0, "backend.welfare_search"))
+                        async with session.get(url, timeout=timeout) as response:
                             if response.status == 200:
                                 search_results = await response.json()
                                 logger.info(f"백엔드 API 응답 데이터 수: {len(search_results) if isinstance(search_results, list) else 0}")
                                 
                                 if not search_results:
                                     logger.warning(f"키워드 '{keyword_str}'에 대한 검색 결과가 없습니다.")
-                                    return [POLICY_CARD_TEMPLATE]
+                                    return []
                                 
                                 # 검색 결과를 카드 형식으로 변환
                                 policy_cards = []
@@ -220,21 +231,25 @@ class PolicyExpert(BaseExpert):
                                 if retry_count < max_retries:
                                     await asyncio.sleep(1)  # 1초 대기 후 재시도
                                     continue
-                                return [POLICY_CARD_TEMPLATE]
+                                return {"error": "정책 데이터베이스 검색에 실패했습니다."}
+                except DeadlineExceeded:
+                    # 마감 시간이 지나면 재시도하지 않음
+                    logger.warning("요청 마감 시간이 지나 백엔드 API 재시도를 중단합니다.")
+                    return {"error": "정책 데이터베이스 검색에 실패했습니다."}
                 except Exception as e:
                     logger.error(f"백엔드 API 호출 중 오류 발생 (시도 {retry_count + 1}/{max_retries}): {str(e)}")
                     retry_count += 1
                     if retry_count < max_retries:
                         await asyncio.sleep(1)  # 1초 대기 후 재시도
                         continue
-                    return [POLICY_CARD_TEMPLATE]
+                    return {"error": "정책 데이터베이스 검색에 실패했습니다."}
             
             logger.error(f"최대 재시도 횟수({max_retries})를 초과했습니다.")
-            return [POLICY_CARD_TEMPLATE]
+            return {"error": "정책 데이터베이스 검색에 실패했습니다."}
             
         except Exception as e:
             logger.error(f"정책 데이터 검색 중 오류 발생: {str(e)}")
-            return [POLICY_CARD_TEMPLATE]
+            return {"error": "정책 데이터베이스 검색에 실패했습니다."}
     
     async def process_query(self, query: str, keywords: List[str] = None, conversation_history=None) -> Dict[str, Any]:
         """
@@ -249,6 +264,12 @@ class PolicyExpert(BaseExpert):
             응답 딕셔너리 (text, cards)
         """
         try:
+            if EXPERT_TOOL_CALLING_ENABLED:
+                # 모델이 필요한 검색을 도구 호출로 한 번에 요청
+                response = await self.process_query_with_tools(query, conversation_history)
+                if response.get("cards"):
+                    return response
+                logger.info("[도구] 도구 호출 결과 카드 없음, 기본 검색으로 진행")
             logger.info(f"[임베딩] 의미론적 벡터 검색 시도: '{query}'")
             # 1. 임베딩 기반 벡터 검색 우선
             policy_cards = await self.search_policy_by_semantic(query, limit=3)
@@ -272,23 +293,6 @@ class PolicyExpert(BaseExpert):
             logger.error(f"정책 전문가 응답 생성 중 오류 발생: {e}", exc_info=True)
             return {"text": "죄송합니다. 응답을 생성하는 중 문제가 발생했습니다.", "cards": []}
     
-    def _prepare_messages(self, query: str, conversation_history: List[Dict[str, str]] = None) -> List[Dict[str, str]]:
-        """대화 이력을 처리하여 메시지 배열을 생성합니다."""
-        messages = [{"role": "system", "content": self._get_system_prompt()}]
-        
-        # 대화 이력이 있는 경우 추가
-        if conversation_history:
-            # 너무 긴 이력은 최근 5개만 사용
-            recent_history = conversation_history[-5:] if len(conversation_history) > 5 else conversation_history
-            for msg in recent_history:
-                if msg.get("role") and msg.get("content"):
-                    messages.append({"role": msg["role"], "content": msg["content"]})
-        
-        # 현재 쿼리 추가
-        messages.append({"role": "user", "content": query})
-        
-        return messages
-    
     def _get_description(self) -> str:
         return "장애인 관련 법률, 제도, 정책 등에 대한 정보를 제공합니다."
     
@@ -332,6 +336,8 @@ class PolicyExpert(BaseExpert):
         try:
             # 정책 카드 검색
             policy_cards = await self.search_policy_database(keywords)
+            if not isinstance(policy_cards, list) or not policy_cards:
+                policy_cards = [POLICY_CARD_TEMPLATE]
             
             # 각 카드의 형식 수정
             formatted_cards = []
@@ -397,53 +403,24 @@ class PolicyExpert(BaseExpert):
             정책 카드 리스트
         """
         try:
+            cache_key = f"policy_semantic:{limit}:{user_query}"
+            cached_cards = retrieval_cache.get(cache_key)
+            if cached_cards is not None:
+                return cached_cards
+
             user_embedding = await get_embedding(user_query)
-            # MongoDB 연결 (비동기)
-            mongo_uri = os.getenv("MONGO_URI")
-            client = AsyncIOMotorClient(mongo_uri)
-            db = client["public_data_db"]
-            collection = db["welfare_service_list"]
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "vector_index_welfare_list",
-                        "path": "embedding",
-                        "queryVector": user_embedding,
-                        "numCandidates": 1000,
-                        "limit": limit
-                    }
-                }
-            ]
-            cursor = collection.aggregate(pipeline)
-            results = []
-            async for doc in cursor:
-                card = {
-                    "id": doc.get("servId", ""),
-                    "title": doc.get("servNm", ""),
-                    "summary": doc.get("intrsThemaArray", ""),
-                    "type": "policy",
-                    "details": doc.get("servDgst", ""),
-                    "source": {
-                        "subtitle": doc.get("srvPvsnNm", ""),
-                        "url": doc.get("servDtlLink", ""),
-                        "name": doc.get("jurOrgNm", ""),
-                        "phone": doc.get("rprsCtadr", "")
-                    },
-                    "buttons": [
-                        {
-                            "type": "link",
-                            "label": "자세히 보기",
-                            "value": doc.get("servDtlLink", "")
-                        }
-                    ]
-                }
-                if doc.get("rprsCtadr"):
-                    card["buttons"].append({
-                        "type": "tel",
-                        "label": "문의하기",
-                        "value": doc.get("rprsCtadr")
-                    })
-                results.append(card)
+            # 공유 MongoDB 클라이언트 사용 (비동기)
+            collection = get_public_data_db()["welfare_service_list"]
+            pipeline = vector_search_pipeline(
+                WELFARE_POLICY_CARD,
+                index="vector_index_welfare_list",
+                query_vector=user_embedding,
+                num_candidates=1000,
+                limit=limit
+            )
+            cursor = collection.aggregate(pipeline, maxTimeMS=max_time_ms(10.0, "mongo.policy"))
+            results = WELFARE_POLICY_CARD.to_cards(await cursor.to_list(length=limit))
+            retrieval_cache.set(cache_key, results)
             return results
         except Exception as e:
             logger.error(f"임베딩 기반 정책 검색 중 오류 발생: {str(e)}")
@@ -461,6 +438,6 @@ async def policy_response(query: str, keywords: List[str] = None, conversation_h
     Returns:
         (응답 텍스트, 정보 카드 목록)
     """
-    expert = PolicyExpert()
+    expert = get_expert(ExpertType.POLICY)
     response = await expert.process_query(query, keywords, conversation_history)
     return response.get("text", ""), response.get("cards", []) 
\ No newline at end of file
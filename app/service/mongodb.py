@@ -67,11 +67,17 @@ def search_welfare_services(keyword: str = "", limit: int = 5):
     return list(col.find(query).limit(limit))
 
 # ✅ 5. public_data_db 복지 서비스 상세 조회
+# (앱의 비동기 경로에서는 캐시가 적용된 app.service.welfare_detail을 사용)
 
 def get_welfare_service_detail(servId: str):
+    return get_welfare_service_details([servId]).get(servId)
+
+def get_welfare_service_details(servIds):
+    # 여러 servId를 한 번의 $in 쿼리로 조회
     db = client["public_data_db"]
     col = db["welfare_service_detail"]
-    return col.find_one({"servId": servId})
+    docs = col.find({"servId": {"$in": list(servIds)}}, {"_id": 0, "embedding": 0})
+    return {doc["servId"]: doc for doc in docs}
 
 # ✅ 6. public_data_db 장애인 구직 현황 검색
 
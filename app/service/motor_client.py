@@ -0,0 +1,37 @@
+import logging
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from app.config.settings import MONGO_URI, PUBLIC_DATA_DB
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 비동기 MongoDB 클라이언트 (커넥션 풀 재사용)
+_motor_client: Optional[AsyncIOMotorClient] = None
+
+def get_motor_client() -> AsyncIOMotorClient:
+    """
+    공유 AsyncIOMotorClient 인스턴스를 반환합니다.
+    이벤트 루프가 실행된 뒤 처음 호출될 때 생성됩니다.
+    """
+    global _motor_client
+    if _motor_client is None:
+        _motor_client = AsyncIOMotorClient(MONGO_URI)
+    return _motor_client
+
+def get_public_data_db() -> AsyncIOMotorDatabase:
+    """공공데이터 컬렉션이 있는 데이터베이스를 반환합니다."""
+    return get_motor_client()[PUBLIC_DATA_DB]
+
+async def ping() -> bool:
+    """
+    MongoDB에 ping을 보내 커넥션 풀을 엽니다.
+
+    Returns:
+        성공 여부
+    """
+    try:
+        await get_motor_client().admin.command("ping")
+        return True
+    except Exception as e:
+        logger.error(f"MongoDB ping 실패: {e}")
+        return False
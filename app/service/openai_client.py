@@ -1,19 +1,75 @@
 import os
-from openai import AsyncOpenAI
+from typing import Optional
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.chat import ChatCompletion
 from dotenv import load_dotenv
+from app.config.settings import LLM_CACHE_ENABLED, LLM_CACHE_MAX_ITEMS, LLM_CACHE_PATH, OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT
+from app.service.utils.completion_cache import CompletionCache, completion_cache_key
+from app.service.utils.metrics import metrics
+from app.service.utils.deadline import timeout_for
+from app.service.utils.rate_limiter import RateLimiter, RateLimitedTransport
 
 load_dotenv()  # 반드시 인스턴스 생성 전에 호출
 
+# 프로세스의 모든 OpenAI 호출이 공유하는 속도 제한기 (우선순위는 priority_scope로 지정)
+rate_limiter = RateLimiter(rpm=OPENAI_RPM_LIMIT, tpm=OPENAI_TPM_LIMIT)
+
 # 클라이언트 설정
 openai_client = AsyncOpenAI(
     api_key=os.getenv("OPENAI_API_KEY"),
     base_url="https://api.openai.com/v1",  # 기본 URL 명시적 설정
     max_retries=2,  # 재시도 횟수 설정
-    timeout=60.0  # 타임아웃 설정
+    timeout=60.0,  # 타임아웃 설정
+    http_client=DefaultAsyncHttpxClient(transport=RateLimitedTransport(rate_limiter))
 )
 
+# LLM 응답 캐시 (메모리 + 디스크)
+completion_cache = CompletionCache(max_items=LLM_CACHE_MAX_ITEMS, path=LLM_CACHE_PATH)
+
 def get_client():
     """
     OpenAI 클라이언트 인스턴스를 반환합니다.
     """
     return openai_client
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    OpenAI 속도 제한기 인스턴스를 반환합니다.
+    """
+    return rate_limiter
+
+async def create_chat_completion(
+    cache_ttl: Optional[int] = None,
+    bypass: bool = False,
+    cache_name: str = "default",
+    **params
+) -> ChatCompletion:
+    """
+    chat.completions.create를 호출합니다. cache_ttl을 지정한 호출만 응답을 캐싱합니다.
+    같은 입력에 결정적인 결과를 기대할 수 있는 호출에만 사용하세요.
+
+    Args:
+        cache_ttl: 캐시 유효 시간(초), None이면 캐시를 사용하지 않음
+        bypass: True이면 캐시를 조회하지 않고 새로 호출한 뒤 결과로 캐시를 갱신
+        cache_name: 호출 지점 이름 (적중률 메트릭 구분용)
+        **params: chat.completions.create 파라미터 (model, messages, tools, temperature 등)
+
+    Returns:
+        ChatCompletion 응답
+    """
+    # 요청 마감 시간이 있으면 남은 시간만큼만 기다림 (캐시 키에는 포함하지 않음)
+    timeout = timeout_for(60.0, f"openai.{cache_name}")
+    if cache_ttl is None or not LLM_CACHE_ENABLED:
+        return await openai_client.chat.completions.create(timeout=timeout, **params)
+
+    key = completion_cache_key(params)
+    if bypass:
+        metrics.increment(f"llm_cache.bypass.{cache_name}")
+    else:
+        cached_response = await completion_cache.get(key, cache_name, ChatCompletion.model_validate_json)
+        if cached_response is not None:
+            return cached_response
+
+    response = await openai_client.chat.completions.create(timeout=timeout, **params)
+    await completion_cache.set(key, response, cache_ttl, lambda r: r.model_dump_json())
+    return response
@@ -0,0 +1,105 @@
+"""
+전문가/에이전트 레지스트리
+애플리케이션 시작 시 전문가와 에이전트를 한 번만 생성하고,
+요청마다 같은 인스턴스를 재사용합니다.
+"""
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+import logging
+
+from app.models.expert_type import ExpertType
+from app.service.agents.general_chatbot import GeneralChatbot
+from app.service.agents.supervisor import SupervisorAgent
+
+if TYPE_CHECKING:
+    from app.service.experts.base_expert import BaseExpert
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """
+    전문가와 에이전트 싱글톤 레지스트리
+    시스템 프롬프트, 도구 스키마, 메시지 prefix는 인스턴스 생성 시 한 번만 계산됩니다.
+    """
+
+    def __init__(self):
+        self._experts: Dict[ExpertType, "BaseExpert"] = {}
+        self._general_chatbot: Optional[GeneralChatbot] = None
+        self._supervisor_agent: Optional[SupervisorAgent] = None
+
+    @property
+    def initialized(self) -> bool:
+        return bool(self._experts) and self._general_chatbot is not None and self._supervisor_agent is not None
+
+    def initialize(self) -> None:
+        """모든 전문가와 에이전트를 생성합니다. 이미 생성된 경우 아무 작업도 하지 않습니다."""
+        if self.initialized:
+            return
+        # 전문가 모듈이 레지스트리를 참조하므로 순환 import를 피하기 위해 지역 import 사용
+        from app.service.experts.policy_expert import PolicyExpert
+        from app.service.experts.employment_expert import EmploymentExpert
+        from app.service.experts.employment_policy_expert import EmploymentPolicyExpert
+        from app.service.experts.job_seekers_expert import JobSeekersExpert
+
+        for expert_class in (PolicyExpert, EmploymentExpert, EmploymentPolicyExpert, JobSeekersExpert):
+            expert = expert_class()
+            self._experts[expert.expert_type] = expert
+
+        self._general_chatbot = GeneralChatbot()
+        self._supervisor_agent = SupervisorAgent()
+        logger.info(f"서비스 레지스트리 초기화 완료: 전문가 {len(self._experts)}개")
+
+    def get_expert(self, expert_type: ExpertType) -> "BaseExpert":
+        """
+        전문가 유형에 해당하는 싱글톤 전문가 인스턴스를 반환합니다.
+
+        Args:
+            expert_type: 전문가 유형
+
+        Returns:
+            전문가 인스턴스
+
+        Raises:
+            KeyError: 등록되지 않은 전문가 유형인 경우
+        """
+        if not self.initialized:
+            self.initialize()
+        return self._experts[expert_type]
+
+    def experts(self) -> List["BaseExpert"]:
+        """등록된 모든 전문가 인스턴스를 반환합니다."""
+        if not self.initialized:
+            self.initialize()
+        return list(self._experts.values())
+
+    @property
+    def general_chatbot(self) -> GeneralChatbot:
+        if not self.initialized:
+            self.initialize()
+        return self._general_chatbot
+
+    @property
+    def supervisor_agent(self) -> SupervisorAgent:
+        if not self.initialized:
+            self.initialize()
+        return self._supervisor_agent
+
+
+# 글로벌 레지스트리 인스턴스
+registry = ServiceRegistry()
+
+
+def get_expert(expert_type: ExpertType) -> "BaseExpert":
+    """전문가 유형에 해당하는 싱글톤 전문가 인스턴스를 반환합니다."""
+    return registry.get_expert(expert_type)
+
+
+def get_general_chatbot() -> GeneralChatbot:
+    """싱글톤 일반 챗봇 인스턴스를 반환합니다."""
+    return registry.general_chatbot
+
+
+def get_supervisor_agent() -> SupervisorAgent:
+    """싱글톤 슈퍼바이저 에이전트 인스턴스를 반환합니다."""
+    return registry.supervisor_agent
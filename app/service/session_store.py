@@ -0,0 +1,184 @@
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from app.config.settings import (
+    SESSION_SECRET, SESSION_EXPIRE_DAYS, SESSION_MAX_SESSIONS, SESSION_HISTORY_WINDOW
+)
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 서버 측 대화 세션
+#
+# 클라이언트는 매 턴 전체 대화 대신 세션 ID와 새 메시지만 보냅니다.
+# 세션에는 최근 대화 SESSION_HISTORY_WINDOW개와 그보다 오래된 대화의 누적 요약, 마지막 라우팅 결과를 보관하므로
+# 대화가 길어져도 요청 크기와 턴당 처리량(프롬프트 길이)이 일정합니다.
+
+
+def _sign(raw: str) -> str:
+    return hmac.new(SESSION_SECRET.encode(), raw.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def new_session_id() -> str:
+    """SESSION_SECRET으로 서명된 세션 ID를 만듭니다. ("<랜덤>.<서명>")"""
+    raw = secrets.token_urlsafe(16)
+    return f"{raw}.{_sign(raw)}"
+
+
+def verify_session_id(session_id: str) -> bool:
+    """세션 ID의 서명을 확인합니다. (위조된 ID는 저장소 조회 전에 거부)"""
+    raw, _, signature = (session_id or "").partition(".")
+    return bool(raw and signature) and hmac.compare_digest(signature, _sign(raw))
+
+
+class ConversationSession:
+    """
+    대화 세션 하나의 상태
+    """
+
+    def __init__(self, session_id: str, window: int):
+        self.session_id = session_id
+        # 최근 대화 (window개를 넘는 오래된 메시지는 compact_session이 누적 요약으로 옮김)
+        self.messages: Deque[Dict[str, str]] = deque()
+        self.window = window
+        self.summary = ""
+        self.last_routing: Optional[Tuple[Any, List[str]]] = None
+        self.turns = 0
+        self.expires_at = 0.0
+        # 같은 세션의 턴과 요약 압축을 순서대로 처리
+        self.lock = asyncio.Lock()
+
+    def context_messages(self, new_message: str) -> List[Dict[str, str]]:
+        """
+        파이프라인에 넘길 대화 (누적 요약 + 최근 대화 + 새 메시지)를 만듭니다.
+
+        Args:
+            new_message: 이번 턴의 사용자 메시지
+
+        Returns:
+            대화 메시지 목록 (길이는 window + 2 이하)
+        """
+        messages: List[Dict[str, str]] = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"이전 대화 요약: {self.summary}"})
+        messages.extend(list(self.messages)[-self.window:])
+        messages.append({"role": "user", "content": new_message})
+        return messages
+
+    def append_turn(self, user_message: str, answer: str) -> None:
+        """이번 턴의 사용자 메시지와 응답을 기록합니다."""
+        self.messages.append({"role": "user", "content": user_message})
+        self.messages.append({"role": "assistant", "content": answer})
+        self.turns += 1
+
+    def overflow(self) -> List[Dict[str, str]]:
+        """최근 대화 window를 넘어 요약에 합쳐야 할 오래된 메시지를 꺼냅니다."""
+        overflow = []
+        while len(self.messages) > self.window:
+            overflow.append(self.messages.popleft())
+        return overflow
+
+
+class SessionStore:
+    """
+    크기 제한과 TTL이 있는 메모리 세션 저장소 (가장 오래 사용하지 않은 세션부터 제거)
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX_SESSIONS, ttl: float = SESSION_EXPIRE_DAYS * 86400,
+                 window: int = SESSION_HISTORY_WINDOW):
+        """
+        Args:
+            max_sessions: 최대 세션 수
+            ttl: 마지막 사용 후 세션 유지 시간(초)
+            window: 세션별로 원문을 보관할 최근 메시지 수
+        """
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.window = window
+
+    def create(self) -> ConversationSession:
+        """새 세션을 만듭니다."""
+        session = ConversationSession(new_session_id(), self.window)
+        session.expires_at = time.time() + self.ttl
+        if len(self.sessions) >= self.max_sessions:
+            evicted_id, _ = self.sessions.popitem(last=False)
+            metrics.increment("session.evicted")
+            logger.debug(f"[세션] 최대 세션 수 초과로 제거: {evicted_id[:8]}")
+        self.sessions[session.session_id] = session
+        metrics.increment("session.created")
+        return session
+
+    def get(self, session_id: str) -> Optional[ConversationSession]:
+        """
+        세션을 찾고 만료 시간을 연장합니다.
+
+        Args:
+            session_id: 세션 ID
+
+        Returns:
+            세션 또는 None (서명 불일치, 만료, 없음)
+        """
+        if not verify_session_id(session_id):
+            metrics.increment("session.invalid")
+            return None
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        now = time.time()
+        if now > session.expires_at:
+            del self.sessions[session_id]
+            metrics.increment("session.expired")
+            return None
+        session.expires_at = now + self.ttl
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """세션을 삭제합니다."""
+        return self.sessions.pop(session_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+
+async def compact_session(session: ConversationSession, general_chatbot) -> None:
+    """
+    최근 대화 window를 넘은 메시지를 누적 요약에 합칩니다. 응답 반환 뒤 백그라운드로 실행합니다.
+
+    Args:
+        session: 대화 세션
+        general_chatbot: 요약을 생성할 일반 챗봇
+    """
+    async with session.lock:
+        overflow = session.overflow()
+        if overflow:
+            session.summary = await general_chatbot.summarize_conversation(session.summary, overflow)
+            metrics.increment("session.compacted")
+
+
+# 실행 중인 요약 압축 태스크 (GC로 취소되지 않도록 참조 유지)
+_compaction_tasks: set = set()
+
+
+def schedule_compaction(session: ConversationSession, general_chatbot) -> None:
+    """최근 대화 window를 넘은 세션의 요약 압축을 백그라운드로 예약합니다."""
+    if len(session.messages) <= session.window:
+        return
+    task = asyncio.create_task(compact_session(session, general_chatbot))
+    _compaction_tasks.add(task)
+    task.add_done_callback(_compaction_tasks.discard)
+
+
+# 글로벌 세션 저장소
+session_store = SessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """글로벌 세션 저장소를 반환합니다."""
+    return session_store
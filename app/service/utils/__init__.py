@@ -1,4 +1,4 @@
-from .cache import SimpleCache, global_cache, cached
+from .cache import SimpleCache, global_cache, embedding_cache, card_embedding_cache, retrieval_cache, tool_result_cache, welfare_detail_cache, cached
 from .data_processor import DataProcessor
 
-__all__ = ['SimpleCache', 'global_cache', 'cached', 'DataProcessor'] 
\ No newline at end of file
+__all__ = ['SimpleCache', 'global_cache', 'embedding_cache', 'card_embedding_cache', 'retrieval_cache', 'tool_result_cache', 'welfare_detail_cache', 'cached', 'DataProcessor'] 
\ No newline at end of file
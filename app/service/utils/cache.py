@@ -1,7 +1,13 @@
 from typing import Dict, Any, Optional, Callable
+import os
 import time
 import logging
 from functools import wraps
+from app.config.settings import (
+    WELFARE_DETAIL_CACHE_TTL, SHARED_CACHE_ENABLED, SHARED_CACHE_DIR, SHARED_EMBEDDING_SLOTS,
+    SHARED_RETRIEVAL_SLOTS, SHARED_RETRIEVAL_SLOT_BYTES
+)
+from app.service.utils.shared_cache import SharedJSONCache, SharedVectorCache
 
 logger = logging.getLogger(__name__)
 
@@ -10,13 +16,17 @@ class SimpleCache:
     간단한 메모리 캐시 구현
     """
     
-    def __init__(self, ttl: int = 3600):
+    def __init__(self, ttl: int = 3600, max_size: Optional[int] = None, shared: Optional[Any] = None):
         """
         Args:
             ttl: 캐시 유효 시간(초), 기본 1시간
+            max_size: 최대 항목 수, None이면 제한 없음 (초과 시 가장 오래된 항목부터 제거)
+            shared: 워커 간 공유 캐시 (메모리 캐시 미스 시 네트워크 호출 전에 조회)
         """
         self.cache: Dict[str, Dict[str, Any]] = {}
         self.ttl = ttl
+        self.max_size = max_size
+        self.shared = shared
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -29,16 +39,27 @@ class SimpleCache:
             캐시된 값 또는 None (캐시 미스 시)
         """
         if key not in self.cache:
-            return None
+            return self._get_shared(key)
         
         cache_item = self.cache[key]
         if time.time() > cache_item["expires"]:
             # 캐시 만료
             del self.cache[key]
-            return None
+            return self._get_shared(key)
         
         return cache_item["value"]
     
+    def _get_shared(self, key: str) -> Optional[Any]:
+        """공유 캐시에서 값을 찾아 메모리 캐시로 올립니다."""
+        if self.shared is None:
+            return None
+        found = self.shared.get(key)
+        if found is None:
+            return None
+        value, remaining = found
+        self._set_local(key, value, remaining)
+        return value
+    
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
         캐시에 값을 저장합니다.
@@ -48,7 +69,16 @@ class SimpleCache:
             value: 저장할 값
             ttl: 캐시 유효 시간(초), None이면 기본값 사용
         """
-        expires = time.time() + (ttl if ttl is not None else self.ttl)
+        ttl = ttl if ttl is not None else self.ttl
+        self._set_local(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+    
+    def _set_local(self, key: str, value: Any, ttl: float) -> None:
+        expires = time.time() + ttl
+        if self.max_size is not None and key not in self.cache and len(self.cache) >= self.max_size:
+            # dict는 삽입 순서를 유지하므로 첫 번째 키가 가장 오래된 항목
+            del self.cache[next(iter(self.cache))]
         self.cache[key] = {
             "value": value,
             "expires": expires
@@ -63,14 +93,42 @@ class SimpleCache:
         """
         if key in self.cache:
             del self.cache[key]
+        if self.shared is not None:
+            self.shared.delete(key)
     
     def clear(self) -> None:
-        """캐시를 모두 비웁니다."""
+        """캐시를 모두 비웁니다. (공유 캐시가 있으면 함께 비움)"""
         self.cache.clear()
+        if self.shared is not None:
+            self.shared.clear()
 
 # 글로벌 캐시 인스턴스
 global_cache = SimpleCache()
 
+# 워커 간 공유 캐시 (임베딩은 1536차원 float32 고정 슬롯)
+shared_embedding_cache = SharedVectorCache(
+    "embedding", os.path.join(SHARED_CACHE_DIR, "idea_ai_embedding.cache"), SHARED_EMBEDDING_SLOTS, dimensions=1536
+) if SHARED_CACHE_ENABLED else None
+shared_retrieval_cache = SharedJSONCache(
+    "retrieval", os.path.join(SHARED_CACHE_DIR, "idea_ai_retrieval.cache"), SHARED_RETRIEVAL_SLOTS, SHARED_RETRIEVAL_SLOT_BYTES
+) if SHARED_CACHE_ENABLED else None
+
+# 쿼리 임베딩 캐시 (같은 텍스트는 같은 임베딩을 반환하므로 길게 유지)
+embedding_cache = SimpleCache(ttl=86400, max_size=5000, shared=shared_embedding_cache)
+
+# 벡터 검색 결과 캐시
+retrieval_cache = SimpleCache(ttl=600, max_size=1000, shared=shared_retrieval_cache)
+
+# 카드 순위화용 결과 문서 임베딩 (카드 id 기준, 검색 결과 캐시와 같은 TTL)
+# 쿼리 임베딩 캐시(공유 슬롯)를 밀어내지 않도록 프로세스 로컬 캐시로 분리
+card_embedding_cache = SimpleCache(ttl=600, max_size=2000)
+
+# 전문가 도구 호출 결과 캐시 (요청 간 공유)
+tool_result_cache = SimpleCache(ttl=600, max_size=500)
+
+# 복지 서비스 상세 캐시 (servId 기준, 상세 컬렉션 재동기화 시 무효화)
+welfare_detail_cache = SimpleCache(ttl=WELFARE_DETAIL_CACHE_TTL, max_size=5000)
+
 def cached(ttl: Optional[int] = None):
     """
     함수 결과를 캐싱하는 데코레이터
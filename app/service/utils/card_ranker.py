@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional
+import logging
+import re
+import numpy as np
+from app.service.utils.cache import card_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+# 정보 카드 순위화
+#
+# 여러 검색(정책/구인 등)에서 모은 후보 카드를 id와 제목 유사도로 중복 제거한 뒤,
+# 벡터 검색 점수와 결과 문서 임베딩으로 MMR(Maximal Marginal Relevance)을 적용해 다양한 상위 k개를 고릅니다.
+# 결과 문서 임베딩은 카드에 싣지 않고 card_embedding_cache에 카드 id 기준으로 보관합니다. (검색 결과 캐시 크기 유지)
+# 다른 워커의 공유 캐시에서 가져온 검색 결과처럼 임베딩이 없는 카드는 다양성 계산에서 0 벡터로 취급합니다.
+
+_TITLE_NOISE = re.compile(r'[^가-힣a-zA-Z0-9]')
+
+
+def card_embedding_key(card: Dict[str, Any]) -> str:
+    """카드 임베딩 캐시 키를 반환합니다."""
+    return f"card_embedding:{card.get('type', '')}:{card.get('id', '')}"
+
+
+def store_card_embeddings(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    카드에 실린 결과 문서 임베딩을 card_embedding_cache로 옮기고 카드에서 제거합니다. (float32 배열로 보관)
+
+    Args:
+        cards: "embedding" 필드가 포함될 수 있는 카드 목록
+
+    Returns:
+        임베딩이 제거된 카드 목록 (같은 객체)
+    """
+    for card in cards:
+        embedding = card.pop("embedding", None)
+        if embedding is not None and card.get("id"):
+            card_embedding_cache.set(card_embedding_key(card), np.asarray(embedding, dtype=np.float32))
+    return cards
+
+
+def _title_bigrams(title: Any) -> set:
+    text = _TITLE_NOISE.sub("", str(title or "")).lower()
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+
+def _is_similar_title(a: set, b: set, threshold: float) -> bool:
+    return len(a & b) / len(a | b) >= threshold if a and b else False
+
+
+def dedupe_candidates(cards: List[Dict[str, Any]], title_threshold: float = 0.8) -> List[Dict[str, Any]]:
+    """
+    id가 같거나 제목이 거의 같은 카드 중 점수가 가장 높은 카드만 남깁니다.
+
+    Args:
+        cards: 후보 카드 목록
+        title_threshold: 제목 글자 bigram Jaccard 유사도 기준
+
+    Returns:
+        중복 제거된 카드 목록 (점수 내림차순)
+    """
+    ordered = sorted(
+        (card for card in cards if isinstance(card, dict)),
+        key=lambda card: card.get("score") or 0.0, reverse=True
+    )
+    kept, kept_titles, seen_ids = [], [], set()
+    for card in ordered:
+        card_key = (card.get("type"), card.get("id")) if card.get("id") else None
+        if card_key in seen_ids:
+            continue
+        bigrams = _title_bigrams(card.get("title"))
+        if any(_is_similar_title(bigrams, other, title_threshold) for other in kept_titles):
+            continue
+        if card_key:
+            seen_ids.add(card_key)
+        kept.append(card)
+        kept_titles.append(bigrams)
+    return kept
+
+
+def mmr_select(relevance: np.ndarray, embeddings: np.ndarray, k: int, lambda_: float = 0.7) -> List[int]:
+    """
+    MMR로 관련성이 높으면서 서로 다른 k개의 인덱스를 고릅니다.
+
+    Args:
+        relevance: 후보별 관련성 점수 (n,)
+        embeddings: 후보별 정규화된 임베딩 (n, d), 임베딩이 없는 행은 0 벡터
+        k: 선택할 개수
+        lambda_: 관련성 가중치 (1이면 점수순, 0이면 다양성만 고려)
+
+    Returns:
+        선택된 후보 인덱스 목록 (선택 순서)
+    """
+    n = len(relevance)
+    k = min(k, n)
+    similarity = embeddings @ embeddings.T
+    max_similarity = np.zeros(n)
+    available = np.ones(n, dtype=bool)
+    selected: List[int] = []
+    for _ in range(k):
+        scores = np.where(available, lambda_ * relevance - (1 - lambda_) * max_similarity, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        max_similarity = np.maximum(max_similarity, similarity[best])
+    return selected
+
+
+def rank_cards(
+    cards: List[Dict[str, Any]], top_k: int, lambda_: float = 0.7, title_threshold: float = 0.8
+) -> List[Dict[str, Any]]:
+    """
+    후보 카드를 중복 제거하고 MMR로 상위 top_k개를 고릅니다.
+
+    Args:
+        cards: 여러 검색에서 모은 후보 카드 목록 ("score" 필드 사용)
+        top_k: 반환할 카드 수
+        lambda_: MMR 관련성 가중치
+        title_threshold: 제목 중복 판단 기준
+
+    Returns:
+        순위화된 카드 목록
+    """
+    candidates = dedupe_candidates(cards, title_threshold)
+    if len(candidates) <= 1:
+        return candidates[:top_k]
+
+    vectors: List[Optional[Any]] = [card_embedding_cache.get(card_embedding_key(card)) for card in candidates]
+    dimensions = next((len(vector) for vector in vectors if vector is not None), 0)
+    if not dimensions:
+        # 임베딩이 없으면 다양성 없이 점수순
+        return candidates[:top_k]
+
+    embeddings = np.zeros((len(candidates), dimensions), dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        if vector is not None and len(vector) == dimensions:
+            embeddings[i] = vector
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    embeddings = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+    relevance = np.array([card.get("score") or 0.0 for card in candidates], dtype=np.float32)
+
+    selected = mmr_select(relevance, embeddings, top_k, lambda_)
+    logger.debug(f"카드 순위화: 후보 {len(cards)}개 -> 중복 제거 {len(candidates)}개 -> 선택 {len(selected)}개")
+    return [candidates[i] for i in selected]
@@ -0,0 +1,169 @@
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.service.utils.cache import SimpleCache
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# LLM 응답 캐시
+#
+# 같은 모델/메시지/도구/파라미터로 호출하면 같은 결과를 기대할 수 있는 호출의 응답을 저장합니다.
+# 1차로 크기가 제한된 메모리 캐시를, 2차로 워커 재시작 후에도 유지되는 SQLite 디스크 캐시를 사용합니다.
+# 메트릭 이름: llm_cache.{hit.memory|hit.disk|miss|bypass}.{호출 지점 이름}
+
+
+def completion_cache_key(params: Dict[str, Any]) -> str:
+    """
+    호출 파라미터(model, messages, tools, temperature 등)로 캐시 키를 만듭니다.
+
+    Args:
+        params: chat.completions.create에 전달할 파라미터
+
+    Returns:
+        sha256 hex 문자열
+    """
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    SQLite 기반 디스크 캐시 (값은 JSON 문자열)
+    """
+
+    # 만료 항목 정리 주기 (저장 횟수 기준)
+    PRUNE_EVERY = 200
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires < ?", (time.time(),))
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """저장된 값과 남은 유효 시간(초)을 반환합니다."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0], row[1] - time.time()
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM llm_cache WHERE expires < ?", (time.time(),))
+            conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+class CompletionCache:
+    """
+    메모리 + 디스크 2단계 LLM 응답 캐시
+    """
+
+    def __init__(self, max_items: int, path: Optional[str] = None):
+        """
+        Args:
+            max_items: 메모리 캐시 최대 항목 수
+            path: SQLite 파일 경로 (None이면 디스크 캐시를 사용하지 않음)
+        """
+        self.memory = SimpleCache(ttl=3600, max_size=max_items)
+        self.disk = DiskCache(path) if path else None
+
+    async def get(self, key: str, name: str, loads) -> Optional[Any]:
+        """
+        캐시된 응답을 찾습니다. 디스크에서 찾은 응답은 메모리 캐시로 올립니다.
+
+        Args:
+            key: 캐시 키
+            name: 호출 지점 이름 (메트릭용)
+            loads: 디스크에 저장된 JSON 문자열을 응답 객체로 변환하는 함수
+
+        Returns:
+            캐시된 응답 또는 None
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            metrics.increment(f"llm_cache.hit.memory.{name}")
+            return value
+
+        if self.disk is not None:
+            try:
+                stored = await asyncio.to_thread(self.disk.get, key)
+            except Exception as e:
+                logger.warning(f"[LLM 캐시] 디스크 캐시 조회 실패: {e}")
+                stored = None
+            if stored is not None:
+                value = loads(stored[0])
+                self.memory.set(key, value, stored[1])
+                metrics.increment(f"llm_cache.hit.disk.{name}")
+                return value
+
+        metrics.increment(f"llm_cache.miss.{name}")
+        return None
+
+    async def set(self, key: str, value: Any, ttl: int, dumps) -> None:
+        """
+        응답을 메모리와 디스크에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            value: 응답 객체
+            ttl: 유효 시간(초)
+            dumps: 응답 객체를 JSON 문자열로 변환하는 함수
+        """
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, dumps(value), ttl)
+            except Exception as e:
+                logger.warning(f"[LLM 캐시] 디스크 캐시 저장 실패: {e}")
+
+
+def completion_cache_stats() -> Dict[str, Any]:
+    """
+    호출 지점별 LLM 캐시 적중 수와 적중률을 반환합니다.
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    for name, value in metrics.snapshot().items():
+        if not name.startswith("llm_cache."):
+            continue
+        parts = name.split(".")
+        outcome = ".".join(parts[1:-1])
+        stats.setdefault(parts[-1], {})[outcome] = value
+    for site in stats.values():
+        hits = site.get("hit.memory", 0) + site.get("hit.disk", 0)
+        site["hit_rate"] = metrics.hit_rate(hits, site.get("miss", 0))
+    return stats
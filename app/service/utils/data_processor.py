@@ -2,6 +2,7 @@ from typing import Dict, List, Any, Optional
 import re
 import json
 import logging
+from app.service.utils.keyword_extractor import keyword_extractor
 
 logger = logging.getLogger(__name__)
 
@@ -22,40 +23,8 @@ class DataProcessor:
         Returns:
             추출된 키워드 목록
         """
-        # 실제 구현에서는 NLP 라이브러리를 사용하여 키워드 추출
-        # 임시 구현: 간단한 규칙 기반 키워드 추출
-        
-        # 텍스트 전처리
-        text = text.lower()
-        
-        # 불용어 정의 (실제로는 더 많은 불용어 필요)
-        stopwords = [
-            "안녕", "하세요", "입니다", "그리고", "그런데", "하지만", "또한", "이제", "만약", "어떻게",
-            "언제", "왜", "어디", "누구", "무엇", "얼마나", "있는", "있다", "없는", "없다", "해서",
-            "이런", "저런", "어떤", "제가", "나는", "너는", "우리", "당신", "그것", "좀", "많이",
-            # 정책 도메인 불용어 추가
-            "정책", "지원", "제도", "돕는", "관련", "정보", "문의", "수", "하는", "위한", "대해", "대한",
-            "있나요", "있니", "있습니까", "있을까요", "있으면", "있어", "있던", "있었나요", "있었니", "있었습니까"
-        ]
-        
-        # 정규식으로 단어 분리 (한글, 영문, 숫자)
-        words = re.findall(r'[가-힣a-zA-Z0-9]+', text)
-        
-        # 불용어 제거 및 길이가 1인 단어 제거
-        filtered_words = [word for word in words if word not in stopwords and len(word) > 1]
-        
-        # 단어 빈도 계산
-        word_freq = {}
-        for word in filtered_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # 빈도순 정렬
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        
-        # 최대 개수만큼 키워드 추출
-        keywords = [word for word, _ in sorted_words[:max_keywords]]
-        
-        return keywords
+        # 조사 제거 + 코퍼스 IDF 가중치 기반 추출 (불용어/정규식은 모듈 로드 시 한 번만 구성)
+        return keyword_extractor.extract(text, max_keywords)
     
     @staticmethod
     def format_policy_cards(cards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
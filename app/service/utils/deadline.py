@@ -0,0 +1,81 @@
+from typing import Iterator, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+from app.service.utils.metrics import metrics
+
+# 요청 단위 마감 시간
+#
+# 요청 처리 시작 시 deadline_scope로 마감 시각을 contextvar에 설정하면,
+# 그 요청에서 만들어진 태스크까지 같은 마감 시각을 공유합니다.
+# OpenAI/MongoDB/aiohttp 호출은 timeout_for, max_time_ms로 남은 시간만큼만 기다립니다.
+# 메트릭 이름: deadline.expired.{호출 지점 이름}
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시간이 지나 호출을 시작할 수 없을 때 발생하는 예외"""
+
+    def __init__(self, site: str):
+        super().__init__(f"요청 마감 시간 초과: {site}")
+        self.site = site
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """
+    현재 컨텍스트에 마감 시각을 설정합니다. 이미 더 이른 마감 시각이 있으면 그대로 유지합니다.
+
+    Args:
+        seconds: 지금부터 마감까지 남은 시간(초)
+
+    Returns:
+        설정된 마감 시각 (time.monotonic 기준)
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 시간(초)을 반환합니다. 마감 시각이 없으면 None을 반환합니다."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def timeout_for(cap: float, site: str) -> float:
+    """
+    호출에 사용할 타임아웃을 계산합니다. (기본 타임아웃과 남은 시간 중 작은 값)
+
+    Args:
+        cap: 호출의 기본 타임아웃(초)
+        site: 호출 지점 이름 (메트릭용)
+
+    Returns:
+        타임아웃(초)
+
+    Raises:
+        DeadlineExceeded: 마감 시간이 이미 지난 경우
+    """
+    left = remaining()
+    if left is None:
+        return cap
+    if left <= 0:
+        metrics.increment(f"deadline.expired.{site}")
+        raise DeadlineExceeded(site)
+    return min(cap, left)
+
+
+def max_time_ms(cap: float, site: str) -> int:
+    """MongoDB maxTimeMS 값을 계산합니다. (timeout_for의 밀리초 버전)"""
+    return max(1, int(timeout_for(cap, site) * 1000))
@@ -0,0 +1,169 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import re
+
+# 구인 공고 날짜/지역/고용형태 정규화 유틸리티
+#
+# disabled_job_offers 문서의 문자열 필드(termDate, offerregDt, compAddr, empType)를
+# 적재 시점에 벡터 검색 pre-filter로 쓸 수 있는 구조화된 필드로 변환합니다.
+
+KST = timezone(timedelta(hours=9))
+
+# 마감일이 없는 상시 채용 공고에 사용하는 마감일 (만료되지 않음)
+OPEN_ENDED_TERM = datetime(9999, 12, 31)
+
+_DATE_PATTERN = re.compile(r'(\d{4})[-./년\s]*(\d{1,2})[-./월\s]*(\d{1,2})')
+
+# 정규화된 지역명 -> 주소/질문에 나타나는 표기
+REGION_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "서울": ("서울특별시", "서울시", "서울"),
+    "부산": ("부산광역시", "부산시", "부산"),
+    "대구": ("대구광역시", "대구시", "대구"),
+    "인천": ("인천광역시", "인천시", "인천"),
+    "광주": ("광주광역시", "광주시", "광주"),
+    "대전": ("대전광역시", "대전시", "대전"),
+    "울산": ("울산광역시", "울산시", "울산"),
+    "세종": ("세종특별자치시", "세종시", "세종"),
+    "경기": ("경기도", "경기"),
+    "강원": ("강원특별자치도", "강원도", "강원"),
+    "충북": ("충청북도", "충북"),
+    "충남": ("충청남도", "충남"),
+    "전북": ("전북특별자치도", "전라북도", "전북"),
+    "전남": ("전라남도", "전남"),
+    "경북": ("경상북도", "경북"),
+    "경남": ("경상남도", "경남"),
+    "제주": ("제주특별자치도", "제주도", "제주"),
+}
+
+# 정규화된 고용형태 코드 -> empType/질문에 나타나는 표현
+EMP_TYPE_PATTERNS: Dict[str, re.Pattern] = {
+    "regular": re.compile(r'상용|정규'),
+    "contract": re.compile(r'계약'),
+    "part_time": re.compile(r'시간제|파트|아르바이트|단시간'),
+}
+
+
+def parse_date(value: Any) -> Optional[datetime]:
+    """
+    문자열에서 첫 번째 날짜를 파싱합니다. ("20240531", "2024-05-31", "2024.5.31" 등)
+
+    Args:
+        value: 날짜 문자열
+
+    Returns:
+        파싱된 날짜 (자정 기준) 또는 None
+    """
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    match = _DATE_PATTERN.search(str(value))
+    if not match:
+        return None
+    try:
+        return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    except ValueError:
+        return None
+
+
+def parse_term_dates(term_date: Any) -> Tuple[Optional[datetime], datetime]:
+    """
+    접수 기간 문자열("2024-05-01~2024-05-31")을 시작일/마감일로 파싱합니다.
+    마감일을 알 수 없으면 상시 채용으로 보고 OPEN_ENDED_TERM을 반환합니다.
+
+    Args:
+        term_date: termDate 필드 값
+
+    Returns:
+        (시작일, 마감일)
+    """
+    dates = []
+    for match in _DATE_PATTERN.finditer(str(term_date or "")):
+        try:
+            dates.append(datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))))
+        except ValueError:
+            continue
+    if not dates:
+        return None, OPEN_ENDED_TERM
+    return dates[0], dates[-1]
+
+
+def normalize_region(address: Any) -> Optional[str]:
+    """주소 문자열의 시/도를 정규화된 지역명으로 변환합니다."""
+    if not address:
+        return None
+    first_token = str(address).strip().split(" ")[0]
+    for region, aliases in REGION_ALIASES.items():
+        if first_token in aliases:
+            return region
+    return None
+
+
+def normalize_emp_type(emp_type: Any) -> str:
+    """empType 값을 정규화된 고용형태 코드로 변환합니다."""
+    for code, pattern in EMP_TYPE_PATTERNS.items():
+        if pattern.search(str(emp_type or "")):
+            return code
+    return "other"
+
+
+def extract_region(query: str) -> Optional[str]:
+    """사용자 질문에 언급된 지역을 정규화된 지역명으로 반환합니다."""
+    for region, aliases in REGION_ALIASES.items():
+        if any(alias in query for alias in aliases):
+            return region
+    return None
+
+
+def extract_emp_type(query: str) -> Optional[str]:
+    """사용자 질문에 언급된 고용형태를 코드로 반환합니다."""
+    for code, pattern in EMP_TYPE_PATTERNS.items():
+        if pattern.search(query):
+            return code
+    return None
+
+
+def normalize_job_offer(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    구인 공고 문서에서 구조화된 필드를 계산합니다. 적재 시 $set으로 저장합니다.
+
+    Args:
+        doc: disabled_job_offers 문서
+
+    Returns:
+        추가/갱신할 필드 딕셔너리
+    """
+    term_start, term_end = parse_term_dates(doc.get("termDate"))
+    return {
+        "termStartAt": term_start,
+        "termEndAt": term_end,
+        "offerRegAt": parse_date(doc.get("offerregDt")),
+        "regAt": parse_date(doc.get("regDt")),
+        "region": normalize_region(doc.get("compAddr")),
+        "empTypeCode": normalize_emp_type(doc.get("empType")),
+    }
+
+
+def today_kst() -> datetime:
+    """한국 시간 기준 오늘 자정을 (tz 정보 없는) datetime으로 반환합니다."""
+    today = datetime.now(KST).date()
+    return datetime(today.year, today.month, today.day)
+
+
+def job_offer_filter(region: Optional[str] = None, emp_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    마감되지 않은 공고만 검색하기 위한 $vectorSearch pre-filter를 만듭니다.
+
+    Args:
+        region: 정규화된 지역명
+        emp_type: 고용형태 코드
+
+    Returns:
+        $vectorSearch filter 조건
+    """
+    conditions: List[Dict[str, Any]] = [{"termEndAt": {"$gte": today_kst()}}]
+    if region:
+        conditions.append({"region": {"$eq": region}})
+    if emp_type:
+        conditions.append({"empTypeCode": {"$eq": emp_type}})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
@@ -0,0 +1,209 @@
+from typing import Dict, Iterable, List, Optional
+from functools import lru_cache
+import json
+import logging
+import math
+import os
+import re
+from app.service.utils.job_offer_fields import REGION_ALIASES
+
+logger = logging.getLogger(__name__)
+
+# 한국어 키워드 추출기
+#
+# 질문을 단어로 나눈 뒤 조사/어미를 떼어 어간으로 정규화하고("장애인이", "장애인을" -> "장애인"),
+# 복지/취업 코퍼스에서 미리 계산한 IDF로 가중치를 주어 흔한 단어보다 변별력 있는 단어를 우선합니다.
+# IDF 파일은 app/scripts/build_keyword_idf.py로 생성합니다.
+
+IDF_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "keyword_idf.json")
+
+_TOKEN_PATTERN = re.compile(r'[가-힣a-zA-Z0-9]+')
+
+STOPWORDS = frozenset([
+    "안녕", "하세요", "입니다", "그리고", "그런데", "하지만", "또한", "이제", "만약", "어떻게",
+    "언제", "왜", "어디", "누구", "무엇", "얼마나", "있는", "있다", "없는", "없다", "해서",
+    "이런", "저런", "어떤", "제가", "저는", "나는", "너는", "우리", "당신", "그것", "좀", "많이",
+    "정책", "지원", "제도", "돕는", "관련", "정보", "문의", "수", "하는", "위한", "대해", "대한",
+    "있나요", "있니", "있습니까", "있을까요", "있으면", "있어", "있던", "있었나요", "있었니", "있었습니까",
+    "알려", "알려줘", "알려주세요", "궁금", "궁금해요", "궁금합니다", "방법", "뭐", "뭔가", "무슨",
+    "하고", "싶어요", "싶습니다", "싶은데", "받을", "받고", "받으려면", "하려면", "되나요", "가능", "가능한가요",
+    "하나요", "할까요", "찾고", "찾는", "찾아", "찾아줘", "있어요", "있습니다", "주세요", "해주세요",
+])
+
+# 명사 + 하다/되다/이다 활용 어미 (떼고 명사만 남김: "신청하나요" -> "신청", "대상인가요" -> "대상")
+_PREDICATE_SUFFIXES = sorted([
+    "해주세요", "하세요", "하나요", "할까요", "하려면", "합니다", "해야", "해요", "하고", "하면",
+    "되나요", "될까요", "됩니다", "돼요", "되면",
+    "인가요", "인데요", "입니다", "이에요", "예요",
+], key=len, reverse=True)
+
+# 동사/형용사로 끝나는 단어의 어미 (키워드가 아니므로 단어를 버림: "받나요", "도와주세요", "없어요")
+_VERB_ENDING_PATTERN = re.compile(r'(?:나요|까요|세요|니다|어요|아요|워요|네요|려면|려고|줘)$')
+
+# 떼어낼 조사 (긴 것부터 매칭)
+_PARTICLES = sorted([
+    "에서는", "으로는", "에게서", "까지는", "이라도", "이라면",
+    "에서", "에게", "한테", "으로", "처럼", "보다", "이나", "이랑", "라고", "부터", "까지", "께서", "이요",
+    "은", "는", "이", "가", "을", "를", "의", "에", "도", "만", "와", "과", "로", "랑", "요",
+], key=len, reverse=True)
+
+# 받침 있는 글자 뒤에만 오는 조사 / 받침 없는 글자 뒤에만 오는 조사 ("예술가"의 "가"는 조사가 아님)
+_AFTER_FINAL_CONSONANT = frozenset(["으로는", "이라도", "이라면", "으로", "이나", "이랑", "이요", "은", "이", "을", "과"])
+_AFTER_VOWEL = frozenset(["라고", "는", "가", "를", "와", "랑", "로"])
+
+# 조사처럼 보이는 글자(가/이/도/요/과/의/로/만/을)로 끝나는 명사 ("의무고용제도", "전문가", "어린이")
+# 단어가 이 어미로 끝나면 조사를 떼지 않음 ("제도가", "전문가는"처럼 뒤에 조사가 붙으면 그 조사만 뗌)
+_NOUN_ENDINGS = (
+    "전문가", "평가", "휴가", "국가", "추가", "증가", "참가", "허가", "인가", "단가", "물가", "업가", "작가", "대가",
+    "어린이", "아이", "나이", "차이", "사이", "놀이", "높이", "길이", "넓이",
+    "제도", "정도", "한도", "시도", "지도", "태도", "용도", "속도", "빈도", "강도", "의도", "연도", "년도",
+    "족도", "이도", "요도", "인지도",
+    "필요", "수요", "중요", "주요", "개요",
+    "결과", "효과", "학과", "성과", "초과", "통과", "부과", "외과", "내과", "치과", "안과",
+    "회의", "협의", "동의", "합의", "정의", "주의", "강의", "논의", "건의", "이의",
+    "근로", "진로", "경로", "통로",
+    "미만", "불만", "비만",
+    "마을",
+)
+
+# 지역 표기("경기도", "서울특별시")는 조사를 떼지 않고 정규화된 지역명으로 통일
+_REGION_TOKENS = {alias: region for region, aliases in REGION_ALIASES.items() for alias in aliases}
+
+
+def _final_consonant(char: str) -> Optional[int]:
+    """한글 글자의 받침 번호를 반환합니다. (0이면 받침 없음, 한글이 아니면 None)"""
+    if "가" <= char <= "힣":
+        return (ord(char) - 0xAC00) % 28
+    return None
+
+
+def _strip_particle(token: str) -> str:
+    """단어 끝의 조사를 뗍니다. 남는 어간이 2글자 미만이거나 앞 글자 받침과 맞지 않는 조사는 떼지 않습니다."""
+    for particle in _PARTICLES:
+        if not token.endswith(particle) or len(token) - len(particle) < 2:
+            continue
+        stem = token[:-len(particle)]
+        final = _final_consonant(stem[-1])
+        if final is not None:
+            if particle in _AFTER_FINAL_CONSONANT and final == 0:
+                continue
+            # "로"는 ㄹ 받침 뒤에도 옴 ("서울로")
+            if particle in _AFTER_VOWEL and final != 0 and not (particle == "로" and final == 8):
+                continue
+        return stem
+    return token
+
+
+@lru_cache(maxsize=20000)
+def normalize_token(token: str) -> str:
+    """
+    단어에서 조사/어미를 떼어 어간을 반환합니다.
+    명사 + 하다/되다/이다 활용은 명사만 남기고, 동사/형용사로 끝나는 단어는 빈 문자열을 반환합니다.
+    조사처럼 보이는 글자로 끝나는 명사는 그대로 두고, 지역 표기는 정규화된 지역명으로 바꿉니다.
+
+    Args:
+        token: 단어
+
+    Returns:
+        정규화된 단어 (키워드가 될 수 없으면 빈 문자열)
+    """
+    token = token.lower()
+    if token in _REGION_TOKENS:
+        return _REGION_TOKENS[token]
+    for suffix in _PREDICATE_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)]
+    if _VERB_ENDING_PATTERN.search(token):
+        return ""
+    stem = token if token.endswith(_NOUN_ENDINGS) else _strip_particle(token)
+    return _REGION_TOKENS.get(stem, stem)
+
+
+def tokenize(text: str) -> List[str]:
+    """텍스트를 정규화된 단어 목록으로 나눕니다. (불용어, 1글자 단어 제외)"""
+    tokens = []
+    for raw in _TOKEN_PATTERN.findall(text or ""):
+        if raw.lower() in STOPWORDS:
+            continue
+        token = normalize_token(raw)
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class KeywordExtractor:
+    """
+    IDF 가중치 기반 키워드 추출기
+    """
+
+    def __init__(self, idf: Optional[Dict[str, float]] = None, default_idf: Optional[float] = None):
+        """
+        Args:
+            idf: 단어 -> IDF 가중치 (None이면 모든 단어 가중치 1)
+            default_idf: 코퍼스에 없는 단어의 가중치 (None이면 코퍼스 최대값)
+        """
+        self.idf = idf or {}
+        self.default_idf = default_idf if default_idf is not None else max(self.idf.values(), default=1.0)
+
+    @classmethod
+    def load(cls, path: str = IDF_PATH) -> "KeywordExtractor":
+        """IDF 파일에서 추출기를 만듭니다. 파일이 없으면 빈도 기반으로 동작합니다."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["idf"], data.get("default_idf"))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"키워드 IDF 파일을 불러오지 못해 빈도 기반으로 추출합니다: {e}")
+            return cls()
+
+    def extract(self, text: str, max_keywords: int = 5) -> List[str]:
+        """
+        텍스트에서 키워드를 추출합니다. (단어 빈도 × IDF 순, 같으면 먼저 나온 단어 우선)
+
+        Args:
+            text: 키워드를 추출할 텍스트
+            max_keywords: 최대 키워드 수
+
+        Returns:
+            추출된 키워드 목록
+        """
+        scores: Dict[str, float] = {}
+        for token in tokenize(text):
+            scores[token] = scores.get(token, 0.0) + self.idf.get(token, self.default_idf)
+        # dict는 삽입 순서를 유지하므로 안정 정렬로 먼저 나온 단어가 앞에 옴
+        return sorted(scores, key=scores.get, reverse=True)[:max_keywords]
+
+    def extract_batch(self, texts: Iterable[str], max_keywords: int = 5) -> List[List[str]]:
+        """여러 텍스트에서 키워드를 추출합니다."""
+        return [self.extract(text, max_keywords) for text in texts]
+
+
+def build_idf(documents: Iterable[str]) -> Dict[str, float]:
+    """
+    문서 목록에서 IDF 가중치를 계산합니다. (smooth idf: log((N + 1) / (df + 1)) + 1)
+
+    Args:
+        documents: 문서 텍스트 목록
+
+    Returns:
+        단어 -> IDF 가중치
+    """
+    document_frequency: Dict[str, int] = {}
+    total = 0
+    for document in documents:
+        total += 1
+        for token in set(tokenize(document)):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    return {
+        token: round(math.log((total + 1) / (df + 1)) + 1, 4)
+        for token, df in sorted(document_frequency.items())
+    }
+
+
+# 글로벌 키워드 추출기 인스턴스
+keyword_extractor = KeywordExtractor.load()
+
+
+def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
+    """글로벌 추출기로 키워드를 추출합니다."""
+    return keyword_extractor.extract(text, max_keywords)
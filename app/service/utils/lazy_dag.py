@@ -0,0 +1,106 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 요청 단위 지연 실행 DAG
+#
+# 대화 처리 단계를 의존 관계가 있는 그래프로 선언하고, 최종 소비자가 요청한 단계와
+# 그 단계가 의존하는 단계만 실행합니다.
+#   - 아무도 요청하지 않은 단계는 실행되지 않습니다.
+#   - 서로 의존하지 않는 단계는 동시에 실행됩니다.
+#   - 각 단계의 결과는 요청 안에서 한 번만 계산되어 재사용됩니다.
+
+
+class Stage:
+    """
+    DAG 단계 정의
+    """
+
+    def __init__(self, name: str, func: Callable[..., Awaitable[Any]], deps: Iterable[str] = ()):
+        """
+        Args:
+            name: 단계 이름
+            func: 의존 단계 결과를 키워드 인자로 받는 비동기 함수
+            deps: 의존하는 단계 이름 목록
+        """
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+
+
+class LazyDAG:
+    """
+    요청마다 새로 만들어 사용하는 지연 실행 DAG
+    """
+
+    def __init__(self, name: str = "dag"):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[..., Awaitable[Any]], deps: Iterable[str] = ()) -> None:
+        """
+        단계를 등록합니다. 의존 단계는 먼저 등록되어 있어야 합니다. (순환 방지)
+
+        Args:
+            name: 단계 이름
+            func: 의존 단계 결과를 키워드 인자로 받는 비동기 함수
+            deps: 의존하는 단계 이름 목록
+        """
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"등록되지 않은 의존 단계: {missing}")
+        self.stages[name] = Stage(name, func, deps)
+
+    def stage(self, name: str, deps: Iterable[str] = ()):
+        """단계를 등록하는 데코레이터"""
+        def decorator(func: Callable[..., Awaitable[Any]]):
+            self.add(name, func, deps)
+            return func
+        return decorator
+
+    async def _run(self, stage: Stage) -> Any:
+        dep_values = await asyncio.gather(*[self.get(dep) for dep in stage.deps])
+        start = time.perf_counter()
+        result = await stage.func(**dict(zip(stage.deps, dep_values)))
+        self.timings[stage.name] = time.perf_counter() - start
+        logger.debug(f"[{self.name}] 단계 '{stage.name}' 완료: {self.timings[stage.name]:.3f}초")
+        return result
+
+    async def get(self, name: str) -> Any:
+        """
+        단계 결과를 반환합니다. 처음 요청될 때 의존 단계와 함께 실행되고 이후에는 같은 결과를 재사용합니다.
+
+        Args:
+            name: 단계 이름
+
+        Returns:
+            단계 결과
+        """
+        task = self._tasks.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._run(self.stages[name]))
+            self._tasks[name] = task
+        return await asyncio.shield(task)
+
+    async def get_many(self, *names: str) -> List[Any]:
+        """여러 단계를 동시에 실행해 결과 목록을 반환합니다."""
+        return list(await asyncio.gather(*[self.get(name) for name in names]))
+
+    def completed(self) -> Dict[str, Any]:
+        """성공적으로 끝난 단계의 결과를 반환합니다."""
+        return {
+            name: task.result()
+            for name, task in self._tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        }
+
+    def cancel(self) -> None:
+        """아직 끝나지 않은 단계를 모두 취소합니다."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,49 @@
+from typing import Dict, Optional
+import threading
+
+# 프로세스 내 카운터 메트릭
+#
+# 캐시 적중률 같은 운영 지표를 이름별 카운터로 모아 /metrics 엔드포인트로 노출합니다.
+# 이름은 "llm_cache.hit.memory.supervisor_analysis"처럼 점으로 구분합니다.
+
+class Metrics:
+    """
+    이름별 카운터 저장소
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        카운터를 증가시킵니다.
+
+        Args:
+            name: 카운터 이름
+            value: 증가량
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def get(self, name: str) -> float:
+        """카운터 값을 반환합니다. (없으면 0)"""
+        return self.counters.get(name, 0)
+
+    def hit_rate(self, hits: float, misses: float) -> Optional[float]:
+        """적중률을 계산합니다. 조회가 없었으면 None을 반환합니다."""
+        total = hits + misses
+        return round(hits / total, 4) if total else None
+
+    def snapshot(self) -> Dict[str, float]:
+        """현재 카운터 값을 복사해 반환합니다."""
+        with self._lock:
+            return dict(sorted(self.counters.items()))
+
+    def reset(self) -> None:
+        """모든 카운터를 초기화합니다."""
+        with self._lock:
+            self.counters.clear()
+
+# 글로벌 메트릭 인스턴스
+metrics = Metrics()
@@ -0,0 +1,286 @@
+from typing import Awaitable, Deque, Dict, Iterator, Optional, TypeVar
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# OpenAI 호출 속도 제한기
+#
+# 같은 프로세스의 모든 OpenAI 호출(채팅, 임베딩, 혜택 분석, 임베딩 백필)이 하나의 제한기를 공유합니다.
+# 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 관리하고,
+# 대기 중인 호출은 우선순위(대화 > 분석 > 백필) 순서로, 같은 우선순위 안에서는 도착 순서로 처리합니다.
+# 낮은 우선순위도 오래 기다리면(AGING_SECONDS) 한 단계씩 올려 굶지 않도록 합니다.
+# 호출의 우선순위는 priority_scope로 contextvar에 지정합니다. (기본값: 대화)
+
+
+class Priority(IntEnum):
+    """호출 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0
+    ANALYSIS = 1
+    BACKFILL = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("openai_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: Priority) -> Iterator[None]:
+    """
+    현재 컨텍스트에서 실행되는 OpenAI 호출의 우선순위를 지정합니다.
+
+    Args:
+        priority: 호출 우선순위
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+async def run_with_priority(priority: Priority, coro: Awaitable[T]) -> T:
+    """
+    코루틴을 지정한 우선순위로 실행합니다. (스크립트의 asyncio.run 진입점에서 사용)
+
+    Args:
+        priority: 호출 우선순위
+        coro: 실행할 코루틴
+    """
+    with priority_scope(priority):
+        return await coro
+
+
+def current_priority() -> Priority:
+    """현재 컨텍스트의 호출 우선순위를 반환합니다."""
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    분당 한도를 가진 토큰 버킷
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """amount만큼 사용할 수 있을 때까지 남은 시간(초)을 반환합니다."""
+        self._refill()
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 처리
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def drain(self) -> None:
+        """버킷을 비웁니다. (429 응답을 받았을 때 사용)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Waiter:
+    def __init__(self, priority: Priority, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class RateLimiter:
+    """
+    RPM/TPM 토큰 버킷과 우선순위 대기열을 가진 속도 제한기
+    """
+
+    # 이 시간(초) 이상 기다린 호출은 우선순위를 한 단계 올림
+    AGING_SECONDS = 30.0
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Args:
+            rpm: 분당 요청 수 한도
+            tpm: 분당 토큰 수 한도
+        """
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.queues: Dict[Priority, Deque[_Waiter]] = {priority: deque() for priority in Priority}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._paused_until = 0.0
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> float:
+        return waiter.priority - (now - waiter.enqueued) / self.AGING_SECONDS
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        now = time.monotonic()
+        heads = [queue[0] for queue in self.queues.values() if queue]
+        if not heads:
+            return None
+        return min(heads, key=lambda waiter: (self._effective_priority(waiter, now), waiter.enqueued))
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self._paused_until - time.monotonic(),
+            self.requests.time_until(1),
+            self.tokens.time_until(tokens)
+        )
+
+    async def _dispatch(self) -> None:
+        while True:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                # 취소된 호출은 건너뜀
+                self.queues[waiter.priority].popleft()
+                continue
+            wait = self._wait_time(waiter.tokens)
+            if wait > 0:
+                # 더 높은 우선순위 호출이 도착하면 다시 선택
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.queues[waiter.priority].popleft()
+            self.requests.consume(1)
+            self.tokens.consume(waiter.tokens)
+            waiter.future.set_result(None)
+
+    async def acquire(self, tokens: int, priority: Optional[Priority] = None) -> float:
+        """
+        호출 한 건을 보낼 수 있을 때까지 기다립니다.
+
+        Args:
+            tokens: 예상 토큰 수 (입력 + 최대 출력)
+            priority: 우선순위 (None이면 현재 컨텍스트의 우선순위)
+
+        Returns:
+            대기한 시간(초)
+        """
+        priority = current_priority() if priority is None else priority
+        waiter = _Waiter(priority, tokens)
+        self.queues[priority].append(waiter)
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        await waiter.future
+        waited = time.monotonic() - waiter.enqueued
+        metrics.increment(f"rate_limiter.requests.{priority.name.lower()}")
+        metrics.increment(f"rate_limiter.wait_seconds.{priority.name.lower()}", waited)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """
+        429 응답을 받았을 때 모든 호출을 잠시 멈춥니다.
+
+        Args:
+            seconds: 멈출 시간(초)
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.requests.drain()
+        metrics.increment("rate_limiter.throttled")
+
+    def estimated_wait(self, priority: Priority = Priority.INTERACTIVE, tokens: int = 0) -> float:
+        """
+        지금 priority로 호출을 요청하면 기다릴 것으로 예상되는 시간(초)을 반환합니다.
+        같거나 높은 우선순위로 대기 중인 호출이 먼저 처리된다고 가정합니다.
+
+        Args:
+            priority: 호출 우선순위
+            tokens: 새 호출의 예상 토큰 수
+
+        Returns:
+            예상 대기 시간(초)
+        """
+        ahead = [waiter for p, queue in self.queues.items() if p <= priority for waiter in queue]
+        request_count = len(ahead) + 1
+        token_count = sum(waiter.tokens for waiter in ahead) + tokens
+        self.requests._refill()
+        self.tokens._refill()
+        return max(
+            self._paused_until - time.monotonic(),
+            (request_count - self.requests.tokens) / self.requests.rate,
+            (token_count - self.tokens.tokens) / self.tokens.rate,
+            0.0
+        )
+
+
+def estimate_request_tokens(body: bytes) -> int:
+    """
+    OpenAI 요청 본문으로 사용할 토큰 수를 추정합니다. (입력 2글자당 1토큰 + 최대 출력 토큰)
+
+    Args:
+        body: JSON 요청 본문
+
+    Returns:
+        예상 토큰 수
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return 1
+    text_length = len(json.dumps(payload.get("messages") or payload.get("input") or "", ensure_ascii=False))
+    max_output = payload.get("max_tokens") or payload.get("max_completion_tokens")
+    if max_output is None:
+        max_output = 512 if "messages" in payload else 0
+    return max(1, text_length // 2 + max_output)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    OpenAI 클라이언트의 모든 HTTP 요청을 속도 제한기에 통과시키는 httpx 전송 계층
+    """
+
+    def __init__(self, limiter: RateLimiter, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.limiter = limiter
+        self._transport = transport or httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            body = request.content
+        except httpx.RequestNotRead:
+            body = b""
+        await self.limiter.acquire(estimate_request_tokens(body))
+        response = await self._transport.handle_async_request(request)
+        if response.status_code == 429:
+            retry_after = response.headers.get("retry-after")
+            try:
+                seconds = float(retry_after) if retry_after else 1.0
+            except ValueError:
+                seconds = 1.0
+            logger.warning(f"[속도 제한] OpenAI 429 응답, {seconds}초 동안 호출을 멈춥니다.")
+            self.limiter.pause(seconds)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,274 @@
+from typing import Any, Optional, Tuple
+from array import array
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from app.service.utils.metrics import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 flock을 지원하지 않는 환경에서는 공유 캐시를 사용하지 않음
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 워커 간 공유 메모리 캐시
+#
+# 같은 호스트의 uvicorn 워커들이 하나의 메모리 매핑 파일(/dev/shm)을 캐시로 공유합니다.
+# 파일은 고정 크기 슬롯의 집합 연관(set-associative) 테이블입니다.
+#   - 키의 해시로 세트를 고르고, 세트 안의 WAYS개 슬롯 중 하나에 저장합니다.
+#   - 쓰기는 flock으로 직렬화하고, 슬롯마다 seqlock 시퀀스 번호를 홀수(쓰는 중)→짝수(완료)로 올립니다.
+#   - 읽기는 락 없이 시퀀스 번호가 앞뒤로 같고 짝수인지 확인해 찢어진 읽기를 걸러냅니다.
+#   - 세트가 가득 차면 만료된 슬롯, 없으면 가장 오래 전에 쓰인 슬롯을 교체합니다.
+# 파일 이름에 구성(버전, 세트/웨이 수, 페이로드 크기)을 붙여, 구성이 다른 워커가 다른 워커가 매핑 중인 파일을
+# 잘라내지 않게 합니다. 새 파일은 posix_fallocate로 공간을 미리 확보하고, 확보하지 못하면 공유 캐시를 끕니다.
+# (sparse 파일에 쓰다가 tmpfs 한도를 넘으면 예외 대신 SIGBUS로 워커가 죽음)
+# 메트릭 이름: shared_cache.{hit|miss|oversize}.{캐시 이름}
+
+_MAGIC = b"IDEASHM1"
+_REGION_HEADER = struct.Struct("<8sIIII")  # magic, 버전, 세트 수, 웨이 수, 페이로드 크기
+_REGION_HEADER_SIZE = 64
+# seq, 키 해시, 쓴 시각, 만료 시각, 페이로드 길이
+_SLOT_HEADER = struct.Struct("<Q16sddI4x")
+_SEQ = struct.Struct("<Q")
+_VERSION = 1
+_READ_RETRIES = 3
+
+
+def _key_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class SharedSlotCache:
+    """
+    메모리 매핑 파일 기반의 고정 슬롯 캐시 (값은 bytes)
+    """
+
+    WAYS = 4
+
+    def __init__(self, name: str, path: str, slots: int, payload_size: int):
+        """
+        Args:
+            name: 캐시 이름 (메트릭용)
+            path: 메모리 매핑 파일 경로 (같은 경로를 쓰는 워커끼리 공유)
+            slots: 전체 슬롯 수 (WAYS의 배수로 내림)
+            payload_size: 슬롯당 최대 값 크기(바이트)
+        """
+        self.name = name
+        self.sets = max(1, slots // self.WAYS)
+        self.payload_size = payload_size
+        self.slot_size = _SLOT_HEADER.size + payload_size
+        self.size = _REGION_HEADER_SIZE + self.sets * self.WAYS * self.slot_size
+        self.path = f"{path}.v{_VERSION}-{self.sets}x{self.WAYS}x{payload_size}"
+        self._thread_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self.enabled = fcntl is not None
+        if self.enabled:
+            try:
+                self._open()
+            except OSError as e:
+                logger.warning(f"[공유 캐시] {name} 공유 메모리 파일을 열 수 없어 비활성화합니다: {e}")
+                self.enabled = False
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        header = _REGION_HEADER.pack(_MAGIC, _VERSION, self.sets, self.WAYS, self.payload_size)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                size = os.fstat(self._fd).st_size
+                if size not in (0, self.size):
+                    # 구성별로 파일 이름이 다르므로 정상적으로는 생기지 않음 (다른 워커가 매핑 중일 수 있어 자르지 않음)
+                    raise OSError(f"공유 캐시 파일 크기가 예상과 다릅니다: {size} != {self.size}")
+                if size == 0:
+                    # 새 파일: 공간을 미리 확보 (실패 시 OSError → 공유 캐시 비활성화)
+                    if hasattr(os, "posix_fallocate"):
+                        os.posix_fallocate(self._fd, 0, self.size)
+                    else:
+                        os.ftruncate(self._fd, self.size)
+                current = os.pread(self._fd, _REGION_HEADER.size, 0)
+                if current != header:
+                    if current.strip(b"\0"):
+                        raise OSError("공유 캐시 파일 헤더가 구성과 다릅니다.")
+                    # 공간만 확보되고 헤더가 없는 파일 (슬롯은 0으로 채워진 빈 상태)
+                    os.pwrite(self._fd, header, 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(self._fd, self.size)
+        except OSError:
+            os.close(self._fd)
+            self._fd = None
+            raise
+
+    def _slot_offset(self, set_index: int, way: int) -> int:
+        return _REGION_HEADER_SIZE + (set_index * self.WAYS + way) * self.slot_size
+
+    def _set_index(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.sets
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """
+        락 없이 값을 읽습니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            (값, 남은 유효 시간(초)) 또는 None
+        """
+        if not self.enabled:
+            return None
+        digest = _key_digest(key)
+        set_index = self._set_index(digest)
+        now = time.time()
+        mm = self._mm
+        for way in range(self.WAYS):
+            offset = self._slot_offset(set_index, way)
+            for _ in range(_READ_RETRIES):
+                seq_before = _SEQ.unpack_from(mm, offset)[0]
+                if seq_before & 1:
+                    continue  # 쓰는 중
+                _, slot_key, _, expires, length = _SLOT_HEADER.unpack_from(mm, offset)
+                if slot_key != digest:
+                    break
+                start = offset + _SLOT_HEADER.size
+                payload = mm[start:start + min(length, self.payload_size)]
+                if _SEQ.unpack_from(mm, offset)[0] != seq_before:
+                    continue  # 읽는 도중 덮어써짐
+                if expires <= now:
+                    break
+                metrics.increment(f"shared_cache.hit.{self.name}")
+                return payload, expires - now
+        metrics.increment(f"shared_cache.miss.{self.name}")
+        return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> bool:
+        """
+        값을 저장합니다. 슬롯보다 큰 값은 저장하지 않습니다.
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            ttl: 유효 시간(초)
+
+        Returns:
+            저장 여부
+        """
+        if not self.enabled:
+            return False
+        if len(value) > self.payload_size:
+            metrics.increment(f"shared_cache.oversize.{self.name}")
+            return False
+        digest = _key_digest(key)
+        set_index = self._set_index(digest)
+        mm = self._mm
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                victim, victim_rank = 0, None
+                for way in range(self.WAYS):
+                    _, slot_key, written, expires, _ = _SLOT_HEADER.unpack_from(mm, self._slot_offset(set_index, way))
+                    if slot_key == digest:
+                        victim = way
+                        break
+                    # 빈/만료 슬롯을 먼저, 없으면 가장 오래 전에 쓰인 슬롯을 교체
+                    rank = (expires > now, written)
+                    if victim_rank is None or rank < victim_rank:
+                        victim, victim_rank = way, rank
+                offset = self._slot_offset(set_index, victim)
+                seq = _SEQ.unpack_from(mm, offset)[0]
+                _SEQ.pack_into(mm, offset, seq + 1)
+                start = offset + _SLOT_HEADER.size
+                mm[start:start + len(value)] = value
+                _SLOT_HEADER.pack_into(mm, offset, seq + 1, digest, now, now + ttl, len(value))
+                _SEQ.pack_into(mm, offset, seq + 2)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return True
+
+    def delete(self, key: str) -> None:
+        """값을 만료 처리합니다."""
+        value = self.get(key)
+        if value is not None:
+            self.set(key, value[0], -1)
+
+    def clear(self) -> None:
+        """모든 슬롯을 비웁니다. (다른 워커가 쓴 값도 함께 지워짐)"""
+        if not self.enabled:
+            return
+        mm = self._mm
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for set_index in range(self.sets):
+                    for way in range(self.WAYS):
+                        offset = self._slot_offset(set_index, way)
+                        seq = _SEQ.unpack_from(mm, offset)[0]
+                        _SEQ.pack_into(mm, offset, seq + 1)
+                        _SLOT_HEADER.pack_into(mm, offset, seq + 1, bytes(16), 0.0, 0.0, 0)
+                        _SEQ.pack_into(mm, offset, seq + 2)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class SharedVectorCache:
+    """
+    임베딩 벡터(float32) 공유 캐시
+    """
+
+    def __init__(self, name: str, path: str, slots: int, dimensions: int):
+        self.store = SharedSlotCache(name, path, slots, dimensions * 4)
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        found = self.store.get(key)
+        if found is None:
+            return None
+        vector = array("f")
+        vector.frombytes(found[0])
+        return vector.tolist(), found[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.store.set(key, array("f", value).tobytes(), ttl)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+class SharedJSONCache:
+    """
+    JSON 직렬화 가능한 값(검색 결과 카드 등) 공유 캐시
+    """
+
+    def __init__(self, name: str, path: str, slots: int, payload_size: int):
+        self.store = SharedSlotCache(name, path, slots, payload_size)
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        found = self.store.get(key)
+        if found is None:
+            return None
+        return json.loads(found[0]), found[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        except (TypeError, ValueError):
+            return
+        self.store.set(key, payload, ttl)
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    def clear(self) -> None:
+        self.store.clear()
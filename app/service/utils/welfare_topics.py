@@ -0,0 +1,60 @@
+from typing import Any, Dict, List
+import re
+
+# 복지 서비스 주제 분류
+#
+# welfare_service_list 문서에 적재 시점에 주제 플래그(topics)와 분류 배열(themes, lifeStages)을 계산해 두고,
+# 검색 시에는 $vectorSearch pre-filter로 사용합니다.
+# (벡터 검색 뒤 $match 정규식으로 거르면 상위 k개 대부분이 버려져 결과가 비는 문제를 막기 위함)
+
+# 주제 코드 -> 서비스명/관심주제에서 찾는 패턴
+TOPIC_PATTERNS: Dict[str, re.Pattern] = {
+    # 취업 전문가: 구직자 대상 취업/고용 지원
+    "employment": re.compile(r'취업|고용|직업|일자리'),
+    # 고용 정책 전문가: 기업 대상 고용 장려금/지원금
+    "employer_support": re.compile(r'고용|장려금|지원금|기업'),
+}
+
+# 벡터 인덱스에 filter로 등록할 필드
+FILTER_FIELDS = ("topics", "themes", "lifeStages")
+
+
+def split_array_field(value: Any) -> List[str]:
+    """
+    "일자리,생활지원" 형태의 문자열(또는 리스트)을 정리된 문자열 배열로 바꿉니다.
+
+    Args:
+        value: 문서 필드 값
+
+    Returns:
+        공백을 제거한 중복 없는 값 목록 (순서 유지)
+    """
+    if isinstance(value, list):
+        items = value
+    else:
+        items = str(value or "").split(",")
+    return list(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
+
+def classify_welfare_service(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    복지 서비스 문서의 주제 플래그와 분류 배열을 계산합니다.
+
+    Args:
+        doc: welfare_service_list 문서 (servNm, intrsThemaArray, lifeArray 사용)
+
+    Returns:
+        $set에 사용할 필드 (topics, themes, lifeStages)
+    """
+    themes = split_array_field(doc.get("intrsThemaArray"))
+    text = " ".join([str(doc.get("servNm") or "")] + themes)
+    return {
+        "topics": [topic for topic, pattern in TOPIC_PATTERNS.items() if pattern.search(text)],
+        "themes": themes,
+        "lifeStages": split_array_field(doc.get("lifeArray")),
+    }
+
+
+def welfare_topic_filter(topic: str) -> Dict[str, Any]:
+    """주제 코드에 대한 $vectorSearch pre-filter 조건을 반환합니다."""
+    return {"topics": {"$in": [topic]}}
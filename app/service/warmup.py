@@ -0,0 +1,72 @@
+"""
+시작 시 워밍업
+배포나 워커 재시작 직후 첫 사용자가 콜드 경로(빈 캐시, 열리지 않은 MongoDB 풀,
+새 OpenAI 커넥션)를 타지 않도록 자주 들어오는 질문으로 각 전문가의 검색 경로를 미리 실행합니다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from app.config.settings import WARMUP_ENABLED, WARMUP_QUERIES, WARMUP_TIMEOUT_SECONDS
+from app.service.motor_client import ping
+from app.service.registry import registry
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """워커 준비 상태와 워밍업 소요 시간"""
+
+    def __init__(self):
+        self.ready = False
+        self.duration: Optional[float] = None
+        self.timed_out = False
+
+
+# 글로벌 워밍업 상태 인스턴스
+warmup_state = WarmupState()
+
+
+async def _warm_up_expert(expert, queries: List[str]) -> None:
+    try:
+        await expert.warm_up(queries)
+    except Exception as e:
+        logger.error(f"[워밍업] {type(expert).__name__} 워밍업 중 오류 발생: {e}")
+
+
+async def run_warmup(queries: Optional[List[str]] = None) -> float:
+    """
+    커넥션 풀을 열고 워밍업 질문으로 임베딩/검색 캐시를 채운 뒤 워커를 준비 상태로 표시합니다.
+    워밍업이 제한 시간을 넘기면 남은 작업을 취소하고 준비 상태로 전환합니다.
+
+    Args:
+        queries: 워밍업 질문 목록 (None이면 설정값 사용)
+
+    Returns:
+        워밍업 소요 시간(초)
+    """
+    start = time.perf_counter()
+    registry.initialize()
+
+    if WARMUP_ENABLED:
+        queries = queries if queries is not None else WARMUP_QUERIES
+        logger.info(f"[워밍업] 시작: 질문 {len(queries)}개, 전문가 {len(registry.experts())}개")
+
+        async def _warm_up_all():
+            await ping()
+            await asyncio.gather(*[_warm_up_expert(expert, queries) for expert in registry.experts()])
+
+        try:
+            await asyncio.wait_for(_warm_up_all(), timeout=WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            warmup_state.timed_out = True
+            logger.warning(f"[워밍업] 제한 시간 {WARMUP_TIMEOUT_SECONDS}초 초과, 남은 워밍업을 건너뜁니다.")
+    else:
+        logger.info("[워밍업] 비활성화됨")
+
+    warmup_state.duration = time.perf_counter() - start
+    warmup_state.ready = True
+    logger.info(f"[워밍업] 완료: {warmup_state.duration:.2f}초")
+    return warmup_state.duration
@@ -0,0 +1,119 @@
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import logging
+from app.service.motor_client import get_public_data_db
+from app.service.utils.cache import welfare_detail_cache
+from app.service.utils.deadline import max_time_ms
+from app.service.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 복지 서비스 상세 조회
+#
+# 여러 카드의 상세 정보를 한 번의 $in 쿼리로 가져오고 servId별로 캐싱합니다.
+# welfare_service_detail이 재동기화되면 변경 스트림(watch_welfare_details)이나
+# invalidate_welfare_details 호출로 캐시를 비웁니다.
+
+DETAIL_COLLECTION = "welfare_service_detail"
+
+# 상세 조회 시 제외할 필드 (임베딩 등 큰 필드)
+DETAIL_PROJECTION = {"_id": 0, "embedding": 0}
+
+# 상세 문서가 없는 servId도 캐싱하여 반복 조회를 막기 위한 표식
+_NOT_FOUND: Dict[str, Any] = {}
+
+
+def _cache_key(serv_id: str) -> str:
+    return f"welfare_detail:{serv_id}"
+
+
+async def get_welfare_service_details(serv_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 복지 서비스의 상세 정보를 조회합니다. 캐시에 없는 servId만 한 번의 $in 쿼리로 가져옵니다.
+
+    Args:
+        serv_ids: 서비스 ID 목록
+
+    Returns:
+        servId -> 상세 문서 (상세 정보가 없는 servId는 포함하지 않음)
+    """
+    details: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for serv_id in dict.fromkeys(serv_id for serv_id in serv_ids if serv_id):
+        cached = welfare_detail_cache.get(_cache_key(serv_id))
+        if cached is None:
+            missing.append(serv_id)
+        elif cached:
+            details[serv_id] = cached
+
+    metrics.increment("welfare_detail.hit", len(details))
+    if not missing:
+        return details
+
+    metrics.increment("welfare_detail.miss", len(missing))
+    collection = get_public_data_db()[DETAIL_COLLECTION]
+    cursor = collection.find(
+        {"servId": {"$in": missing}}, DETAIL_PROJECTION, max_time_ms=max_time_ms(5.0, "mongo.welfare_detail")
+    )
+    for doc in await cursor.to_list(length=len(missing)):
+        details[doc["servId"]] = doc
+    for serv_id in missing:
+        welfare_detail_cache.set(_cache_key(serv_id), details.get(serv_id, _NOT_FOUND))
+    return details
+
+
+async def get_welfare_service_detail(serv_id: str) -> Optional[Dict[str, Any]]:
+    """
+    복지 서비스 하나의 상세 정보를 조회합니다.
+
+    Args:
+        serv_id: 서비스 ID
+
+    Returns:
+        상세 문서 또는 None
+    """
+    return (await get_welfare_service_details([serv_id])).get(serv_id)
+
+
+def invalidate_welfare_details(serv_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    상세 캐시를 무효화합니다. 상세 컬렉션을 재동기화한 뒤 호출합니다.
+
+    Args:
+        serv_ids: 무효화할 서비스 ID 목록 (None이면 전체)
+    """
+    if serv_ids is None:
+        welfare_detail_cache.clear()
+        logger.info("[복지 상세] 캐시 전체 무효화")
+        return
+    for serv_id in serv_ids:
+        welfare_detail_cache.delete(_cache_key(serv_id))
+
+
+async def watch_welfare_details(retry_seconds: float = 60.0) -> None:
+    """
+    welfare_service_detail 변경 스트림을 구독하여 바뀐 servId의 캐시를 무효화합니다.
+    애플리케이션 lifespan에서 백그라운드 태스크로 실행합니다.
+    (변경 스트림을 쓸 수 없는 환경에서는 재시도하며, 그동안은 캐시 TTL로 갱신됩니다)
+
+    Args:
+        retry_seconds: 스트림 오류 시 재연결 대기 시간(초)
+    """
+    while True:
+        try:
+            collection = get_public_data_db()[DETAIL_COLLECTION]
+            async with collection.watch(full_document="updateLookup") as stream:
+                # 스트림이 끊긴 동안의 변경은 알 수 없으므로 (재)연결 시 전체 무효화
+                invalidate_welfare_details()
+                async for change in stream:
+                    serv_id = (change.get("fullDocument") or {}).get("servId")
+                    if serv_id:
+                        invalidate_welfare_details([serv_id])
+                    else:
+                        # 삭제/컬렉션 교체 등 servId를 알 수 없는 변경
+                        invalidate_welfare_details()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[복지 상세] 변경 스트림 오류, {retry_seconds:.0f}초 후 재연결: {e}")
+            await asyncio.sleep(retry_seconds)
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.service.agents import conversation_pipeline
+from app.service.agents.conversation_pipeline import build_conversation_pipeline
+
+
+class FakeGeneralChatbot:
+    async def generate_initial_response(self, message):
+        return "초기 응답"
+
+    async def create_user_friendly_response(self, retrieval, messages):
+        return "가공된 응답"
+
+
+class FakeSupervisor:
+    def __init__(self):
+        self.analyzed = 0
+
+    async def analyze_conversation(self, messages):
+        self.analyzed += 1
+        return "장애인 취업", ["취업"]
+
+    async def consolidate_responses(self, responses):
+        return {"answer": " / ".join(r["answer"] for r in responses), "cards": responses[-1]["cards"]}
+
+
+def fake_expert_response(calls):
+    async def get_expert_response(message, expert_type, keywords=None, messages=None):
+        calls.append((expert_type, keywords))
+        return "전문가 응답", [{"id": "card"}], None
+    return get_expert_response
+
+
+def test_pipeline_without_expert_type_uses_supervisor_routing(monkeypatch):
+    calls = []
+    monkeypatch.setattr(conversation_pipeline, "get_expert_response", fake_expert_response(calls))
+    supervisor = FakeSupervisor()
+    messages = [{"role": "user", "content": "취업 정보 알려줘"}]
+
+    pipeline = build_conversation_pipeline(messages, FakeGeneralChatbot(), supervisor)
+    response = asyncio.run(pipeline.get("consolidation"))
+
+    assert supervisor.analyzed == 1
+    assert calls == [("장애인 취업", ["취업"])]
+    assert response["cards"] == [{"id": "card"}]
+
+
+def test_pipeline_reuses_preset_routing(monkeypatch):
+    calls = []
+    monkeypatch.setattr(conversation_pipeline, "get_expert_response", fake_expert_response(calls))
+    supervisor = FakeSupervisor()
+    messages = [{"role": "user", "content": "더 알려줘"}]
+
+    pipeline = build_conversation_pipeline(
+        messages, FakeGeneralChatbot(), supervisor, preset_routing=("장애인 정책", ["지원금"])
+    )
+    asyncio.run(pipeline.get("consolidation"))
+
+    assert supervisor.analyzed == 0
+    assert calls == [("장애인 정책", ["지원금"])]
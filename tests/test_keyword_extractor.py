@@ -0,0 +1,37 @@
+import pytest
+
+from app.service.utils.keyword_extractor import KeywordExtractor, normalize_token
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("예술가 지원", ["예술가"]),
+    ("고용장려금은 어떻게 받나요", ["고용장려금"]),
+    ("도와주세요", []),
+    ("장애인이 취업하려면", ["장애인", "취업"]),
+    ("의무고용제도가 궁금해요", ["의무고용제도"]),
+])
+def test_extract_keeps_nouns_and_drops_predicates(text, expected):
+    assert KeywordExtractor().extract(text) == expected
+
+
+@pytest.mark.parametrize("token, expected", [
+    # 앞 글자 받침과 맞는 조사만 뗌
+    ("장애인을", "장애인"),
+    ("회사는", "회사"),
+    ("교육과", "교육"),
+    ("예술가", "예술가"),
+    ("사업가를", "사업가"),
+    # 조사처럼 보이는 글자로 끝나는 명사
+    ("전문가", "전문가"),
+    ("어린이", "어린이"),
+    ("제도가", "제도"),
+    # 명사 + 하다/되다/이다
+    ("신청하나요", "신청"),
+    ("대상인가요", "대상"),
+    # 동사/형용사
+    ("받나요", ""),
+    ("도와주세요", ""),
+    ("없어요", ""),
+])
+def test_normalize_token(token, expected):
+    assert normalize_token(token) == expected